@@ -0,0 +1,199 @@
+"""Benchmark offline do extrator contra o servidor SEI local.
+
+Uso (a partir da raiz do repositório):
+
+    python -m benchmark.executar --cenarios 10 100 1000 --latencia 0.05 [opções do extrator]
+
+Opções não reconhecidas são repassadas ao main() do extrator (ex.: --modo-detalhe http).
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from benchmark.servidor_sei import ServidorSEI
+from sei_extract import extracao_email
+
+# Etapas exibidas na tabela, como nomeadas pela instrumentação do extrator
+ETAPAS = [
+    "EdgeDriverManager.setup_driver",
+    "FormHandler.executar_fluxo_pesquisa",
+    "ResultadoExtractor.coletar_resultados",
+    "ResultadoExtractor.carregar_todos_os_resultados",
+    "ResultadoExtractor.extrair_links",
+    "extracao_detalhes",
+]
+
+
+def _captcha_falso(self, captcha_element) -> str:
+    return "TESTE"
+
+
+class AmostradorMemoria:
+    """Pico de RSS de um cenário, amostrado em uma thread enquanto ele roda.
+
+    Mede o processo Python e, separadamente, a árvore de processos filhos (msedgedriver e
+    Edge). Usa o psutil (pip install psutil), que funciona também no Windows; sem ele, o
+    cenário sai sem medida de memória.
+    """
+
+    def __init__(self, intervalo: float = 0.2):
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        self.psutil = psutil
+        self.intervalo = intervalo
+        self.pico_python = 0
+        self.pico_navegador = 0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _amostrar(self) -> None:
+        processo = self.psutil.Process()
+        self.pico_python = max(self.pico_python, processo.memory_info().rss)
+        navegador = 0
+        for filho in processo.children(recursive=True):
+            try:
+                navegador += filho.memory_info().rss
+            except (self.psutil.NoSuchProcess, self.psutil.AccessDenied):
+                pass
+        self.pico_navegador = max(self.pico_navegador, navegador)
+
+    def _rodar(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            self._amostrar()
+
+    def __enter__(self) -> "AmostradorMemoria":
+        if self.psutil:
+            self._amostrar()
+            self._thread = threading.Thread(target=self._rodar, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._thread:
+            self._parar.set()
+            self._thread.join()
+
+    def pico_mb(self) -> Optional[Dict[str, float]]:
+        if not self.psutil:
+            return None
+        return {"python": self.pico_python / 2**20, "navegador": self.pico_navegador / 2**20}
+
+
+def executar_cenario(
+    total_resultados: int,
+    latencia: float,
+    argv_extrator: List[str],
+    falhas: float = 0.0,
+    documentos_por_processo: int = 1,
+) -> dict:
+    """Roda o main() completo contra um servidor com `total_resultados` resultados."""
+    servidor = ServidorSEI(
+        total_resultados=total_resultados,
+        latencia=latencia,
+        falhas=falhas,
+        documentos_por_processo=documentos_por_processo,
+    ).iniciar()
+    url_original = extracao_email.URL_SEI_SP
+    captcha_original = extracao_email.CaptchaResolver.resolve_manual
+    extracao_email.URL_SEI_SP = servidor.url_pesquisa
+    extracao_email.CaptchaResolver.resolve_manual = _captcha_falso
+
+    try:
+        with tempfile.TemporaryDirectory() as pasta:
+            saida = os.path.join(pasta, "saida.csv")
+            caminho_metricas = os.path.join(pasta, "metricas.json")
+            argv = [
+                "--headless",
+                "--formato", "csv",
+                "--saida", saida,
+                "--cache-arquivo", os.path.join(pasta, "cache.sqlite3"),
+                "--diario", os.path.join(pasta, "execucao.jsonl"),
+                "--metricas-json", caminho_metricas,
+                "--forcar-atualizacao",
+            ] + argv_extrator
+
+            inicio = time.perf_counter()
+            with AmostradorMemoria() as memoria:
+                extracao_email.main(argv)
+            duracao = time.perf_counter() - inicio
+
+            linhas = 0
+            if os.path.exists(saida):
+                with open(saida, encoding="utf-8-sig") as arquivo:
+                    linhas = sum(1 for _ in arquivo) - 1
+            # Sem o arquivo de métricas o main() falhou antes do fim; mantém o cenário na tabela
+            metricas = {"etapas": {}, "comandos_webdriver": 0, "fracao_espera": 0.0, "buscas_economizadas": 0}
+            if os.path.exists(caminho_metricas):
+                with open(caminho_metricas, encoding="utf-8") as arquivo:
+                    metricas = json.load(arquivo)
+    finally:
+        extracao_email.CaptchaResolver.resolve_manual = captcha_original
+        extracao_email.URL_SEI_SP = url_original
+        servidor.parar()
+
+    return {
+        "resultados": total_resultados,
+        "linhas_extraidas": linhas,
+        "tempo_total_s": round(duracao, 3),
+        "links_por_segundo": round(linhas / duracao, 2) if duracao else 0,
+        "etapas_s": {nome: round(stats["segundos"], 3) for nome, stats in metricas["etapas"].items()},
+        "chamadas": {nome: stats["chamadas"] for nome, stats in metricas["etapas"].items()},
+        "comandos_webdriver": metricas["comandos_webdriver"],
+        "fracao_espera": round(metricas["fracao_espera"], 3),
+        "requisicoes_servidor": servidor.requisicoes,
+        "buscas_economizadas": metricas.get("buscas_economizadas", 0),
+        "rss_pico_mb": memoria.pico_mb(),
+    }
+
+
+def imprimir_tabela(resultados: List[dict]) -> None:
+    cabecalho = ["resultados", "linhas", "total_s", "links/s"] + ETAPAS + ["rss_py_mb", "rss_nav_mb"]
+    print(" | ".join(cabecalho))
+    for r in resultados:
+        valores = [r["resultados"], r["linhas_extraidas"], r["tempo_total_s"], r["links_por_segundo"]]
+        valores += [r["etapas_s"].get(nome, 0) for nome in ETAPAS]
+        rss = r["rss_pico_mb"]
+        valores += [round(rss["python"], 1), round(rss["navegador"], 1)] if rss else ["-", "-"]
+        print(" | ".join(str(v) for v in valores))
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark offline do extrator SEI contra um servidor local.")
+    parser.add_argument("--cenarios", type=int, nargs="+", default=[10, 100, 1000], help="Quantidades de resultados")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Latência de cada resposta do servidor, em segundos")
+    parser.add_argument("--falhas", type=float, default=0.0, help="Fração das páginas de detalhe que responde 503")
+    parser.add_argument(
+        "--documentos-por-processo",
+        type=int,
+        default=1,
+        help="Documentos listados por processo nos resultados (testa o agrupamento por processo)",
+    )
+    parser.add_argument("--json", default=None, help="Grava os resultados também neste arquivo JSON")
+    args, argv_extrator = parser.parse_known_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    if AmostradorMemoria().psutil is None:
+        logging.warning("psutil não instalado; o relatório sai sem o pico de memória (pip install psutil).")
+    resultados = [
+        executar_cenario(n, args.latencia, argv_extrator, args.falhas, args.documentos_por_processo)
+        for n in args.cenarios
+    ]
+
+    imprimir_tabela(resultados)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+    elif not sys.stdout.isatty():
+        print(json.dumps(resultados, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Servidor HTTP local que imita as páginas do SEI-SP usadas pelo extrator.
+
+Serve o formulário de pesquisa, a lista de resultados com scroll infinito e as
+páginas de detalhe nos dois layouts tratados por extrair_dados_cliente: nome/CNPJ
+em uma <td> (ids pares) e nome na 4ª tr.infraTrClara (ids ímpares). Com `falhas`,
+essa fração das páginas de detalhe responde 503; ids fora do total respondem 404. Com
+`documentos_por_processo` > 1, cada processo aparece na lista uma vez por documento, como
+quando os checkboxes de documentos gerados/recebidos estão marcados.
+"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+CAMINHO_PESQUISA = "/sei/modulos/pesquisa/md_pesq_processo_pesquisar.php"
+CAMINHO_DETALHE = "/sei/modulos/pesquisa/md_pesq_processo_exibir.php"
+CAMINHO_PAGINA_RESULTADOS = "/sei/modulos/pesquisa/md_pesq_resultados.php"
+
+TIPO_PROCESSO = "Processo de apropriação e utilização de crédito acumulado ou de produtor rural"
+TIPO_DOCUMENTO = "Despacho"
+
+# PNG 1x1 transparente usado como imagem do CAPTCHA
+_PNG_CAPTCHA = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5f0000000049454e44ae426082"
+)
+
+# Como no SEI, o formulário também aparece acima da lista de resultados
+_FORM = f"""<form method="post" action="{CAMINHO_PESQUISA}">
+  <input type="checkbox" id="chkSinProcessos" name="chkSinProcessos">
+  <input type="checkbox" id="chkSinDocumentosGerados" name="chkSinDocumentosGerados">
+  <input type="checkbox" id="chkSinDocumentosRecebidos" name="chkSinDocumentosRecebidos">
+  <select id="selTipoProcedimentoPesquisa" name="selTipoProcedimentoPesquisa">
+    <option value="">Todos</option><option value="1">{TIPO_PROCESSO}</option>
+  </select>
+  <select id="selSeriePesquisa" name="selSeriePesquisa">
+    <option value="">Todos</option><option value="2">{TIPO_DOCUMENTO}</option>
+  </select>
+  <input type="text" id="txtDataInicio" name="txtDataInicio">
+  <input type="text" id="txtDataFim" name="txtDataFim">
+  <img id="imgCaptcha" src="/captcha.png" width="120" height="40">
+  <input type="text" id="txtInfraCaptcha" name="txtInfraCaptcha">
+  <button type="submit" id="sbmPesquisar" name="sbmPesquisar">Pesquisar</button>
+</form>"""
+
+_FORMULARIO = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>SEI - Pesquisa Pública</title></head>
+<body>
+{_FORM}
+</body></html>
+"""
+
+_RESULTADOS = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>SEI - Resultados</title>
+<style>.resultado {{ height: 80px; border-bottom: 1px solid #ccc; }}</style></head>
+<body>
+{formulario}
+<div class="total-registros-infinite">{total} resultados encontrados</div>
+<div id="conteudo">{primeira_pagina}</div>
+<script>
+var carregados = {carregados}, total = {total}, carregando = false;
+window.addEventListener('scroll', function () {{
+  if (carregando || carregados >= total) return;
+  if (window.innerHeight + window.scrollY < document.body.scrollHeight - 400) return;
+  carregando = true;
+  fetch('{caminho}?inicio=' + carregados + '&quantidade={por_pagina}')
+    .then(function (r) {{ return r.text(); }})
+    .then(function (html) {{
+      document.getElementById('conteudo').insertAdjacentHTML('beforeend', html);
+      carregados += {por_pagina};
+      carregando = false;
+    }});
+}});
+</script>
+</body></html>
+"""
+
+
+def gerar_cnpj(numero: int) -> str:
+    """CNPJ formatado com dígitos verificadores válidos, derivado de `numero`."""
+    base = [int(d) for d in f"{numero:08d}"[-8:] + "0001"]
+    for pesos in ([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]):
+        resto = sum(d * p for d, p in zip(base, pesos)) % 11
+        base.append(0 if resto < 2 else 11 - resto)
+    d = "".join(map(str, base))
+    return f"{d[:2]}.{d[2:5]}.{d[5:8]}/{d[8:12]}-{d[12:]}"
+
+
+def _itens_resultado(inicio: int, quantidade: int, total: int, documentos_por_processo: int = 1) -> str:
+    itens = []
+    for i in range(inicio, min(inicio + quantidade, total)):
+        processo = i // documentos_por_processo
+        documento = f"&amp;id_documento={i}" if documentos_por_processo > 1 else ""
+        itens.append(
+            f'<div class="resultado"><a class="protocoloNormal" '
+            f'href="{CAMINHO_DETALHE}?id_procedimento={processo}{documento}">SEI {processo:06d}/2026</a></div>'
+        )
+    return "".join(itens)
+
+
+def _pagina_detalhe(id_processo: int) -> str:
+    if id_processo % 2 == 0:
+        corpo = (
+            "<table><tr><td>Processo:</td><td>SEI 0000/2026</td></tr>"
+            f"<tr><td>Interessados:</td><td>EMPRESA {id_processo} LTDA ({gerar_cnpj(id_processo)})</td></tr></table>"
+        )
+    else:
+        linhas = ["Processo", "Tipo", "Data de Registro", "Interessados", "Unidade"]
+        corpo = "<table>" + "".join(
+            f'<tr class="infraTrClara"><td>{rotulo}:</td>'
+            f'<td>{"EMPRESA %d S.A." % id_processo if rotulo == "Interessados" else "-"}</td></tr>'
+            for rotulo in linhas
+        ) + "</table>"
+    return f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Processo</title></head><body>{corpo}</body></html>'
+
+
+class ServidorSEI:
+    """Sobe o servidor falso em uma thread; `url_pesquisa` aponta para o formulário."""
+
+    def __init__(
+        self,
+        total_resultados: int = 100,
+        latencia: float = 0.05,
+        por_pagina: int = 20,
+        porta: int = 0,
+        falhas: float = 0.0,
+        documentos_por_processo: int = 1,
+    ):
+        self.total_resultados = total_resultados
+        self.latencia = latencia
+        self.por_pagina = por_pagina
+        self.falhas = falhas
+        self.documentos_por_processo = max(1, documentos_por_processo)
+        self.requisicoes = 0
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), self._criar_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url_base(self) -> str:
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    @property
+    def url_pesquisa(self) -> str:
+        return self.url_base + CAMINHO_PESQUISA
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, corpo, tipo: str = "text/html; charset=utf-8", status: int = 200) -> None:
+                servidor.requisicoes += 1
+                time.sleep(servidor.latencia)
+                dados = corpo.encode("utf-8") if isinstance(corpo, str) else corpo
+                self.send_response(status)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def do_GET(self):
+                partes = urlsplit(self.path)
+                parametros = parse_qs(partes.query)
+                if partes.path == CAMINHO_PESQUISA:
+                    self._responder(_FORMULARIO)
+                elif partes.path == CAMINHO_PAGINA_RESULTADOS:
+                    inicio = int(parametros.get("inicio", ["0"])[0])
+                    quantidade = int(parametros.get("quantidade", [str(servidor.por_pagina)])[0])
+                    self._responder(
+                        _itens_resultado(inicio, quantidade, servidor.total_resultados, servidor.documentos_por_processo)
+                    )
+                elif partes.path == CAMINHO_DETALHE:
+                    id_processo = int(parametros["id_procedimento"][0])
+                    if id_processo >= servidor.total_resultados:
+                        self._responder("processo não encontrado", status=404)
+                    elif random.random() < servidor.falhas:
+                        self._responder("serviço indisponível", status=503)
+                    else:
+                        self._responder(_pagina_detalhe(id_processo))
+                elif partes.path == "/captcha.png":
+                    self._responder(_PNG_CAPTCHA, tipo="image/png")
+                else:
+                    self._responder("não encontrado", status=404)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                primeira = min(servidor.por_pagina, servidor.total_resultados)
+                self._responder(
+                    _RESULTADOS.format(
+                        formulario=_FORM,
+                        total=servidor.total_resultados,
+                        primeira_pagina=_itens_resultado(
+                            0, primeira, servidor.total_resultados, servidor.documentos_por_processo
+                        ),
+                        carregados=primeira,
+                        caminho=CAMINHO_PAGINA_RESULTADOS,
+                        por_pagina=servidor.por_pagina,
+                    )
+                )
+
+        return Handler
+
+    def iniciar(self) -> "ServidorSEI":
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self) -> None:
+        self._servidor.shutdown()
+        self._servidor.server_close()
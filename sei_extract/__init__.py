@@ -0,0 +1,5 @@
+"""Extração de nome e CNPJ dos processos do SEI-SP.
+
+A linha de comando fica em `sei_extract.cli` (`sei-extract` ou `python -m sei_extract`).
+"""
+__version__ = "0.1.0"
@@ -0,0 +1,299 @@
+"""Várias abas de um único navegador carregando páginas de detalhe ao mesmo tempo.
+
+Com um só Edge, extrair_dados_cliente abre, espera, lê e fecha uma aba por vez, e o
+navegador fica parado durante cada espera de rede. PipelineAbas mantém até `abas` abas
+nomeadas carregando: a janela principal (a lista de resultados) dispara window.open nelas,
+consulta o readyState de todas em um único execute_script e só troca de janela para ler a
+aba que ficou pronta, que em seguida recebe o próximo link. Cada aba guarda a posição do
+link que está carregando, então o resultado volta ao link certo em qualquer ordem.
+
+Antes de cada navegação o documento anterior da aba recebe uma marca (__seiColhida); enquanto
+ele estiver visível a aba conta como carregando, para não ler o documento antigo. A marca fica
+no document, e não no window: a primeira navegação a partir do about:blank inicial reaproveita
+o mesmo window, mas toda navegação cria um document novo, sem a marca.
+"""
+import heapq
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+
+from .controle_requisicoes import (
+    SITUACAO_ERRO,
+    CircuitoAberto,
+    ControleRequisicoes,
+    ErroTransitorio,
+    situacao_do_erro,
+    situacao_dos_dados,
+)
+from .perfil_lean import aplicar_bloqueios
+
+_JS_ABRIR_ABA = """
+window.__seiAbas = window.__seiAbas || {};
+window.__seiAbas[arguments[0]] = window.open('about:blank', arguments[0]);
+"""
+
+# Retorna false se a página anterior é de outra origem e a marca não pôde ser gravada
+_JS_CARREGAR = """
+var aba = window.__seiAbas[arguments[0]], marcada = true;
+try { aba.document.__seiColhida = true; } catch (e) { marcada = false; }
+if (marcada) { window.__seiAbas[arguments[0]] = window.open(arguments[1], arguments[0]); }
+return marcada;
+"""
+
+_JS_CARREGAR_NA_ABA = "document.__seiColhida = true; window.location.href = arguments[0];"
+
+_JS_ESTADOS = """
+var estados = {};
+arguments[0].forEach(function (nome) {
+    var aba = window.__seiAbas[nome];
+    try { estados[nome] = aba.closed ? 'fechada' : aba.document.__seiColhida ? 'carregando' : aba.document.readyState; }
+    catch (e) { estados[nome] = 'outra_origem'; }
+});
+return estados;
+"""
+
+_JS_ESTADO_NA_ABA = "return document.__seiColhida ? 'carregando' : document.readyState;"
+
+
+class PipelineAbas:
+    """Extrai (nome, cnpj) dos links mantendo até `abas` abas do mesmo driver carregando.
+
+    `extrator` é o ResultadoExtractor da sessão principal (driver, perfil lean, medidor,
+    arquivo HTML e contador de comandos). Falhas seguem o `controle`: erros transitórios
+    voltam à fila após o backoff, e a aba que falhou é fechada e recriada. `taxa` limita
+    as navegações por segundo; `timeout` é o tempo máximo de carga de uma página.
+    """
+
+    def __init__(
+        self,
+        extrator,
+        abas: int = 4,
+        controle: Optional[ControleRequisicoes] = None,
+        taxa: Optional[float] = None,
+        timeout: float = 15.0,
+        intervalo: float = 0.05,
+        logger: Optional[logging.Logger] = None,
+        ao_concluir: Optional[Callable[[str, str, str, str], None]] = None,
+    ):
+        self.extrator = extrator
+        self.driver = extrator.driver
+        self.num_abas = max(1, abas)
+        self.controle = controle or ControleRequisicoes(logger=logger)
+        self.taxa = taxa
+        self.timeout = timeout
+        self.intervalo = intervalo
+        self.logger = logger or logging.getLogger(__name__)
+        self.ao_concluir = ao_concluir
+
+    def _nova_aba(self) -> str:
+        """Abre uma aba vazia nomeada, aplica os bloqueios do perfil lean e retorna o nome."""
+        aba = f"seiAba{self._criadas}"
+        self._criadas += 1
+        antes = set(self.driver.window_handles)
+        self.driver.execute_script(_JS_ABRIR_ABA, aba)
+        novas = set(self.driver.window_handles) - antes
+        if not novas:
+            raise ErroTransitorio("window.open não abriu uma nova aba")
+        self._abas[aba] = novas.pop()
+        if self.extrator.lean:
+            # Os bloqueios do CDP valem por aba e continuam valendo nas navegações seguintes
+            self.driver.switch_to.window(self._abas[aba])
+            aplicar_bloqueios(self.driver)
+            self._voltar_principal()
+        return aba
+
+    def _carregar(self, aba: str, link: str) -> None:
+        if not self.driver.execute_script(_JS_CARREGAR, aba, link):
+            self.driver.switch_to.window(self._abas[aba])
+            self.driver.execute_script(_JS_CARREGAR_NA_ABA, link)
+            self._voltar_principal()
+
+    def _estado_na_aba(self, aba: str) -> str:
+        """readyState lido de dentro da aba, quando a página é de outra origem."""
+        self.driver.switch_to.window(self._abas[aba])
+        try:
+            return self.driver.execute_script(_JS_ESTADO_NA_ABA)
+        finally:
+            self._voltar_principal()
+
+    def _voltar_principal(self) -> None:
+        try:
+            self.driver.switch_to.window(self._principal)
+        except WebDriverException as e:
+            self.logger.debug(f"Não foi possível voltar à janela principal: {e}")
+
+    def _descartar(self, aba: str) -> None:
+        """Fecha a aba que falhou; uma nova é aberta quando faltar aba livre."""
+        handle = self._abas.pop(aba, None)
+        if handle is None:
+            return
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except WebDriverException:
+            pass
+        self._voltar_principal()
+
+    def _concluir(self, posicao: int, link: str, nome: str, cnpj: str, situacao: str) -> None:
+        self._resultados[posicao] = (nome, cnpj)
+        self.controle.contar(situacao)
+        if self.ao_concluir:
+            self.ao_concluir(link, nome, cnpj, situacao)
+
+    def _falhar(self, posicao: int, link: str, erro: Exception) -> None:
+        if isinstance(erro, WebDriverException):
+            erro = ErroTransitorio(f"{type(erro).__name__}: {erro.msg}")
+        self._tentativas[posicao] += 1
+        espera = self.controle.registrar_falha(link, erro, self._tentativas[posicao])
+        if espera is None:
+            self._concluir(posicao, link, "", "", situacao_do_erro(erro))
+        else:
+            heapq.heappush(self._retentativas, (time.monotonic() + espera, posicao, link))
+
+    def _disparar(self) -> float:
+        """Carrega os próximos links nas abas livres; retorna quanto esperar se algo segurou o envio."""
+        while self._fila and (self._livres or len(self._abas) < self.num_abas):
+            try:
+                espera = self.controle.espera_liberacao()
+            except CircuitoAberto:
+                self._desistir()
+                return 0.0
+            if espera:
+                return espera
+            agora = time.monotonic()
+            if self.taxa:
+                if self._proximo_envio > agora:
+                    return self._proximo_envio - agora
+                self._proximo_envio = max(agora, self._proximo_envio) + 1 / self.taxa
+
+            posicao, link = self._fila.popleft()
+            aba = None
+            try:
+                aba = self._livres.pop() if self._livres else self._nova_aba()
+                self._carregar(aba, link)
+            except Exception as e:
+                if aba is not None:
+                    self._descartar(aba)
+                self._falhar(posicao, link, e)
+                continue
+            self._carregando[aba] = (posicao, link, time.monotonic())
+        return 0.0
+
+    def _colher(self, aba: str) -> None:
+        """Lê a aba pronta e a devolve às livres."""
+        posicao, link, _ = self._carregando.pop(aba)
+        contador = self.extrator.contador
+        marca = contador.marcar() if contador else 0
+        try:
+            self.driver.switch_to.window(self._abas[aba])
+            nome, cnpj = self.extrator.ler_pagina_aberta(link)
+        except WebDriverException as e:
+            self._descartar(aba)
+            self._falhar(posicao, link, e)
+            return
+        except Exception as e:
+            self._livres.append(aba)
+            self._voltar_principal()
+            self._falhar(posicao, link, e)
+            return
+        self._voltar_principal()
+        if contador:
+            contador.registrar_pagina(marca)
+
+        self.controle.registrar_sucesso()
+        self._livres.append(aba)
+        self._concluir(posicao, link, nome, cnpj, situacao_dos_dados(nome, cnpj))
+
+    def _verificar(self) -> int:
+        """Colhe as abas prontas e falha as que passaram do timeout; retorna quantas terminaram."""
+        try:
+            estados = self.driver.execute_script(_JS_ESTADOS, list(self._carregando))
+        except WebDriverException as e:
+            # Sem a janela principal não há como acompanhar as abas: recomeça do zero
+            self.logger.warning(f"Falha ao consultar as abas: {e.msg}")
+            for aba, (posicao, link, _) in list(self._carregando.items()):
+                self._falhar(posicao, link, e)
+            for aba in list(self._abas):
+                self._descartar(aba)
+            self._carregando.clear()
+            self._livres.clear()
+            return 1
+
+        terminadas = 0
+        agora = time.monotonic()
+        for aba, estado in estados.items():
+            if aba not in self._carregando:
+                continue
+            posicao, link, inicio = self._carregando[aba]
+            try:
+                if estado == "outra_origem":
+                    estado = self._estado_na_aba(aba)
+            except WebDriverException:
+                estado = "fechada"
+
+            if estado in self.extrator.esperas.estados_prontos:
+                self._colher(aba)
+            elif estado == "fechada":
+                del self._carregando[aba]
+                self._descartar(aba)
+                self._falhar(posicao, link, ErroTransitorio("A aba foi fechada durante o carregamento"))
+            elif agora - inicio > self.timeout:
+                del self._carregando[aba]
+                self._livres.append(aba)
+                self._falhar(posicao, link, ErroTransitorio(f"Página não carregou em {self.timeout:.0f}s"))
+            else:
+                continue
+            terminadas += 1
+        return terminadas
+
+    def _desistir(self) -> None:
+        """Disjuntor desistiu: os links que ainda não foram enviados saem como erro."""
+        pendentes = list(self._fila) + [(posicao, link) for _, posicao, link in self._retentativas]
+        self._fila.clear()
+        self._retentativas.clear()
+        for posicao, link in pendentes:
+            self._concluir(posicao, link, "", "", SITUACAO_ERRO)
+
+    def _fechar_abas(self) -> None:
+        for aba in list(self._abas):
+            self._descartar(aba)
+
+    def extrair(self, links: List[str]) -> List[Tuple[str, str]]:
+        """Processa os links e retorna (nome, cnpj) na ordem original."""
+        self._resultados: List[Tuple[str, str]] = [("", "")] * len(links)
+        if not links:
+            return self._resultados
+
+        self._principal = self.driver.current_window_handle
+        self._fila: Deque[Tuple[int, str]] = deque(enumerate(links))
+        self._retentativas: List[Tuple[float, int, str]] = []
+        self._tentativas = [0] * len(links)
+        self._abas: Dict[str, str] = {}
+        self._livres: List[str] = []
+        self._carregando: Dict[str, Tuple[int, str, float]] = {}
+        self._criadas = 0
+        self._proximo_envio = 0.0
+
+        try:
+            while self._fila or self._retentativas or self._carregando:
+                agora = time.monotonic()
+                while self._retentativas and self._retentativas[0][0] <= agora:
+                    _, posicao, link = heapq.heappop(self._retentativas)
+                    self._fila.appendleft((posicao, link))
+
+                espera = self._disparar()
+                if self._carregando:
+                    if not self._verificar():
+                        time.sleep(self.intervalo)
+                    continue
+                if self._retentativas and not self._fila:
+                    espera = max(espera, self._retentativas[0][0] - time.monotonic())
+                time.sleep(min(max(espera, self.intervalo), 1.0))
+        finally:
+            self._fechar_abas()
+
+        self.logger.info(f"{len(links)} links processados em até {self.num_abas} abas.")
+        return self._resultados
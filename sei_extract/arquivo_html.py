@@ -0,0 +1,140 @@
+"""Arquivo do HTML bruto das páginas de detalhe, endereçado por conteúdo e comprimido com zstd.
+
+    pasta/objetos/ab/<sha256>.html.zst   um objeto por conteúdo distinto
+    pasta/indice.jsonl                   link -> sha256 de cada página arquivada
+
+Permite reextrair nome/CNPJ de tudo o que já foi baixado (`sei-extract reparse`)
+quando o layout do SEI ou a regex mudarem, sem navegador e sem refazer a coleta.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import zstandard
+
+from .controle_requisicoes import SITUACAO_ERRO, situacao_dos_dados
+from .parser_detalhe import parse_dados_cliente
+
+NIVEL_COMPRESSAO = 9
+
+
+class ArquivoHtml:
+    """Grava e lê as páginas arquivadas; seguro para uso por várias threads."""
+
+    def __init__(self, pasta: str, nivel: int = NIVEL_COMPRESSAO, logger: Optional[logging.Logger] = None):
+        self.pasta = pasta
+        self.nivel = nivel
+        self.logger = logger or logging.getLogger(__name__)
+        self.caminho_indice = os.path.join(pasta, "indice.jsonl")
+        self.gravados = 0
+        self.repetidos = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(pasta, "objetos"), exist_ok=True)
+
+    def caminho_objeto(self, sha: str) -> str:
+        return os.path.join(self.pasta, "objetos", sha[:2], f"{sha}.html.zst")
+
+    def guardar(self, link: str, html: str) -> str:
+        """Arquiva o HTML do link e retorna seu sha256; conteúdo repetido não é regravado."""
+        dados = html.encode("utf-8")
+        sha = hashlib.sha256(dados).hexdigest()
+        caminho = self.caminho_objeto(sha)
+
+        novo = not os.path.exists(caminho)
+        if novo:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            # Escrita atômica: outra thread pode estar gravando o mesmo conteúdo
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, "wb") as arquivo:
+                arquivo.write(zstandard.ZstdCompressor(level=self.nivel).compress(dados))
+            os.replace(temporario, caminho)
+
+        registro = {"link": link, "sha256": sha, "arquivado_em": datetime.datetime.now().isoformat(timespec="seconds")}
+        with self._lock:
+            with open(self.caminho_indice, "a", encoding="utf-8") as indice:
+                indice.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            self.gravados += novo
+            self.repetidos += not novo
+        return sha
+
+    def ler(self, sha: str) -> str:
+        return _ler_objeto(self.caminho_objeto(sha))
+
+    def entradas(self) -> Dict[str, Tuple[str, str]]:
+        """Última versão arquivada de cada link: {link: (sha256, arquivado_em)}."""
+        entradas: Dict[str, Tuple[str, str]] = {}
+        if not os.path.exists(self.caminho_indice):
+            return entradas
+        with open(self.caminho_indice, encoding="utf-8") as indice:
+            for linha in indice:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+                entradas[registro["link"]] = (registro["sha256"], registro["arquivado_em"])
+        return entradas
+
+
+def _ler_objeto(caminho: str) -> str:
+    with open(caminho, "rb") as arquivo:
+        return zstandard.ZstdDecompressor().decompress(arquivo.read()).decode("utf-8")
+
+
+def _reparsear_objeto(caminho: str) -> Tuple[str, str, str]:
+    """Executado nos processos do pool: descomprime e extrai (nome, cnpj, erro) de um objeto.
+
+    `erro` fica vazio quando a página foi lida e analisada, mesmo que sem nome nem CNPJ.
+    """
+    try:
+        html = _ler_objeto(caminho)
+    except (OSError, zstandard.ZstdError, UnicodeDecodeError) as e:
+        return "", "", f"leitura de {caminho}: {e}"
+    try:
+        try:
+            from .parser_detalhe import parse_dados_cliente_lxml as analisar
+        except ImportError:
+            analisar = parse_dados_cliente
+        nome, cnpj = analisar(html)
+    except Exception as e:
+        return "", "", f"parser em {caminho}: {type(e).__name__}: {e}"
+    return nome, cnpj, ""
+
+
+def reparsear(
+    arquivo: ArquivoHtml,
+    processos: Optional[int] = None,
+    tamanho_lote: int = 256,
+    logger: Optional[logging.Logger] = None,
+) -> List[Tuple[str, str, str, str]]:
+    """Reextrai (link, nome, cnpj, arquivado_em, situacao) de todas as páginas arquivadas em um pool de processos.
+
+    Cada conteúdo distinto é analisado uma vez, mesmo que vários links apontem para ele.
+    Objetos ilegíveis e falhas do parser saem com situação "erro", não como páginas vazias.
+    """
+    logger = logger or logging.getLogger(__name__)
+    entradas = arquivo.entradas()
+    shas = list(dict.fromkeys(sha for sha, _ in entradas.values()))
+    logger.info(f"Reparse de {len(entradas)} links ({len(shas)} páginas distintas) com {processos or os.cpu_count()} processos.")
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        caminhos = [arquivo.caminho_objeto(sha) for sha in shas]
+        resultados = dict(zip(shas, executor.map(_reparsear_objeto, caminhos, chunksize=tamanho_lote)))
+    duracao = time.perf_counter() - inicio
+    logger.info(f"{len(shas)} páginas analisadas em {duracao:.1f} s ({len(shas) / duracao if duracao else 0:.0f} páginas/s).")
+
+    erros = [erro for _, _, erro in resultados.values() if erro]
+    if erros:
+        logger.warning(f"{len(erros)} páginas arquivadas não puderam ser reextraídas; primeira falha: {erros[0]}")
+
+    linhas = []
+    for link, (sha, arquivado_em) in entradas.items():
+        nome, cnpj, erro = resultados[sha]
+        linhas.append((link, nome, cnpj, arquivado_em, SITUACAO_ERRO if erro else situacao_dos_dados(nome, cnpj)))
+    return linhas
@@ -0,0 +1,127 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .controle_requisicoes import situacao_dos_dados
+from .parser_detalhe import PARSER_VERSAO
+from .resultados_pesquisa import identificar_processo
+
+class CacheProcessos:
+    """Cache em SQLite dos processos já extraídos, com expiração por TTL e por tamanho.
+
+    A chave é a do processo (resultados_pesquisa.identificar_processo), a mesma usada no
+    agrupamento dos documentos, para que qualquer documento do processo encontre a entrada.
+    """
+
+    def __init__(
+        self,
+        caminho: str = "cache_processos.sqlite3",
+        ttl_horas: float = 72,
+        max_entradas: int = 200_000,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.ttl_segundos = ttl_horas * 3600
+        self.max_entradas = max_entradas
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(caminho, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS processos (
+                chave TEXT PRIMARY KEY,
+                nome TEXT NOT NULL,
+                cnpj TEXT NOT NULL,
+                buscado_em REAL NOT NULL,
+                versao_parser INTEGER NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_buscado_em ON processos (buscado_em)")
+        self.conn.commit()
+
+    def obter_varios(self, processos: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """Retorna {processo: (nome, cnpj)} para as chaves de processo com entrada válida no cache."""
+        limite = time.time() - self.ttl_segundos
+        encontrados: Dict[str, Tuple[str, str]] = {}
+        with self._lock:
+            for processo in processos:
+                linha = self.conn.execute(
+                    "SELECT nome, cnpj FROM processos WHERE chave = ? AND buscado_em >= ? AND versao_parser = ?",
+                    (processo, limite, PARSER_VERSAO),
+                ).fetchone()
+                if linha:
+                    encontrados[processo] = (linha[0], linha[1])
+        return encontrados
+
+    def salvar_varios(self, itens: Iterable[Tuple[str, str, str]]) -> None:
+        """Grava (processo, nome, cnpj); resultados vazios não são cacheados."""
+        agora = time.time()
+        linhas = [
+            (processo, nome, cnpj, agora, PARSER_VERSAO)
+            for processo, nome, cnpj in itens
+            if nome or cnpj
+        ]
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO processos VALUES (?, ?, ?, ?, ?)", linhas)
+            self.conn.commit()
+
+    def limpar(self) -> int:
+        """Remove entradas expiradas ou de outra versão do parser e as mais antigas acima do limite."""
+        limite = time.time() - self.ttl_segundos
+        with self._lock:
+            removidas = self.conn.execute(
+                "DELETE FROM processos WHERE buscado_em < ? OR versao_parser != ?", (limite, PARSER_VERSAO)
+            ).rowcount
+            removidas += self.conn.execute(
+                """
+                DELETE FROM processos WHERE chave IN (
+                    SELECT chave FROM processos ORDER BY buscado_em DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entradas,),
+            ).rowcount
+            self.conn.commit()
+        if removidas:
+            self.logger.info(f"{removidas} entradas removidas do cache de processos.")
+        return removidas
+
+    def close(self) -> None:
+        """Fecha a conexão com o SQLite."""
+        self.conn.close()
+
+
+def extrair_com_cache(
+    links: List[str],
+    extrair_pendentes,
+    cache: CacheProcessos,
+    forcar_atualizacao: bool = False,
+    logger: Optional[logging.Logger] = None,
+    ao_concluir: Optional[Callable[[str, str, str, str], None]] = None,
+    processos: Optional[List[str]] = None,
+) -> List[Tuple[str, str]]:
+    """Extrai apenas os links sem entrada válida no cache e devolve (nome, cnpj) na ordem de `links`.
+
+    `extrair_pendentes` recebe a lista de links pendentes e retorna [(nome, cnpj)] na mesma ordem.
+    `processos[i]` é a chave do processo de `links[i]`, a do agrupamento; sem ela, vem do href.
+    `ao_concluir(link, nome, cnpj, situacao)` é chamado para cada acerto do cache antes da extração.
+    """
+    logger = logger or logging.getLogger(__name__)
+    processo_do_link = dict(zip(links, processos or [identificar_processo(link) for link in links]))
+    encontrados = {} if forcar_atualizacao else cache.obter_varios(set(processo_do_link.values()))
+    cacheados = {
+        link: encontrados[processo] for link, processo in processo_do_link.items() if processo in encontrados
+    }
+    pendentes = list(dict.fromkeys(link for link in links if link not in cacheados))
+    logger.info(f"Cache: {len(links) - len(pendentes)} links reaproveitados, {len(pendentes)} a extrair.")
+    if ao_concluir:
+        for link, (nome, cnpj) in cacheados.items():
+            ao_concluir(link, nome, cnpj, situacao_dos_dados(nome, cnpj))
+
+    novos = dict(zip(pendentes, extrair_pendentes(pendentes))) if pendentes else {}
+    cache.salvar_varios((processo_do_link[link], nome, cnpj) for link, (nome, cnpj) in novos.items())
+    cache.limpar()
+
+    return [cacheados.get(link) or novos.get(link, ("", "")) for link in links]
@@ -0,0 +1,253 @@
+"""Resolução offline do CAPTCHA do SEI com processamento de imagem clássico.
+
+A imagem é binarizada (Otsu), os caracteres são separados pela projeção vertical e
+cada glifo é classificado por uma regressão softmax treinada com NumPy a partir de
+amostras rotuladas. Roda sem rede e sem GPU.
+
+Treino: sei-extract captcha treinar pasta_amostras captcha_modelo.npz
+(cada amostra é um PNG cujo nome começa pelo texto do CAPTCHA, ex.: "A7KQ_012.png")
+"""
+import argparse
+import io
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+TAMANHO_GLIFO = 16
+
+logger = logging.getLogger(__name__)
+
+
+def carregar_imagem(png: bytes) -> np.ndarray:
+    """PNG em bytes para matriz em tons de cinza (0-255)."""
+    return np.asarray(Image.open(io.BytesIO(png)).convert("L"), dtype=np.uint8)
+
+
+def binarizar(cinza: np.ndarray) -> np.ndarray:
+    """Limiar de Otsu; True onde há tinta (texto mais escuro que o fundo)."""
+    histograma = np.bincount(cinza.ravel(), minlength=256).astype(np.float64)
+    probabilidades = histograma / histograma.sum()
+    omega = np.cumsum(probabilidades)
+    mu = np.cumsum(probabilidades * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variancia_entre = (mu[-1] * omega - mu) ** 2 / (omega * (1 - omega))
+    limiar = int(np.nanargmax(variancia_entre))
+    return cinza <= limiar
+
+
+def segmentar(binaria: np.ndarray, num_caracteres: Optional[int] = None, largura_minima: int = 2) -> List[np.ndarray]:
+    """Separa os caracteres pelas colunas sem tinta; ajusta ao número esperado se informado."""
+    colunas = binaria.sum(axis=0) > 0
+    bordas = np.diff(np.concatenate([[0], colunas.astype(np.int8), [0]]))
+    trechos = [
+        [inicio, fim]
+        for inicio, fim in zip(np.flatnonzero(bordas == 1), np.flatnonzero(bordas == -1))
+        if fim - inicio >= largura_minima
+    ]
+
+    if num_caracteres:
+        # Caracteres colados: divide o trecho mais largo ao meio
+        while trechos and len(trechos) < num_caracteres:
+            i = max(range(len(trechos)), key=lambda k: trechos[k][1] - trechos[k][0])
+            inicio, fim = trechos[i]
+            meio = (inicio + fim) // 2
+            trechos[i:i + 1] = [[inicio, meio], [meio, fim]]
+        # Caractere partido: junta o par vizinho mais estreito
+        while len(trechos) > num_caracteres:
+            i = min(range(len(trechos) - 1), key=lambda k: trechos[k + 1][1] - trechos[k][0])
+            trechos[i:i + 2] = [[trechos[i][0], trechos[i + 1][1]]]
+
+    glifos = []
+    for inicio, fim in trechos:
+        fatia = binaria[:, inicio:fim]
+        linhas = np.flatnonzero(fatia.any(axis=1))
+        glifos.append(fatia[linhas[0]:linhas[-1] + 1] if len(linhas) else fatia)
+    return glifos
+
+
+def vetorizar_glifo(glifo: np.ndarray, tamanho: int = TAMANHO_GLIFO) -> np.ndarray:
+    """Redimensiona o glifo para tamanho x tamanho e achata em um vetor float32."""
+    imagem = Image.fromarray((glifo * 255).astype(np.uint8)).resize((tamanho, tamanho), Image.BILINEAR)
+    return np.asarray(imagem, dtype=np.float32).ravel() / 255.0
+
+
+class ModeloCaptcha:
+    """Regressão softmax (um neurônio por caractere) sobre glifos 16x16."""
+
+    def __init__(self, pesos: np.ndarray, vies: np.ndarray, classes: np.ndarray):
+        self.pesos = pesos
+        self.vies = vies
+        self.classes = classes
+
+    @classmethod
+    def treinar(
+        cls,
+        amostras: np.ndarray,
+        rotulos: List[str],
+        epocas: int = 500,
+        taxa: float = 0.5,
+        regularizacao: float = 1e-3,
+    ) -> "ModeloCaptcha":
+        """Treina por gradiente descendente em lote completo."""
+        classes = np.array(sorted(set(rotulos)))
+        indices = np.searchsorted(classes, rotulos)
+        alvo = np.eye(len(classes), dtype=np.float32)[indices]
+        pesos = np.zeros((amostras.shape[1], len(classes)), dtype=np.float32)
+        vies = np.zeros(len(classes), dtype=np.float32)
+
+        for _ in range(epocas):
+            probabilidades = _softmax(amostras @ pesos + vies)
+            erro = (probabilidades - alvo) / len(amostras)
+            pesos -= taxa * (amostras.T @ erro + regularizacao * pesos)
+            vies -= taxa * erro.sum(axis=0)
+        return cls(pesos, vies, classes)
+
+    def prever(self, amostras: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        """Retorna os caracteres previstos e a confiança de cada um."""
+        probabilidades = _softmax(amostras @ self.pesos + self.vies)
+        return list(self.classes[probabilidades.argmax(axis=1)]), probabilidades.max(axis=1)
+
+    def salvar(self, caminho: str) -> None:
+        np.savez_compressed(caminho, pesos=self.pesos, vies=self.vies, classes=self.classes)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "ModeloCaptcha":
+        dados = np.load(caminho)
+        return cls(dados["pesos"], dados["vies"], dados["classes"])
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class SolucionadorCaptcha:
+    """Resolve o CAPTCHA a partir do PNG do elemento; devolve None quando não tem confiança."""
+
+    def __init__(
+        self,
+        modelo: ModeloCaptcha,
+        num_caracteres: Optional[int] = 4,
+        confianca_minima: float = 0.6,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.modelo = modelo
+        self.num_caracteres = num_caracteres
+        self.confianca_minima = confianca_minima
+        self.logger = logger or logging.getLogger(__name__)
+        self.tentativas = 0
+        self.resolvidos = 0
+        self.segundos = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def de_arquivo(cls, caminho: str, **kwargs) -> "SolucionadorCaptcha":
+        return cls(ModeloCaptcha.carregar(caminho), **kwargs)
+
+    def resolver_png(self, png: bytes) -> Optional[str]:
+        """Texto do CAPTCHA, ou None se a segmentação ou a confiança falharem."""
+        inicio = time.perf_counter()
+        texto = None
+        try:
+            glifos = segmentar(binarizar(carregar_imagem(png)), self.num_caracteres)
+            if glifos and (not self.num_caracteres or len(glifos) == self.num_caracteres):
+                caracteres, confiancas = self.modelo.prever(np.stack([vetorizar_glifo(g) for g in glifos]))
+                if confiancas.min() >= self.confianca_minima:
+                    texto = "".join(caracteres)
+        except Exception as e:
+            self.logger.warning(f"Erro ao resolver CAPTCHA offline: {e}")
+        finally:
+            duracao = time.perf_counter() - inicio
+            with self._lock:
+                self.tentativas += 1
+                self.resolvidos += texto is not None
+                self.segundos += duracao
+            self.logger.info(
+                f"CAPTCHA offline {'resolvido' if texto else 'sem confiança'} em {duracao * 1000:.0f} ms "
+                f"(taxa de resolução: {self.resolvidos}/{self.tentativas})"
+            )
+        return texto
+
+    def relatorio(self) -> Dict[str, float]:
+        """Loga e retorna a taxa de resolução automática e a latência média."""
+        if not self.tentativas:
+            return {}
+        resumo = {
+            "tentativas": self.tentativas,
+            "resolvidos": self.resolvidos,
+            "taxa_resolucao": self.resolvidos / self.tentativas,
+            "latencia_ms_media": self.segundos / self.tentativas * 1000,
+        }
+        self.logger.info(
+            f"CAPTCHA offline: {self.resolvidos}/{self.tentativas} resolvidos ({resumo['taxa_resolucao']:.0%}), "
+            f"{resumo['latencia_ms_media']:.0f} ms em média"
+        )
+        return resumo
+
+    def resolver(self, captcha_element) -> Optional[str]:
+        """Captura o elemento imgCaptcha como PNG e resolve; None se a captura falhar (cai no input manual)."""
+        # Importado aqui para que o treino pela linha de comando não dependa do selenium
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            png = captcha_element.screenshot_as_png
+        except WebDriverException as e:
+            self.logger.warning(f"Não foi possível capturar a imagem do CAPTCHA: {e.msg}")
+            return None
+        return self.resolver_png(png)
+
+
+def carregar_amostras(pasta: str) -> Tuple[np.ndarray, List[str]]:
+    """Segmenta as amostras rotuladas da pasta em glifos e seus caracteres."""
+    vetores, rotulos = [], []
+    for nome in sorted(os.listdir(pasta)):
+        if not nome.lower().endswith(".png"):
+            continue
+        texto = os.path.splitext(nome)[0].split("_")[0]
+        with open(os.path.join(pasta, nome), "rb") as arquivo:
+            glifos = segmentar(binarizar(carregar_imagem(arquivo.read())), len(texto))
+        if len(glifos) != len(texto):
+            logger.warning(f"Amostra {nome} ignorada: {len(glifos)} glifos para '{texto}'.")
+            continue
+        vetores.extend(vetorizar_glifo(g) for g in glifos)
+        rotulos.extend(texto)
+    return np.stack(vetores), rotulos
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog=prog, description="Treina e testa o solucionador offline de CAPTCHA.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    treinar = subparsers.add_parser("treinar", help="Treina o modelo a partir de amostras rotuladas")
+    treinar.add_argument("pasta")
+    treinar.add_argument("modelo", help="Arquivo .npz de saída")
+    treinar.add_argument("--epocas", type=int, default=500)
+    testar = subparsers.add_parser("testar", help="Mede a taxa de acerto do modelo em amostras rotuladas")
+    testar.add_argument("pasta")
+    testar.add_argument("modelo")
+    args = parser.parse_args(argv)
+
+    if args.comando == "treinar":
+        amostras, rotulos = carregar_amostras(args.pasta)
+        modelo = ModeloCaptcha.treinar(amostras, rotulos, epocas=args.epocas)
+        previstos, _ = modelo.prever(amostras)
+        acerto = np.mean(np.array(previstos) == np.array(rotulos))
+        logger.info(f"{len(rotulos)} glifos, {len(modelo.classes)} classes, acerto no treino: {acerto:.1%}")
+        modelo.salvar(args.modelo)
+    else:
+        solucionador = SolucionadorCaptcha.de_arquivo(args.modelo, num_caracteres=None, confianca_minima=0)
+        nomes = [n for n in sorted(os.listdir(args.pasta)) if n.lower().endswith(".png")]
+        acertos = 0
+        for nome in nomes:
+            with open(os.path.join(args.pasta, nome), "rb") as arquivo:
+                acertos += solucionador.resolver_png(arquivo.read()) == os.path.splitext(nome)[0].split("_")[0]
+        logger.info(f"Acerto: {acertos}/{len(nomes)} CAPTCHAs, {solucionador.segundos / max(1, len(nomes)) * 1000:.0f} ms em média")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,161 @@
+"""Linha de comando `sei-extract`.
+
+    sei-extract search  [opções]   pesquisa e grava os links no diário
+    sei-extract extract [opções]   pesquisa, extrai nome/CNPJ e grava a saída
+    sei-extract resume  [opções]   continua os links pendentes do diário
+    sei-extract export  [opções]   converte as linhas do diário em csv/parquet/xlsx
+    sei-extract reparse [opções]   reextrai nome/CNPJ do HTML arquivado, sem navegador
+
+selenium, pandas, numpy, pyarrow e openpyxl só são importados pelos subcomandos que
+os usam, então `--help` e `export` não pagam essas importações.
+"""
+import argparse
+import importlib
+import logging
+import sys
+from typing import List, Optional
+
+from . import __version__
+from .opcoes import (
+    completar,
+    opcoes_arquivo_html,
+    opcoes_detalhe,
+    opcoes_diario,
+    opcoes_navegador,
+    opcoes_pesquisa,
+    opcoes_saida,
+)
+
+logger = logging.getLogger(__name__)
+
+# Subcomandos que repassam os argumentos ao main() do módulo
+FERRAMENTAS = {
+    "cnpj": ("cnpj", "Normaliza, valida e deduplica os CNPJs de um export"),
+    "indice-cnpj": ("indice_cnpj", "Índice local razão social -> CNPJ (dados abertos da Receita)"),
+    "daemon": ("daemon_navegador", "Daemon com navegadores aquecidos (servir/enviar)"),
+    "captcha": ("captcha_offline", "Treina e testa o solucionador offline de CAPTCHA"),
+}
+
+
+def _executar_navegador(args: argparse.Namespace) -> None:
+    from . import extracao_email
+    extracao_email.rodar(completar(args))
+
+
+def _exportar(args: argparse.Namespace) -> None:
+    from .diario_execucao import DiarioExecucao
+    from .saidas import exportar_diario
+
+    diario = DiarioExecucao(args.diario)
+    diario.carregar()
+    gravadas = exportar_diario(diario, args.formato, args.saida)
+    logger.info(f"{gravadas} de {len(diario.links())} linhas exportadas para {args.saida or f'dados_extraidos.{args.formato}'}.")
+
+
+def _reparsear(args: argparse.Namespace) -> None:
+    from .arquivo_html import ArquivoHtml, reparsear
+    from .controle_requisicoes import SITUACAO_ERRO, SITUACAO_VAZIO
+    from .saidas import criar_saida
+
+    linhas = reparsear(ArquivoHtml(args.arquivo_html), processos=args.processos)
+    saida = criar_saida(args.formato, args.saida)
+    try:
+        for link, nome, cnpj, arquivado_em, situacao in linhas:
+            saida.escrever(
+                {
+                    "Nome": nome,
+                    "CNPJ": cnpj,
+                    "Link": link,
+                    "ExtraidoEm": arquivado_em,
+                    "Situacao": situacao,
+                }
+            )
+    finally:
+        saida.fechar()
+    sem_dados = sum(1 for *_, situacao in linhas if situacao == SITUACAO_VAZIO)
+    com_erro = sum(1 for *_, situacao in linhas if situacao == SITUACAO_ERRO)
+    logger.info(f"{len(linhas)} linhas reextraídas ({sem_dados} sem nome nem CNPJ, {com_erro} com erro).")
+
+    if args.cache_arquivo:
+        from .cache_processos import CacheProcessos
+        from .resultados_pesquisa import identificar_processo
+
+        # O cache é indexado pela chave de processo gravada no diário da extração
+        processo_do_link = {}
+        if args.diario:
+            from .diario_execucao import DiarioExecucao
+            diario = DiarioExecucao(args.diario)
+            diario.carregar()
+            processo_do_link = dict(zip(diario.links(), diario.processos()))
+        cache = CacheProcessos(args.cache_arquivo)
+        try:
+            cache.salvar_varios(
+                (processo_do_link.get(link) or identificar_processo(link), nome, cnpj)
+                for link, nome, cnpj, _, situacao in linhas
+                if situacao != SITUACAO_ERRO
+            )
+        finally:
+            cache.close()
+        logger.info(f"Cache {args.cache_arquivo} atualizado com a versão atual do parser.")
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="sei-extract", description="Extração de nome e CNPJ dos processos do SEI-SP.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    search = subparsers.add_parser("search", help="Pesquisa e grava os links de resultado no diário")
+    for adicionar in (opcoes_navegador, opcoes_pesquisa, opcoes_diario):
+        adicionar(search)
+    search.set_defaults(funcao=_executar_navegador, somente_pesquisa=True, retomar=False)
+
+    extract = subparsers.add_parser("extract", help="Pesquisa, extrai nome e CNPJ e grava a saída")
+    for adicionar in (opcoes_navegador, opcoes_pesquisa, opcoes_detalhe, opcoes_arquivo_html, opcoes_diario, opcoes_saida):
+        adicionar(extract)
+    extract.set_defaults(funcao=_executar_navegador, somente_pesquisa=False, retomar=False)
+
+    resume = subparsers.add_parser("resume", help="Extrai os links pendentes do diário, sem refazer a pesquisa")
+    for adicionar in (opcoes_navegador, opcoes_detalhe, opcoes_arquivo_html, opcoes_diario, opcoes_saida):
+        adicionar(resume)
+    resume.set_defaults(funcao=_executar_navegador, somente_pesquisa=False, retomar=True)
+
+    export = subparsers.add_parser("export", help="Grava as linhas concluídas do diário no formato escolhido")
+    for adicionar in (opcoes_diario, opcoes_saida):
+        adicionar(export)
+    export.set_defaults(funcao=_exportar)
+
+    reparse = subparsers.add_parser("reparse", help="Reextrai nome e CNPJ do HTML arquivado em um pool de processos")
+    reparse.add_argument("--arquivo-html", required=True, help="Pasta do arquivo HTML gravado por extract/resume")
+    opcoes_saida(reparse)
+    reparse.add_argument("--processos", type=int, default=None, help="Processos do pool (padrão: um por CPU)")
+    reparse.add_argument(
+        "--cache-arquivo",
+        default=None,
+        help="Atualiza também este cache SQLite com os resultados reextraídos",
+    )
+    reparse.add_argument(
+        "--diario",
+        default=None,
+        help="Diário da extração, de onde vem a chave de processo de cada link gravada no cache",
+    )
+    reparse.set_defaults(funcao=_reparsear)
+
+    for nome, (_, ajuda) in FERRAMENTAS.items():
+        subparsers.add_parser(nome, help=ajuda, add_help=False)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    from dotenv import find_dotenv, load_dotenv
+    # Procura o .env a partir do diretório atual, não do pacote instalado
+    load_dotenv(find_dotenv(usecwd=True))
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if argv and argv[0] in FERRAMENTAS:
+        modulo = importlib.import_module(f".{FERRAMENTAS[argv[0]][0]}", __package__)
+        modulo.main(argv[1:], prog=f"sei-extract {argv[0]}")
+        return
+
+    args = criar_parser().parse_args(argv)
+    args.funcao(args)
@@ -0,0 +1,152 @@
+import argparse
+import logging
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Pesos dos dois dígitos verificadores do CNPJ
+_PESOS_DV1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int32)
+_PESOS_DV2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int32)
+
+logger = logging.getLogger(__name__)
+
+
+def normalizar_cnpj(cnpjs: pd.Series) -> pd.Series:
+    """Remove a pontuação, mantendo apenas os dígitos."""
+    return cnpjs.fillna("").astype(str).str.replace(r"[^0-9]", "", regex=True)
+
+
+def _digito_verificador(digitos: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+    resto = (digitos[:, : len(pesos)] * pesos).sum(axis=1) % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def validar_cnpj(normalizados: pd.Series) -> np.ndarray:
+    """Valida os dois dígitos verificadores de CNPJs já normalizados (vetorizado)."""
+    valido = np.zeros(len(normalizados), dtype=bool)
+    com_14 = (normalizados.str.len() == 14).to_numpy()
+    if not com_14.any():
+        return valido
+
+    # Todos os CNPJs de 14 dígitos em uma matriz (n, 14) de inteiros, sem laço por linha
+    texto = "".join(normalizados[com_14].tolist()).encode("ascii")
+    digitos = (np.frombuffer(texto, dtype=np.uint8).reshape(-1, 14) - ord("0")).astype(np.int32)
+
+    dv1 = _digito_verificador(digitos, _PESOS_DV1)
+    dv2 = _digito_verificador(digitos, _PESOS_DV2)
+    repetidos = (digitos == digitos[:, :1]).all(axis=1)
+
+    valido[com_14] = (digitos[:, 12] == dv1) & (digitos[:, 13] == dv2) & ~repetidos
+    return valido
+
+
+def preencher_cnpjs(df: pd.DataFrame, indice, limiar: float = 0.9) -> pd.DataFrame:
+    """Preenche pelo índice local o CNPJ das linhas que só têm o nome e adiciona a coluna CNPJ_Origem.
+
+    CNPJ_Origem: "pagina" (veio da página de detalhe), "indice_exato", "indice_aproximado"
+    ou vazio. Cada nome distinto é consultado uma vez; nomes ambíguos ficam sem CNPJ.
+    """
+    df = df.copy()
+    nomes = df["Nome"].fillna("").astype(str)
+    tem_cnpj = normalizar_cnpj(df["CNPJ"]) != ""
+    df["CNPJ_Origem"] = np.where(tem_cnpj, "pagina", "")
+
+    sem_cnpj = ~tem_cnpj & (nomes.str.strip() != "")
+    resolvidos = {nome: indice.resolver(nome, limiar) for nome in nomes[sem_cnpj].unique()}
+    df.loc[sem_cnpj, "CNPJ"] = nomes[sem_cnpj].map(lambda nome: resolvidos[nome][0])
+    df.loc[sem_cnpj, "CNPJ_Origem"] = nomes[sem_cnpj].map(lambda nome: resolvidos[nome][1])
+    return df
+
+
+def processar_cnpjs(df: pd.DataFrame) -> pd.DataFrame:
+    """Adiciona as colunas CNPJ_Normalizado e CNPJ_Valido ao DataFrame de resultados."""
+    df = df.copy()
+    df["CNPJ_Normalizado"] = normalizar_cnpj(df["CNPJ"])
+    df["CNPJ_Valido"] = validar_cnpj(df["CNPJ_Normalizado"])
+    return df
+
+
+def deduplicar_por_cnpj(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrupa as linhas de CNPJ válido, mantendo o primeiro nome e a lista de links de origem.
+
+    Linhas com CNPJ vazio ou inválido são mantidas como estão, para revisão. Os grupos saem
+    na ordem da primeira ocorrência, seguidos das linhas inválidas na ordem original.
+    """
+    valido = df["CNPJ_Valido"].to_numpy(dtype=bool)
+    codigos = np.empty(len(df), dtype=np.int64)
+    codigos[valido], unicos = pd.factorize(df["CNPJ_Normalizado"].to_numpy()[valido])
+    # Cada linha inválida é um grupo próprio, depois de todos os CNPJs válidos
+    codigos[~valido] = len(unicos) + np.arange(int((~valido).sum()))
+
+    # Uma única ordenação estável: cada grupo vira uma fatia contígua, sem lista por linha
+    ordem = np.argsort(codigos, kind="stable")
+    inicios = np.flatnonzero(np.diff(codigos[ordem], prepend=-1))
+    links = np.split(df["Link"].to_numpy(dtype=object)[ordem], inicios[1:]) if len(inicios) else []
+
+    colunas = ["Nome", "CNPJ", "CNPJ_Normalizado", "CNPJ_Valido"]
+    if "CNPJ_Origem" in df.columns:
+        colunas.append("CNPJ_Origem")
+    resultado = df.iloc[ordem[inicios]][colunas].reset_index(drop=True)
+    resultado.insert(4, "Links", pd.Series(links, dtype=object))
+    resultado.insert(5, "Ocorrencias", np.diff(inicios, append=len(ordem)))
+    return resultado
+
+
+def ler_tabela(caminho: str) -> pd.DataFrame:
+    """Lê um export (.csv, .parquet ou .xlsx) com as colunas Nome/CNPJ/Link."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".parquet":
+        df = pd.read_parquet(caminho)
+    elif extensao == ".xlsx":
+        df = pd.read_excel(caminho, dtype=str)
+    else:
+        df = pd.read_csv(caminho, dtype=str, keep_default_na=False)
+    if "Link" not in df.columns:
+        df["Link"] = ""
+    return df
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog=prog, description="Normaliza, valida e deduplica os CNPJs de um export.")
+    parser.add_argument("entrada", help="Arquivo exportado (.csv, .parquet ou .xlsx)")
+    parser.add_argument("saida", help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument(
+        "--indice-cnpj",
+        default=None,
+        help="Índice de `sei-extract indice-cnpj construir` para preencher o CNPJ das linhas que só têm o nome",
+    )
+    parser.add_argument("--limiar", type=float, default=0.9, help="Semelhança mínima da busca aproximada no índice")
+    args = parser.parse_args(argv)
+
+    df = ler_tabela(args.entrada)
+    if args.indice_cnpj:
+        from .indice_cnpj import IndiceCnpj
+
+        indice = IndiceCnpj(args.indice_cnpj)
+        try:
+            df = preencher_cnpjs(df, indice, args.limiar)
+        finally:
+            indice.close()
+        origens = df["CNPJ_Origem"].value_counts()
+        logger.info(
+            f"CNPJs preenchidos pelo índice: {origens.get('indice_exato', 0)} exatos, "
+            f"{origens.get('indice_aproximado', 0)} aproximados."
+        )
+
+    df = processar_cnpjs(df)
+    logger.info(f"{len(df)} linhas lidas, {int((~df['CNPJ_Valido']).sum())} com CNPJ vazio ou inválido.")
+
+    resultado = deduplicar_por_cnpj(df)
+    logger.info(f"{len(resultado)} linhas após deduplicação por CNPJ.")
+
+    if args.saida.endswith(".parquet"):
+        resultado.to_parquet(args.saida, index=False)
+    else:
+        resultado.assign(Links=resultado["Links"].str.join(" ")).to_csv(args.saida, index=False)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,254 @@
+"""Coleta dos links de resultado sem scroll: repete a própria requisição de paginação da página.
+
+O scroll infinito da lista de resultados busca a próxima página com fetch/XHR. Um gancho
+injetado registra essas requisições nas duas primeiras rolagens; o parâmetro que muda de
+uma para a outra é o deslocamento (offset ou número da página), e pedimos as páginas
+seguintes diretamente, várias por vez, até chegar ao total informado pela página. Cada
+link volta como [href, texto], o texto sendo o número de protocolo usado no agrupamento
+por processo.
+
+Só o total de div.total-registros-infinite encerra a coleta; um número achado pelos
+seletores genéricos é apenas informado, e a paginação segue até uma página vazia ou
+repetida, para que um número sem relação com a lista não a trunque. Se a coleta termina
+abaixo do total confiável, devolve None e a lista é carregada pelo scroll.
+"""
+import logging
+import math
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .resultados_pesquisa import ResultadoPesquisa
+
+# Div do SEI com o total de resultados; o único seletor em que o total é confiável
+SELETOR_TOTAL_CONFIAVEL = "div.total-registros-infinite"
+
+# Seletor(s) possíveis da div de total de resultados, do mais ao menos específico
+SELETORES_TOTAL = [
+    SELETOR_TOTAL_CONFIAVEL,
+    ".total-registros",
+    ".resultado-total",
+    "[class*='total']",
+    "[class*='resultado']",
+]
+
+# Nomes usuais do parâmetro de deslocamento e do tamanho da página (este nunca é o deslocamento)
+NOMES_DESLOCAMENTO = ("offset", "inicio", "start", "first", "skip", "deslocamento", "pagina", "page", "pag")
+NOMES_TAMANHO = ("quantidade", "itens", "rows", "tamanho", "limit", "size", "pagesize", "por_pagina")
+
+# Instala (uma vez) o registro de fetch/XHR, rola até o fim e devolve total e links atuais
+_JS_PREPARAR = """
+var seletor = arguments[0], seletoresTotal = arguments[1];
+function contar() { return document.querySelectorAll(seletor).length; }
+if (!window.__coleta) {
+    var coleta = window.__coleta = {pedidos: [], fetch: window.fetch};
+    if (coleta.fetch) {
+        window.fetch = function (entrada, opcoes) {
+            coleta.pedidos.push({
+                url: new URL(typeof entrada === 'string' ? entrada : entrada.url, location.href).href,
+                metodo: (opcoes && opcoes.method) || 'GET',
+                corpo: (opcoes && typeof opcoes.body === 'string') ? opcoes.body : null,
+                links_antes: contar()
+            });
+            return coleta.fetch.apply(this, arguments);
+        };
+    }
+    var abrir = XMLHttpRequest.prototype.open, enviar = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (metodo, url) {
+        this.__pedido = {url: new URL(url, location.href).href, metodo: metodo};
+        return abrir.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function (corpo) {
+        if (this.__pedido) {
+            this.__pedido.corpo = typeof corpo === 'string' ? corpo : null;
+            this.__pedido.links_antes = contar();
+            coleta.pedidos.push(this.__pedido);
+        }
+        return enviar.apply(this, arguments);
+    };
+}
+var total = null, seletorTotal = null;
+for (var i = 0; i < seletoresTotal.length && total === null; i++) {
+    var elementos = document.querySelectorAll(seletoresTotal[i]);
+    for (var j = 0; j < elementos.length; j++) {
+        var numero = (elementos[j].innerText || '').match(/\\d+/);
+        if (numero) { total = parseInt(numero[0], 10); seletorTotal = seletoresTotal[i]; break; }
+    }
+}
+var hrefs = Array.from(document.querySelectorAll(seletor))
+    .filter(function (a) { return a.getAttribute('href'); })
+    .map(function (a) { return [a.href, a.textContent]; });
+if (total === null || seletorTotal !== seletoresTotal[0] || hrefs.length < total) {
+    window.scrollTo(0, document.body.scrollHeight);
+    window.dispatchEvent(new Event('scroll'));
+}
+return {total: total, seletor_total: seletorTotal, hrefs: hrefs};
+"""
+
+_JS_ROLAR = "window.scrollTo(0, document.body.scrollHeight); window.dispatchEvent(new Event('scroll'));"
+
+# Requisição de índice arguments[1], depois que a página já inseriu os links que ela trouxe
+_JS_PEDIDO_CONCLUIDO = """
+var pedido = window.__coleta && window.__coleta.pedidos[arguments[1]];
+if (!pedido || document.querySelectorAll(arguments[0]).length <= pedido.links_antes) return null;
+return {
+    pedido: pedido,
+    hrefs: Array.from(document.querySelectorAll(arguments[0]))
+        .filter(function (a) { return a.getAttribute('href'); })
+        .map(function (a) { return [a.href, a.textContent]; })
+};
+"""
+
+# Busca várias páginas em paralelo com os cookies da sessão e devolve [href, texto] dos links de cada uma
+_JS_BUSCAR_PAGINAS = """
+var pedidos = arguments[0], seletor = arguments[1], concluir = arguments[arguments.length - 1];
+var buscar = window.__coleta.fetch || window.fetch;
+Promise.all(pedidos.map(function (p) {
+    var headers = {'X-Requested-With': 'XMLHttpRequest'};
+    if (p.corpo) { headers['Content-Type'] = 'application/x-www-form-urlencoded'; }
+    return buscar(p.url, {method: p.metodo, body: p.corpo, headers: headers, credentials: 'same-origin'})
+        .then(function (r) { return r.text(); })
+        .then(function (html) {
+            var doc = new DOMParser().parseFromString(html, 'text/html');
+            return Array.from(doc.querySelectorAll(seletor))
+                .filter(function (a) { return a.getAttribute('href'); })
+                .map(function (a) { return [new URL(a.getAttribute('href'), location.href).href, a.textContent]; });
+        });
+})).then(
+    function (paginas) { concluir({paginas: paginas}); },
+    function (e) { concluir({erro: String(e)}); }
+);
+"""
+
+
+def _substituir_parametro(consulta: str, parametro: str, valor: int) -> str:
+    return urlencode([(k, str(valor) if k == parametro else v) for k, v in parse_qsl(consulta, keep_blank_values=True)])
+
+
+def _parametros_numericos(pedido: dict) -> Dict[Tuple[str, str], int]:
+    """{(onde, nome): valor} dos parâmetros numéricos da URL e do corpo da requisição."""
+    fontes = [("url", urlsplit(pedido["url"]).query), ("corpo", pedido.get("corpo") or "")]
+    return {(onde, nome): int(valor) for onde, consulta in fontes for nome, valor in parse_qsl(consulta) if valor.isdigit()}
+
+
+def _localizar_deslocamento(
+    primeiro: dict, segundo: dict, por_pagina: int
+) -> Optional[Tuple[str, str, int, int]]:
+    """Acha o parâmetro de paginação comparando duas requisições seguidas: (onde, nome, valor na segunda, passo) ou None.
+
+    Só o parâmetro que muda entre as duas serve: avançando `por_pagina`, é um offset;
+    avançando 1, um índice de página. Parâmetros de tamanho da página (NOMES_TAMANHO) são
+    descartados e, se mais de um candidato sobrar, os NOMES_DESLOCAMENTO têm preferência.
+    """
+    antes = _parametros_numericos(primeiro)
+    candidatos = []
+    for (onde, nome), valor in _parametros_numericos(segundo).items():
+        if (onde, nome) not in antes or nome.lower() in NOMES_TAMANHO:
+            continue
+        passo = valor - antes[(onde, nome)]
+        if passo > 0 and passo in (por_pagina, 1):
+            candidatos.append((nome.lower() not in NOMES_DESLOCAMENTO, onde, nome, valor, passo))
+    if not candidatos:
+        return None
+    _, onde, nome, valor, passo = min(candidatos, key=lambda candidato: candidato[0])
+    return onde, nome, valor, passo
+
+
+def _montar_pedido(pedido: dict, onde: str, parametro: str, valor: int) -> dict:
+    if onde == "corpo":
+        return {**pedido, "corpo": _substituir_parametro(pedido["corpo"], parametro, valor)}
+    partes = urlsplit(pedido["url"])
+    return {**pedido, "url": urlunsplit(partes._replace(query=_substituir_parametro(partes.query, parametro, valor)))}
+
+
+def _registros(pares: List[List[str]]) -> List[ResultadoPesquisa]:
+    """[href, texto] vindos do navegador -> ResultadoPesquisa, sem hrefs repetidos."""
+    return [ResultadoPesquisa.de_ancora(href, texto) for href, texto in dict(map(tuple, pares)).items()]
+
+
+def coletar_links_direto(
+    driver,
+    seletor: str = "a.protocoloNormal",
+    paginas_por_lote: int = 5,
+    timeout: float = 15,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[Tuple[List[ResultadoPesquisa], Optional[int]]]:
+    """Retorna (resultados, total informado) sem scroll, ou None se a paginação não for reconhecida
+    ou a contagem não bater com o total confiável.
+
+    O total só é devolvido quando vem de SELETOR_TOTAL_CONFIAVEL; de outro seletor, sai None.
+    """
+    logger = logger or logging.getLogger(__name__)
+    estado = driver.execute_script(_JS_PREPARAR, seletor, SELETORES_TOTAL)
+    total, hrefs = estado["total"], estado["hrefs"]
+    # Total de seletor genérico não limita a coleta: segue até uma página vazia ou repetida
+    limite = total if estado["seletor_total"] == SELETOR_TOTAL_CONFIAVEL else None
+    if total is not None and limite is None:
+        logger.warning(
+            f"Total {total} lido do seletor genérico '{estado['seletor_total']}'; "
+            "coletando até o fim da paginação em vez de confiar nele."
+        )
+    if limite is not None and len(hrefs) >= limite:
+        logger.info(f"Todos os {total} resultados já estão na primeira página.")
+        return _registros(hrefs), limite
+
+    pedidos = []
+    for indice in range(2):
+        if indice:
+            driver.execute_script(_JS_ROLAR)
+        try:
+            concluido = WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(_JS_PEDIDO_CONCLUIDO, seletor, indice)
+            )
+        except Exception:
+            logger.warning(f"A página não fez a {indice + 1}ª requisição de paginação após a rolagem.")
+            return None
+        pedidos.append(concluido["pedido"])
+        hrefs = concluido["hrefs"]
+        if limite is not None and len(hrefs) >= limite:
+            logger.info(f"Todos os {limite} resultados carregados pela própria página.")
+            return _registros(hrefs), limite
+
+    primeiro, pedido = pedidos
+    por_pagina = pedido["links_antes"] - primeiro["links_antes"]
+    deslocamento = _localizar_deslocamento(primeiro, pedido, por_pagina)
+    if not deslocamento:
+        logger.warning(f"Parâmetro de paginação não reconhecido em {pedido['url']}.")
+        return None
+    onde, parametro, valor, passo = deslocamento
+    logger.info(
+        f"Paginação direta: {pedido['metodo']} {urlsplit(pedido['url']).path}, parâmetro '{parametro}' "
+        f"({'offset' if passo > 1 else 'página'}), {por_pagina} resultados por página, total informado: {limite}"
+    )
+
+    links = _registros(hrefs)
+    vistos = {resultado.href for resultado in links}
+    proximo = valor + passo
+    driver.set_script_timeout(timeout)
+    while limite is None or len(links) < limite:
+        faltam = math.ceil((limite - len(links)) / por_pagina) if limite is not None else paginas_por_lote
+        lote = [_montar_pedido(pedido, onde, parametro, proximo + i * passo) for i in range(min(paginas_por_lote, faltam))]
+        resposta = driver.execute_async_script(_JS_BUSCAR_PAGINAS, lote, seletor)
+        if "erro" in resposta:
+            logger.warning(f"Erro na paginação direta: {resposta['erro']}")
+            return None
+
+        novos = 0
+        for pagina in resposta["paginas"]:
+            for resultado in _registros(pagina):
+                if resultado.href not in vistos:
+                    vistos.add(resultado.href)
+                    links.append(resultado)
+                    novos += 1
+        logger.info(f"{len(links)} links coletados" + (f" de {limite}" if limite is not None else ""))
+        # Página vazia ou repetida: a lista acabou
+        if not novos or any(not pagina for pagina in resposta["paginas"]):
+            break
+        proximo += len(lote) * passo
+
+    if limite is not None and len(links) != limite:
+        # Contagem diferente do total confiável: o parâmetro escolhido não pagina a lista
+        logger.warning(f"Paginação direta terminou com {len(links)} de {limite} links.")
+        return None
+    return links, limite
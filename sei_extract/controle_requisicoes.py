@@ -0,0 +1,222 @@
+"""Política das requisições às páginas de detalhe: classificação de erros, retentativas e disjuntor.
+
+Os extratores sinalizam falhas por exceção:
+
+    NaoEncontrado     o servidor respondeu que o processo não existe (404/410); não adianta repetir
+    ErroTransitorio   timeout, conexão recusada, 429 ou 5xx; repetido com backoff exponencial e jitter
+
+Erros do WebDriver (navegador que morreu ou não pôde ser recriado) contam como transitórios.
+Outras exceções (ex.: erro no parser) saem como erro sem nova tentativa. Cada linha extraída
+recebe uma situação, gravada no diário e na coluna Situacao da saída, para que linhas vazias
+por falha não se confundam com páginas que realmente não trazem nome nem CNPJ.
+"""
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+
+SITUACAO_OK = "ok"
+SITUACAO_VAZIO = "vazio"
+SITUACAO_NAO_ENCONTRADO = "nao_encontrado"
+SITUACAO_ERRO = "erro"
+
+
+class ErroTransitorio(Exception):
+    """Falha que pode passar sozinha; `espera` é o Retry-After sugerido pelo servidor, se houver."""
+
+    def __init__(self, mensagem: str, espera: Optional[float] = None):
+        super().__init__(mensagem)
+        self.espera = espera
+
+
+class NaoEncontrado(Exception):
+    """O servidor respondeu, mas o processo não existe."""
+
+
+class CircuitoAberto(Exception):
+    """O disjuntor desistiu do site; as requisições restantes não são enviadas."""
+
+
+def situacao_dos_dados(nome: str, cnpj: str) -> str:
+    """Situação de uma página que carregou: ok se trouxe nome ou CNPJ, senão vazio."""
+    return SITUACAO_OK if nome or cnpj else SITUACAO_VAZIO
+
+
+def falha_transitoria(erro: Exception) -> bool:
+    """True se a falha pode passar sozinha: ErroTransitorio ou erro do WebDriver."""
+    return isinstance(erro, (ErroTransitorio, WebDriverException))
+
+
+def situacao_do_erro(erro: Exception) -> str:
+    """Situação final de um link cuja última tentativa terminou em `erro`."""
+    return SITUACAO_NAO_ENCONTRADO if isinstance(erro, NaoEncontrado) else SITUACAO_ERRO
+
+
+class Disjuntor:
+    """Circuit breaker do SEI: abre após `limite_falhas` erros transitórios seguidos.
+
+    Aberto, segura as requisições por `espera` segundos e depois deixa passar uma única
+    requisição de teste (meio-aberto). Sucesso fecha o circuito; falha reabre com a espera
+    dobrada, até `espera_maxima`. Após `max_aberturas` aberturas seguidas sem nenhum
+    sucesso, desiste: `espera_liberacao()` passa a lançar CircuitoAberto e os links
+    restantes saem como erro, para a retomada tentar mais tarde.
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(
+        self,
+        limite_falhas: int = 5,
+        espera: float = 30.0,
+        espera_maxima: float = 300.0,
+        max_aberturas: Optional[int] = 5,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.limite_falhas = max(1, limite_falhas)
+        self.espera_inicial = espera
+        self.espera_maxima = espera_maxima
+        self.max_aberturas = max_aberturas
+        self.logger = logger or logging.getLogger(__name__)
+        self.estado = self.FECHADO
+        self.falhas_seguidas = 0
+        self.aberturas = 0
+        self.desistiu = False
+        self._aberturas_seguidas = 0
+        self._espera = espera
+        self._fecha_em = 0.0
+        self._teste_em_andamento = False
+        self._lock = threading.Lock()
+
+    def espera_liberacao(self) -> float:
+        """Segundos até a próxima requisição poder sair; 0 libera a requisição agora."""
+        with self._lock:
+            if self.estado == self.FECHADO:
+                return 0.0
+            if self.desistiu:
+                raise CircuitoAberto(f"SEI indisponível após {self.aberturas} aberturas do disjuntor")
+            agora = time.monotonic()
+            if self.estado == self.ABERTO:
+                if agora < self._fecha_em:
+                    return self._fecha_em - agora
+                self.estado = self.MEIO_ABERTO
+                self._teste_em_andamento = False
+            if not self._teste_em_andamento:
+                self._teste_em_andamento = True
+                self.logger.info("Disjuntor meio-aberto: enviando requisição de teste.")
+                return 0.0
+            return min(1.0, self._espera)
+
+    def registrar_sucesso(self) -> None:
+        """O servidor respondeu (mesmo que 404): fecha o circuito."""
+        with self._lock:
+            if self.estado != self.FECHADO:
+                self.logger.info("Disjuntor fechado: SEI voltou a responder.")
+            self.estado = self.FECHADO
+            self.falhas_seguidas = 0
+            self._aberturas_seguidas = 0
+            self._espera = self.espera_inicial
+            self._teste_em_andamento = False
+
+    def registrar_falha(self) -> None:
+        """Erro transitório: conta para abrir o circuito ou reabre após um teste malsucedido."""
+        with self._lock:
+            self.falhas_seguidas += 1
+            if self.estado == self.MEIO_ABERTO:
+                self._espera = min(self.espera_maxima, self._espera * 2)
+                self._abrir()
+            elif self.estado == self.FECHADO and self.falhas_seguidas >= self.limite_falhas:
+                self._abrir()
+
+    def _abrir(self) -> None:
+        self.estado = self.ABERTO
+        self.aberturas += 1
+        self._aberturas_seguidas += 1
+        self._teste_em_andamento = False
+        self._fecha_em = time.monotonic() + self._espera
+        if self.max_aberturas is not None and self._aberturas_seguidas > self.max_aberturas:
+            self.desistiu = True
+            self.logger.error(f"Disjuntor: {self.falhas_seguidas} falhas seguidas; desistindo das requisições restantes.")
+        else:
+            self.logger.warning(
+                f"Disjuntor aberto após {self.falhas_seguidas} falhas seguidas; pausando por {self._espera:.1f}s."
+            )
+
+
+class ControleRequisicoes:
+    """Retentativas com backoff exponencial e jitter, disjuntor e contagem das situações finais.
+
+    Compartilhado pelos modos de extração (pipeline assíncrono e pool de navegadores).
+    """
+
+    def __init__(
+        self,
+        max_tentativas: int = 4,
+        backoff_base: float = 1.0,
+        backoff_maximo: float = 60.0,
+        disjuntor: Optional[Disjuntor] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.max_tentativas = max(1, max_tentativas)
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.disjuntor = disjuntor or Disjuntor()
+        self.logger = logger or logging.getLogger(__name__)
+        self.contagem: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def espera_liberacao(self) -> float:
+        """Repassa ao disjuntor; lança CircuitoAberto se ele desistiu do site."""
+        return self.disjuntor.espera_liberacao()
+
+    def espera_retentativa(self, tentativa: int, erro: Exception) -> float:
+        """Backoff exponencial com jitter completo; o Retry-After do servidor é o mínimo."""
+        espera = random.uniform(0, min(self.backoff_maximo, self.backoff_base * 2 ** (tentativa - 1)))
+        sugerida = getattr(erro, "espera", None)
+        return max(espera, min(sugerida, self.backoff_maximo)) if sugerida else espera
+
+    def registrar_sucesso(self) -> None:
+        self.disjuntor.registrar_sucesso()
+
+    def registrar_falha(self, link: str, erro: Exception, tentativa: int) -> Optional[float]:
+        """Contabiliza a falha da `tentativa`; retorna a espera antes de repetir, ou None se não há nova tentativa."""
+        if not falha_transitoria(erro):
+            # O servidor respondeu; o problema é da página ou do parser
+            self.disjuntor.registrar_sucesso()
+            if isinstance(erro, NaoEncontrado):
+                self.logger.info(f"Processo não encontrado em {link}: {erro}")
+            else:
+                self.logger.error(f"Erro ao extrair dados do link {link}: {erro}")
+            return None
+
+        self.disjuntor.registrar_falha()
+        if tentativa >= self.max_tentativas:
+            self.logger.error(f"Falha transitória em {link}; {tentativa} tentativas esgotadas: {erro}")
+            return None
+        espera = self.espera_retentativa(tentativa, erro)
+        with self._lock:
+            self.contagem["retentativas"] += 1
+        self.logger.warning(
+            f"Falha transitória em {link} (tentativa {tentativa}/{self.max_tentativas}): {erro}; "
+            f"nova tentativa em {espera:.1f}s"
+        )
+        return espera
+
+    def contar(self, situacao: str) -> None:
+        """Registra a situação final de um link."""
+        with self._lock:
+            self.contagem[situacao] += 1
+
+    def relatorio(self) -> Counter:
+        """Loga e retorna a contagem de situações finais e retentativas."""
+        self.logger.info(
+            f"Situações: {self.contagem[SITUACAO_OK]} ok, {self.contagem[SITUACAO_VAZIO]} vazias, "
+            f"{self.contagem[SITUACAO_NAO_ENCONTRADO]} não encontradas, {self.contagem[SITUACAO_ERRO]} com erro; "
+            f"{self.contagem['retentativas']} retentativas, disjuntor aberto {self.disjuntor.aberturas} vez(es)."
+        )
+        return self.contagem
@@ -0,0 +1,218 @@
+"""Daemon que mantém navegadores Edge aquecidos e recebe pesquisas por um socket local.
+
+    sei-extract daemon servir --sessoes 2 --porta 8765
+    sei-extract daemon enviar --porta 8765 -- --de 2026-01-01 --ate 2026-01-31 --formato csv
+
+Cada pedido é uma linha JSON {"argv": [...]} com as mesmas opções de `sei-extract extract`;
+a resposta é uma linha JSON com o status da execução. Pedidos sem --diario, --saida ou
+--metricas-json recebem caminhos próprios (sufixo _s<sessão>_p<pedido>), para que sessões
+simultâneas não sobrescrevam o diário e a saída umas das outras.
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from . import extracao_email
+from .instrumentacao import Metricas
+from .opcoes import parse_args
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessaoAquecida:
+    """Um EdgeDriverManager mantido aberto entre pesquisas."""
+
+    indice: int
+    headless: bool = False
+    manager: Optional[extracao_email.EdgeDriverManager] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    pesquisas: int = 0
+
+    def iniciar(self) -> None:
+        """(Re)cria o driver e já carrega a página de pesquisa."""
+        self.encerrar()
+        self.manager = extracao_email.EdgeDriverManager(headless=self.headless, driver_path=extracao_email.DRIVER_PATH)
+        if not self.manager.setup_driver():
+            raise RuntimeError(f"Falha ao inicializar o WebDriver da sessão {self.indice}.")
+        self.manager.driver.get(extracao_email.URL_SEI_SP)
+        self.pesquisas = 0
+        logger.info(f"Sessão {self.indice} aquecida.")
+
+    def saudavel(self) -> bool:
+        """Verifica se o driver ainda responde e a página do SEI ainda carrega."""
+        if not self.manager or not self.manager.driver:
+            return False
+        try:
+            return self.manager.driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    def encerrar(self) -> None:
+        if self.manager:
+            try:
+                self.manager.close()
+            except Exception:
+                pass
+            self.manager = None
+
+
+class DaemonNavegador:
+    """Fila de pesquisas atendida por N sessões aquecidas, com verificação periódica de saúde."""
+
+    def __init__(self, sessoes: int = 1, porta: int = 8765, intervalo_saude: float = 60, headless: bool = False):
+        self.porta = porta
+        self.intervalo_saude = intervalo_saude
+        self.sessoes = [SessaoAquecida(indice=i, headless=headless) for i in range(max(1, sessoes))]
+        self.fila: queue.Queue = queue.Queue()
+        self._parar = threading.Event()
+        self._pedidos = itertools.count(1)
+        self._padroes = parse_args([])
+
+    def _caminhos_exclusivos(self, args: argparse.Namespace, sessao: SessaoAquecida) -> None:
+        """Troca os caminhos padrão de diário, saída e métricas por caminhos só deste pedido."""
+        sufixo = f"_s{sessao.indice}_p{next(self._pedidos)}"
+        if args.diario == self._padroes.diario:
+            raiz, extensao = os.path.splitext(args.diario)
+            args.diario = f"{raiz}{sufixo}{extensao}"
+        if not args.saida:
+            args.saida = f"dados_extraidos{sufixo}.{args.formato}"
+        if args.metricas_json == self._padroes.metricas_json:
+            raiz, extensao = os.path.splitext(args.metricas_json)
+            args.metricas_json = f"{raiz}{sufixo}{extensao}"
+
+    def _executar_pedido(self, sessao: SessaoAquecida, argv: List[str]) -> Dict[str, Any]:
+        args = parse_args(argv)
+        self._caminhos_exclusivos(args, sessao)
+        # Arquivo de trabalho inválido falha o pedido sem ocupar a sessão
+        consultas = extracao_email.carregar_consultas(args)
+        with sessao.lock:
+            if not sessao.saudavel():
+                logger.warning(f"Sessão {sessao.indice} não responde; reiniciando.")
+                sessao.iniciar()
+
+            inicio = time.perf_counter()
+            metricas = Metricas()
+            try:
+                with metricas.ativa():
+                    sucesso = extracao_email.executar(args, sessao.manager.driver, metricas, consultas)
+            except Exception as e:
+                # Sessão expirada ou driver caído: recria para o próximo pedido
+                logger.error(f"Erro na sessão {sessao.indice}: {e}")
+                sessao.iniciar()
+                return {"status": "erro", "erro": str(e)}
+            sessao.pesquisas += 1
+
+        return {
+            "status": "ok" if sucesso else "falha_pesquisa",
+            "sessao": sessao.indice,
+            "pesquisas_na_sessao": sessao.pesquisas,
+            "duracao_segundos": round(time.perf_counter() - inicio, 3),
+            "saida": args.saida,
+            "diario": args.diario,
+            "metricas_json": args.metricas_json,
+        }
+
+    def _worker(self, sessao: SessaoAquecida) -> None:
+        while not self._parar.is_set():
+            try:
+                argv, resposta = self.fila.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                resposta.put(self._executar_pedido(sessao, argv))
+            except SystemExit:
+                # argparse encerra o processo com opções inválidas; aqui só o pedido falha
+                resposta.put({"status": "erro", "erro": f"opções inválidas: {argv}"})
+            except Exception as e:
+                resposta.put({"status": "erro", "erro": str(e)})
+            finally:
+                self.fila.task_done()
+
+    def _verificar_saude(self) -> None:
+        while not self._parar.wait(self.intervalo_saude):
+            for sessao in self.sessoes:
+                # Sessão ocupada com uma pesquisa é verificada na próxima rodada
+                if not sessao.lock.acquire(blocking=False):
+                    continue
+                try:
+                    if not sessao.saudavel():
+                        logger.warning(f"Sessão {sessao.indice} falhou na verificação de saúde; reiniciando.")
+                        sessao.iniciar()
+                except Exception as e:
+                    logger.error(f"Não foi possível reiniciar a sessão {sessao.indice}: {e}")
+                finally:
+                    sessao.lock.release()
+
+    def servir(self) -> None:
+        """Aquece as sessões e atende pedidos em 127.0.0.1:porta até ser interrompido."""
+        # Instrumentado uma vez; cada pedido mede as etapas na sua própria Metricas
+        remover_instrumentacao = extracao_email.instrumentar_etapas()
+        for sessao in self.sessoes:
+            sessao.iniciar()
+            threading.Thread(target=self._worker, args=(sessao,), daemon=True).start()
+        threading.Thread(target=self._verificar_saude, daemon=True).start()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                pedido = json.loads(self.rfile.readline())
+                resposta: queue.Queue = queue.Queue()
+                daemon.fila.put((pedido.get("argv", []), resposta))
+                self.wfile.write((json.dumps(resposta.get(), ensure_ascii=False) + "\n").encode("utf-8"))
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        with socketserver.ThreadingTCPServer(("127.0.0.1", self.porta), Handler) as servidor:
+            logger.info(f"Daemon aguardando pesquisas em 127.0.0.1:{self.porta} com {len(self.sessoes)} sessões.")
+            try:
+                servidor.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self._parar.set()
+                for sessao in self.sessoes:
+                    sessao.encerrar()
+                remover_instrumentacao()
+
+
+def enviar(argv: List[str], porta: int = 8765) -> Dict[str, Any]:
+    """Envia uma pesquisa ao daemon e aguarda a resposta."""
+    with socket.create_connection(("127.0.0.1", porta)) as conexao:
+        conexao.sendall((json.dumps({"argv": argv}) + "\n").encode("utf-8"))
+        return json.loads(conexao.makefile(encoding="utf-8").readline())
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog=prog, description="Daemon de navegadores aquecidos para o extrator SEI.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    servir = subparsers.add_parser("servir", help="Inicia o daemon")
+    servir.add_argument("--sessoes", type=int, default=1, help="Quantidade de navegadores aquecidos")
+    servir.add_argument("--porta", type=int, default=8765)
+    servir.add_argument("--intervalo-saude", type=float, default=60, help="Segundos entre verificações de saúde")
+    servir.add_argument("--headless", action="store_true")
+
+    cliente = subparsers.add_parser("enviar", help="Envia uma pesquisa ao daemon")
+    cliente.add_argument("--porta", type=int, default=8765)
+    cliente.add_argument("argv_extrator", nargs=argparse.REMAINDER, help="Opções repassadas ao extrator")
+
+    args = parser.parse_args(argv)
+    if args.comando == "servir":
+        DaemonNavegador(args.sessoes, args.porta, args.intervalo_saude, args.headless).servir()
+    else:
+        argv_extrator = [a for a in args.argv_extrator if a != "--"]
+        print(json.dumps(enviar(argv_extrator, args.porta), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import logging
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .controle_requisicoes import ErroTransitorio, NaoEncontrado
+from .parser_detalhe import parse_dados_cliente
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    # Só a forma em segundos; a forma com data HTTP é rara no SEI e cai no backoff normal
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class HttpDetailFetcher:
+    """Baixa as páginas md_pesq_processo_exibir via HTTP, sem abrir abas no navegador."""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        timeout: float = 15,
+        logger: Optional[logging.Logger] = None,
+        arquivo=None,
+    ):
+        self.session = session
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.arquivo = arquivo
+
+    @classmethod
+    def from_driver(cls, driver, pool_size: int = 10, timeout: float = 15, arquivo=None) -> "HttpDetailFetcher":
+        """Cria o fetcher copiando cookies e User-Agent da sessão Selenium já autenticada."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+
+        for cookie in driver.get_cookies():
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+            )
+        return cls(session, timeout=timeout, arquivo=arquivo)
+
+    def baixar_pagina(self, link: str) -> str:
+        """Retorna o HTML bruto da página de detalhe.
+
+        Lança NaoEncontrado para 404/410 e ErroTransitorio para timeout, falha de conexão, 429 e 5xx.
+        """
+        try:
+            response = self.session.get(link, timeout=self.timeout)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            raise ErroTransitorio(f"{type(e).__name__}: {e}") from e
+        if response.status_code in (404, 410):
+            raise NaoEncontrado(f"HTTP {response.status_code}")
+        if response.status_code == 429 or response.status_code >= 500:
+            raise ErroTransitorio(f"HTTP {response.status_code}", espera=_retry_after(response))
+        response.raise_for_status()
+        return response.text
+
+    def extrair_dados_cliente(self, link: str) -> Tuple[str, str]:
+        """Baixa o link e extrai nome e CNPJ com a mesma regex e fallback do navegador.
+
+        Falhas sobem como exceção para o ControleRequisicoes decidir se repete o link.
+        """
+        self.logger.info(f"Baixando link: {link}")
+        html = self.baixar_pagina(link)
+        if self.arquivo:
+            self.arquivo.guardar(link, html)
+        return parse_dados_cliente(html)
+
+    def close(self) -> None:
+        """Fecha o pool de conexões HTTP."""
+        self.session.close()
@@ -0,0 +1,166 @@
+import datetime
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .controle_requisicoes import SITUACAO_ERRO, situacao_dos_dados
+from .resultados_pesquisa import identificar_processo
+
+
+class DiarioExecucao:
+    """Diário append-only (JSONL) da execução, usado para retomar execuções interrompidas.
+
+    A primeira linha guarda a lista de links da pesquisa, o processo de cada link (e, com
+    arquivo de trabalho, a consulta de cada posição); cada linha seguinte é um resultado extraído, gravado e
+    sincronizado em disco assim que fica pronto. Linhas com situação "erro" continuam
+    pendentes e podem ser substituídas por uma nova linha do mesmo link.
+    """
+
+    def __init__(self, caminho: str = "execucao.jsonl", logger: Optional[logging.Logger] = None):
+        self.caminho = caminho
+        self.logger = logger or logging.getLogger(__name__)
+        self._links: List[str] = []
+        self._consultas: Optional[List[str]] = None
+        self._processos: Optional[List[str]] = None
+        self._concluidos: Dict[str, Tuple[str, str, str, str]] = {}
+        self._arquivo = None
+        self._lock = threading.Lock()
+
+    def iniciar(
+        self,
+        links: List[str],
+        consultas: Optional[List[str]] = None,
+        processos: Optional[List[str]] = None,
+    ) -> None:
+        """Começa um diário novo com a lista de links da pesquisa, a consulta e o processo de cada um."""
+        self._links = list(links)
+        self._consultas = list(consultas) if consultas is not None else None
+        self._processos = list(processos) if processos is not None else None
+        self._concluidos = {}
+        self._arquivo = open(self.caminho, "w", encoding="utf-8")
+        registro = {"tipo": "links", "links": self._links}
+        if self._consultas is not None:
+            registro["consultas"] = self._consultas
+        if self._processos is not None:
+            registro["processos"] = self._processos
+        self._gravar(registro)
+
+    def retomar(self) -> List[str]:
+        """Recarrega links e linhas concluídas; retorna os links que ainda faltam."""
+        self.carregar()
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        if self._arquivo.tell() and not self._termina_com_quebra():
+            self._arquivo.write("\n")
+        pendentes = self.pendentes()
+        erros = sum(1 for *_, situacao in self._concluidos.values() if situacao == SITUACAO_ERRO)
+        self.logger.info(
+            f"Retomando execução: {len(self._concluidos) - erros} linhas concluídas, "
+            f"{len(pendentes)} links pendentes ({erros} com erro na execução anterior)."
+        )
+        return pendentes
+
+    def carregar(self) -> None:
+        """Lê links e linhas concluídas do arquivo, sem abri-lo para escrita."""
+        if not os.path.exists(self.caminho):
+            raise FileNotFoundError(f"Diário {self.caminho} não encontrado.")
+
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for numero, linha in enumerate(arquivo, 1):
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    # Última linha pode ter ficado pela metade se o processo caiu durante a escrita
+                    self.logger.warning(f"Linha {numero} do diário ignorada (incompleta).")
+                    continue
+                if registro["tipo"] == "links":
+                    self._links = registro["links"]
+                    self._consultas = registro.get("consultas")
+                    self._processos = registro.get("processos")
+                elif registro["tipo"] == "linha":
+                    # Diários anteriores à coluna situacao não distinguem erro de página vazia
+                    self._concluidos[registro["link"]] = (
+                        registro["Nome"],
+                        registro["CNPJ"],
+                        registro.get("extraido_em", ""),
+                        registro.get("situacao") or situacao_dos_dados(registro["Nome"], registro["CNPJ"]),
+                    )
+
+    def links(self) -> List[str]:
+        """Lista completa de links da pesquisa, na ordem original."""
+        return list(self._links)
+
+    def consultas(self) -> Optional[List[str]]:
+        """Consulta de cada posição de links(), ou None se a pesquisa não veio de um arquivo de trabalho."""
+        return list(self._consultas) if self._consultas is not None else None
+
+    def processos(self) -> List[str]:
+        """Chave do processo de cada posição de links(); diários sem ela usam o id_procedimento do href."""
+        if self._processos is not None:
+            return list(self._processos)
+        return [identificar_processo(link) for link in self._links]
+
+    def pendentes(self) -> List[str]:
+        """Links da pesquisa sem linha no diário ou cuja linha terminou em erro (sem repetição)."""
+        return list(dict.fromkeys(link for link in self._links if not self._concluido(link)))
+
+    def _concluido(self, link: str) -> bool:
+        return link in self._concluidos and self._concluidos[link][3] != SITUACAO_ERRO
+
+    def registrar(
+        self,
+        link: str,
+        nome: str,
+        cnpj: str,
+        extraido_em: Optional[str] = None,
+        situacao: Optional[str] = None,
+    ) -> bool:
+        """Anexa uma linha extraída ao diário; retorna False se o link já estava registrado.
+
+        Uma linha com erro só é substituída por outra que não seja erro.
+        """
+        extraido_em = extraido_em or datetime.datetime.now().isoformat(timespec="seconds")
+        situacao = situacao or situacao_dos_dados(nome, cnpj)
+        with self._lock:
+            if link in self._concluidos and (self._concluido(link) or situacao == SITUACAO_ERRO):
+                return False
+            self._concluidos[link] = (nome, cnpj, extraido_em, situacao)
+            self._gravar(
+                {
+                    "tipo": "linha",
+                    "link": link,
+                    "Nome": nome,
+                    "CNPJ": cnpj,
+                    "extraido_em": extraido_em,
+                    "situacao": situacao,
+                }
+            )
+            return True
+
+    def concluidos(self) -> Iterator[Tuple[str, str, str, str, str]]:
+        """(link, nome, cnpj, extraido_em, situacao) das linhas já gravadas no diário."""
+        with self._lock:
+            itens = list(self._concluidos.items())
+        for link, (nome, cnpj, extraido_em, situacao) in itens:
+            yield link, nome, cnpj, extraido_em, situacao
+
+    def linhas(self) -> List[Tuple[str, str]]:
+        """(nome, cnpj) de cada link, na ordem original da pesquisa."""
+        return [self._concluidos.get(link, ("", "", "", ""))[:2] for link in self._links]
+
+    def _termina_com_quebra(self) -> bool:
+        with open(self.caminho, "rb") as arquivo:
+            arquivo.seek(-1, os.SEEK_END)
+            return arquivo.read(1) == b"\n"
+
+    def _gravar(self, registro: dict) -> None:
+        self._arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+
+    def close(self) -> None:
+        """Fecha o arquivo do diário."""
+        if self._arquivo:
+            self._arquivo.close()
+            self._arquivo = None
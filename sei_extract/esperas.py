@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+SELETOR_LINKS = "a.protocoloNormal"
+
+# Instala (uma única vez por página) um MutationObserver na lista de resultados,
+# ou no body enquanto ela ainda não existe, e devolve o contador de mutações.
+_JS_CONTADOR_MUTACOES = """
+if (!window.__seiObservador) {
+    var primeiro = document.querySelector(arguments[0]);
+    var alvo = (primeiro && primeiro.closest('table, div')) || document.body;
+    window.__seiMutacoes = 0;
+    window.__seiObservador = new MutationObserver(function (m) { window.__seiMutacoes += m.length; });
+    window.__seiObservador.observe(alvo, {childList: true, subtree: true});
+}
+return window.__seiMutacoes;
+"""
+
+_JS_CONTAR_LINKS = "return document.querySelectorAll(arguments[0]).length;"
+
+
+class Esperas:
+    """Esperas por evento (readyState, MutationObserver, contagem de links) no lugar de time.sleep.
+
+    Cada espera informa quanto tempo o sleep fixo antigo gastaria; `relatorio` soma o
+    tempo realmente esperado e o economizado por condição.
+    """
+
+    def __init__(
+        self,
+        driver,
+        poll: float = 0.1,
+        logger: Optional[logging.Logger] = None,
+        aceitar_interativo: bool = False,
+    ):
+        self.driver = driver
+        self.poll = poll
+        # Com pageLoadStrategy=eager basta o DOM pronto ('interactive')
+        self.estados_prontos = ("interactive", "complete") if aceitar_interativo else ("complete",)
+        self.logger = logger or logging.getLogger(__name__)
+        self._estatisticas: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, condicao: str, esperado: float, sleep_antigo: float) -> None:
+        with self._lock:
+            stats = self._estatisticas.setdefault(condicao, {"chamadas": 0, "esperado": 0.0, "sleep_antigo": 0.0})
+            stats["chamadas"] += 1
+            stats["esperado"] += esperado
+            stats["sleep_antigo"] += sleep_antigo
+
+    def _aguardar(self, condicao: str, predicado, timeout: float, sleep_antigo: float) -> bool:
+        inicio = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll).until(predicado)
+            ok = True
+        except TimeoutException:
+            ok = False
+        self._registrar(condicao, time.perf_counter() - inicio, sleep_antigo)
+        return ok
+
+    def documento_pronto(self, timeout: float = 10, sleep_antigo: float = 0) -> bool:
+        """Aguarda document.readyState == 'complete' (ou 'interactive' no perfil lean)."""
+        return self._aguardar(
+            "documento_pronto",
+            lambda d: d.execute_script("return document.readyState") in self.estados_prontos,
+            timeout,
+            sleep_antigo,
+        )
+
+    def contar_links(self) -> int:
+        """Quantidade de a.protocoloNormal na página, em um único comando."""
+        return self.driver.execute_script(_JS_CONTAR_LINKS, SELETOR_LINKS)
+
+    def mais_links_que(self, quantidade: int, timeout: float = 5, sleep_antigo: float = 0) -> bool:
+        """Aguarda a contagem de a.protocoloNormal passar de `quantidade`."""
+        return self._aguardar(
+            "contagem_links",
+            lambda d: d.execute_script(_JS_CONTAR_LINKS, SELETOR_LINKS) > quantidade,
+            timeout,
+            sleep_antigo,
+        )
+
+    def marcar_mutacoes(self) -> int:
+        """Instala o observador (se necessário) e retorna o contador atual de mutações."""
+        return self.driver.execute_script(_JS_CONTADOR_MUTACOES, SELETOR_LINKS)
+
+    def nova_mutacao(self, referencia: int, timeout: float = 1, sleep_antigo: float = 0) -> bool:
+        """Aguarda a lista de resultados mudar desde o contador `referencia`."""
+        return self._aguardar(
+            "mutacao_resultados",
+            lambda d: d.execute_script(_JS_CONTADOR_MUTACOES, SELETOR_LINKS) > referencia,
+            timeout,
+            sleep_antigo,
+        )
+
+    def relatorio(self) -> Dict[str, Dict[str, float]]:
+        """Loga e retorna o tempo esperado e o economizado em relação aos sleeps fixos."""
+        total_esperado = 0.0
+        total_antigo = 0.0
+        with self._lock:
+            estatisticas = {k: dict(v) for k, v in self._estatisticas.items()}
+
+        for condicao, stats in estatisticas.items():
+            stats["economizado"] = stats["sleep_antigo"] - stats["esperado"]
+            total_esperado += stats["esperado"]
+            total_antigo += stats["sleep_antigo"]
+            self.logger.info(
+                f"Espera {condicao}: {int(stats['chamadas'])} chamadas, {stats['esperado']:.1f}s esperados "
+                f"(sleeps fixos: {stats['sleep_antigo']:.1f}s, economia: {stats['economizado']:.1f}s)"
+            )
+        self.logger.info(
+            f"Total em esperas: {total_esperado:.1f}s contra {total_antigo:.1f}s dos sleeps fixos "
+            f"(economia de {total_antigo - total_esperado:.1f}s)"
+        )
+        return estatisticas
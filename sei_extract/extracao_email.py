@@ -0,0 +1,891 @@
+import os
+import re
+import argparse
+import threading
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+# from PIL import Image
+# import requests
+# from io import BytesIO
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.edge.service import Service
+from selenium.webdriver.edge.options import Options
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+
+from .parser_detalhe import extrair_nome_cnpj
+from .lote_dom import ContadorComandos, extrair_resultados, extrair_tabelas
+from .pipeline_async import extrair_concorrente
+from .esperas import Esperas
+from .coleta_direta import SELETOR_TOTAL_CONFIAVEL, SELETORES_TOTAL, coletar_links_direto
+from .controle_requisicoes import (
+    SITUACAO_ERRO,
+    SITUACAO_OK,
+    ControleRequisicoes,
+    Disjuntor,
+    ErroTransitorio,
+)
+from .cache_processos import CacheProcessos, extrair_com_cache
+from .diario_execucao import DiarioExecucao
+from .saidas import EscritorOrdenado, criar_saida
+from .fatias_pesquisa import executar_fatias, planejar_fatias
+from .instrumentacao import Metricas, instrumentar
+from .opcoes import parse_args
+from .perfil_lean import MedidorPaginas, aplicar_bloqueios
+from .resultados_pesquisa import ResultadoPesquisa, agrupar_por_processo
+from .trabalhos import Consulta, carregar_trabalho
+
+# Constants for selectors and URLs
+URL_SEI_SP = os.getenv("URL_SEI_SP", "https://sei.sp.gov.br/sei/modulos/pesquisa/md_pesq_processo_pesquisar.php?acao_externa=protocolo_pesquisar&acao_origem_externa=protocolo_pesquisar&id_orgao_acesso_externo=0")
+DRIVER_PATH = os.getenv("DRIVER_PATH", "")#insira o caminho do seu msedgedriver.exe aqui
+
+CHECKBOXES_TO_MARK = [
+    "chkSinProcessos",
+    "chkSinDocumentosGerados",
+    "chkSinDocumentosRecebidos"
+]
+
+TIPO_PROCESSO = "Processo de apropriação e utilização de crédito acumulado ou de produtor rural"
+TIPO_DOCUMENTO = "Despacho"
+
+SELECTORS = {
+    "tipo_processo": "selTipoProcedimentoPesquisa",
+    "tipo_documento": "selSeriePesquisa",
+    "data_inicio": "txtDataInicio",
+    "data_fim": "txtDataFim",
+    "captcha_img": "imgCaptcha",
+    "captcha_input": "txtInfraCaptcha",
+    "botao_pesquisar": "sbmPesquisar"
+}
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+@dataclass
+class EdgeDriverManager:
+    """Gerenciador do WebDriver Edge."""
+
+    headless: bool = False
+    timeout: int = 10
+    driver_path: Optional[str] = None
+    lean: bool = False
+    driver: Optional[webdriver.Edge] = None
+    wait: Optional[WebDriverWait] = None
+    logger: logging.Logger = logging.getLogger(__name__)
+
+    def setup_driver(self) -> Optional[webdriver.Edge]:
+        """Configura e inicializa o WebDriver Edge."""
+        edge_options = Options()
+        if self.headless:
+            edge_options.add_argument("--headless")
+
+        edge_options.add_argument("--no-sandbox")
+        edge_options.add_argument("--disable-gpu")
+        edge_options.add_argument("--disable-dev-shm-usage")
+        edge_options.add_argument("--disable-extensions")
+        edge_options.add_argument("--disable-blink-features=AutomationControlled")
+
+        if self.lean:
+            # Devolve o controle no DOMContentLoaded, sem esperar imagens e folhas de estilo
+            edge_options.page_load_strategy = "eager"
+
+        try:
+            if self.driver_path and os.path.exists(self.driver_path):
+                service = Service(self.driver_path)
+                self.driver = webdriver.Edge(service=service, options=edge_options)
+                self.logger.info(f"EdgeDriver Inicializado com sucesso: {self.driver_path}")
+            else:
+                self.driver = webdriver.Edge(options=edge_options)
+                self.logger.info("EdgeDriver Inicializado usando driver do sistema")
+
+            if self.lean:
+                aplicar_bloqueios(self.driver)
+                self.logger.info("Perfil lean ativo: recursos não essenciais bloqueados")
+
+            self.wait = WebDriverWait(self.driver, self.timeout)
+            return self.driver
+
+        except Exception as e:
+            self.logger.error(f"Erro ao inicializar EdgeDriver: {e}")
+            return None
+
+    def close(self) -> None:
+        """Fecha o WebDriver."""
+        if self.driver:
+            self.driver.quit()
+            self.logger.info("WebDriver Fechado")
+
+
+class CaptchaResolver:
+    """Classe para resolver diferentes tipos de Captcha."""
+
+    # Pesquisas em paralelo (fatias de datas) compartilham o mesmo terminal
+    _lock_terminal = threading.Lock()
+
+    def __init__(self, driver: webdriver.Edge, solucionador=None):
+        self.driver = driver
+        self.solucionador = solucionador
+        self.logger = logging.getLogger(__name__)
+
+    def resolve(self, captcha_element, offline: bool = True) -> str:
+        """Tenta o solucionador offline, se houver, e recorre ao input manual quando ele não tem confiança."""
+        if self.solucionador and offline:
+            captcha_text = self.solucionador.resolver(captcha_element)
+            if captcha_text:
+                return captcha_text
+            self.logger.warning("CAPTCHA não resolvido offline; recorrendo ao input manual.")
+        return self.resolve_manual(captcha_element)
+
+    def resolve_manual(self, captcha_element) -> str:
+        """Resolve CAPTCHA com input manual do usuário."""
+        with self._lock_terminal:
+            print("\n" + "=".center(50, "="))
+            print("RESOLUÇÃO MANUAL DE CAPTCHA")
+            print("=" * 50)
+            print("Observe a imagem do Captcha no navegador e digite o texto:")
+
+            captcha_text = input("Digite o CAPTCHA: ").strip()
+        return captcha_text
+
+
+# Desmarca checkboxes, volta os selects à primeira opção e limpa os campos de texto do formulário
+_JS_LIMPAR_FORMULARIO = """
+var campo = document.getElementById(arguments[0]);
+if (!campo || !campo.form) return false;
+Array.from(campo.form.elements).forEach(function (el) {
+    if (el.type === 'checkbox' || el.type === 'radio') { el.checked = false; }
+    else if (el.tagName === 'SELECT') { el.selectedIndex = 0; }
+    else if (el.type === 'text' || el.tagName === 'TEXTAREA') { el.value = ''; }
+});
+return true;
+"""
+
+# Depois do envio: null enquanto o documento do formulário ainda é o mesmo; depois, se a
+# página trouxe resultados, informou que não há nenhum ou voltou sem resultados (CAPTCHA recusado)
+_JS_RESULTADO_PESQUISA = """
+if (document.__seiPesquisaEnviada || document.readyState === 'loading') return null;
+if (document.querySelector(arguments[0])) return 'resultados';
+return new RegExp(arguments[1], 'i').test(document.body ? document.body.innerText : '') ? 'vazia' : 'recusado';
+"""
+
+SELETOR_RESULTADOS = f"a.protocoloNormal, {SELETOR_TOTAL_CONFIAVEL}"
+# Mensagens do SEI para uma pesquisa sem resultados e para o CAPTCHA errado
+SEM_RESULTADOS = r"nenhum (registro|resultado|processo|documento)"
+CAPTCHA_RECUSADO = re.compile(r"c[óo]digo de confirma[çc][ãa]o|captcha", re.IGNORECASE)
+
+
+class FormHandler:
+    def __init__(self, driver: webdriver.Edge, wait: WebDriverWait, solucionador=None, tentativas_captcha: int = 3):
+        self.driver = driver
+        self.wait = wait
+        self.solucionador = solucionador
+        self.tentativas_captcha = max(1, tentativas_captcha)
+        self.logger = logging.getLogger(__name__)
+
+    def fill_dropdown(self, selector: str, value: str, by: By = By.ID, selection_type: str = "text") -> bool:
+        """Preenche um dropdown com base no tipo de seleção."""
+        try:
+            dropdown_element = self.wait.until(EC.presence_of_element_located((by, selector)))
+            dropdown = Select(dropdown_element)
+
+            if selection_type == "text":
+                dropdown.select_by_visible_text(value)
+            elif selection_type == "value":
+                dropdown.select_by_value(value)
+            elif selection_type == "index":
+                dropdown.select_by_index(int(value))
+
+            self.logger.info(f"Dropdown preenchido: {selector} = {value}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao preencher dropdown {selector}: {e}")
+            return False
+
+    def fill_input(self, selector: str, value: str, by: By = By.ID) -> bool:
+        """Preenche um campo de input."""
+        try:
+            input_element = self.wait.until(EC.presence_of_element_located((by, selector)))
+            input_element.clear()
+            input_element.send_keys(value)
+            self.logger.info(f"Input preenchido: {selector} = {value}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao preencher input {selector}: {e}")
+            return False
+
+    def marcar_checkboxes(self, checkboxes_ids: List[str]) -> bool:
+        """Marca os checkboxes especificados."""
+        try:
+            for checkbox_id in checkboxes_ids:
+                checkbox = self.wait.until(EC.presence_of_element_located((By.ID, checkbox_id)))
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", checkbox)
+                if not checkbox.is_selected():
+                    try:
+                        checkbox.click()
+                    except Exception:
+                        self.driver.execute_script("arguments[0].click();", checkbox)
+                    self.logger.info(f"Checkbox marcado: {checkbox_id}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao marcar checkboxes: {e}")
+            return False
+
+    def limpar_formulario(self, campo_referencia: str = SELECTORS["captcha_input"]) -> bool:
+        """Limpa o formulário da página atual; False se a página não tiver o formulário de pesquisa."""
+        try:
+            return bool(self.driver.execute_script(_JS_LIMPAR_FORMULARIO, campo_referencia))
+        except Exception as e:
+            self.logger.error(f"Erro ao limpar o formulário: {e}")
+            return False
+
+    def click_element(self, selector: str, by: By = By.ID) -> bool:
+        """Clica em um elemento especificado."""
+        try:
+            element = self.wait.until(EC.element_to_be_clickable((by, selector)))
+            element.click()
+            self.logger.info(f"Elemento clicado: {selector}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao clicar em {selector}: {e}")
+            return False
+
+    def _aguardar_pesquisa(self, timeout: float = 30) -> str:
+        """Espera a resposta do envio: 'resultados', 'vazia', 'recusado' (CAPTCHA) ou 'alerta'."""
+        def concluida(driver):
+            try:
+                alerta = driver.switch_to.alert
+            except NoAlertPresentException:
+                return driver.execute_script(_JS_RESULTADO_PESQUISA, SELETOR_RESULTADOS, SEM_RESULTADOS)
+            texto = alerta.text
+            alerta.accept()
+            self.logger.warning(f"Alerta após a pesquisa: {texto}")
+            return "recusado" if CAPTCHA_RECUSADO.search(texto) else "alerta"
+
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(concluida)
+        except Exception as e:
+            # Sem resposta reconhecível: segue como antes e deixa a coleta decidir
+            self.logger.warning(f"Resposta da pesquisa não reconhecida: {e}")
+            return "resultados"
+
+    def executar_fluxo_pesquisa(
+        self,
+        tipo_processo: str,
+        tipo_documento: str,
+        checkboxes_ids: List[str],
+        captcha_element_id: str,
+        captcha_input_id: str,
+        botao_pesquisar_id: str,
+        data_inicio: Optional[datetime.date] = None,
+        data_fim: Optional[datetime.date] = None,
+    ) -> bool:
+        """Executa o fluxo completo de pesquisa no site (padrão: últimos 5 dias).
+
+        Se o SEI recusar o CAPTCHA, preenche de novo com o CAPTCHA novo da página, até
+        `tentativas_captcha` vezes pelo solucionador offline e, por fim, pelo input manual.
+        """
+        data_fim = data_fim or datetime.date.today()
+        data_inicio = data_inicio or data_fim - datetime.timedelta(days=5)
+        offline = self.tentativas_captcha if self.solucionador else 0
+        try:
+            for tentativa in range(1, max(offline + 1, self.tentativas_captcha) + 1):
+                self.marcar_checkboxes(checkboxes_ids)
+                self.fill_dropdown(SELECTORS["tipo_processo"], tipo_processo)
+                self.fill_dropdown(SELECTORS["tipo_documento"], tipo_documento)
+                self.fill_input(SELECTORS["data_inicio"], data_inicio.strftime("%d/%m/%Y"))
+                self.fill_input(SELECTORS["data_fim"], data_fim.strftime("%d/%m/%Y"))
+
+                captcha_element = self.wait.until(EC.presence_of_element_located((By.ID, captcha_element_id)))
+                captcha_text = CaptchaResolver(self.driver, self.solucionador).resolve(
+                    captcha_element, offline=tentativa <= offline
+                )
+                self.fill_input(captcha_input_id, captcha_text)
+
+                # Marca o documento do formulário para reconhecer a página que vem depois do envio
+                self.driver.execute_script("document.__seiPesquisaEnviada = true;")
+                self.click_element(botao_pesquisar_id)
+
+                resposta = self._aguardar_pesquisa()
+                if resposta in ("resultados", "vazia"):
+                    return True
+                if resposta == "alerta":
+                    return False
+                self.logger.warning(f"CAPTCHA recusado pelo SEI (tentativa {tentativa}).")
+
+            self.logger.error("CAPTCHA recusado em todas as tentativas.")
+            return False
+        except Exception as e:
+            self.logger.error(f"Erro ao executar fluxo de pesquisa: {e}")
+            return False
+
+
+class ResultadoExtractor:
+    
+    def __init__(
+        self,
+        driver: webdriver.Edge,
+        wait: WebDriverWait,
+        logger: Optional[logging.Logger] = None,
+        esperas: Optional[Esperas] = None,
+        contador: Optional[ContadorComandos] = None,
+        lean: bool = False,
+        medidor: Optional[MedidorPaginas] = None,
+        coleta: str = "direta",
+        arquivo=None,
+    ):
+        self.driver = driver
+        self.wait = wait
+        self.logger = logger or logging.getLogger(__name__)
+        self.esperas = esperas or Esperas(driver, aceitar_interativo=lean)
+        self.contador = contador
+        self.lean = lean
+        self.medidor = medidor
+        self.coleta = coleta
+        self.arquivo = arquivo
+
+    def coletar_resultados(self) -> Tuple[List[ResultadoPesquisa], Optional[int]]:
+        """Retorna (resultados, total informado) pela paginação direta ou, se ela falhar, pelo scroll."""
+        if self.coleta == "direta":
+            self.esperas.documento_pronto(sleep_antigo=3)
+            try:
+                coletado = coletar_links_direto(self.driver, "a.protocoloNormal", logger=self.logger)
+            except Exception as e:
+                self.logger.warning(f"Erro na paginação direta: {e}")
+                coletado = None
+            if coletado is not None:
+                return coletado
+            self.logger.warning("Paginação direta indisponível; carregando os resultados por scroll.")
+
+        total = self.carregar_todos_os_resultados()
+        return self.extrair_links(), total
+
+    def carregar_todos_os_resultados(self) -> Optional[int]:
+        """Carrega todos os resultados fazendo scroll até o fim da página.
+
+        Retorna o total de resultados informado pela página, se encontrado em div.total-registros-infinite.
+        """
+        self.logger.info("Iniciando carregamento de todos os resultados.")
+
+        self.esperas.documento_pronto(sleep_antigo=3)
+
+        # Seletor(s) possíveis da div de total de resultados
+        possible_selectors = SELETORES_TOTAL
+
+        total_results = None
+        total_results_element = None
+        seletor_total = None
+
+        # Scroll até encontrar a div com o total de resultados
+        max_scrolls_to_find_total = 65
+        scroll_pause_time = 1
+
+
+        for attempt in range(max_scrolls_to_find_total):
+            # Faz scroll usando a tecla PAGE_DOWN e espera a lista mudar (no máximo scroll_pause_time)
+            mutacoes = self.esperas.marcar_mutacoes()
+            body = self.driver.find_element(By.TAG_NAME, "body")
+            ActionChains(self.driver).move_to_element(body).send_keys(Keys.PAGE_DOWN).perform()
+            self.esperas.nova_mutacao(mutacoes, timeout=scroll_pause_time, sleep_antigo=scroll_pause_time)
+            self.logger.info(f"Procurando total de resultados (tentativa {attempt + 1})...")
+
+            # Verifica cada seletor possível
+            for selector in possible_selectors:
+                try:
+                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    for element in elements:
+                        text = element.text.strip()
+                        if text and re.search(r'\d+', text):
+                            total_match = re.search(r'(\d+)', text)
+                            if total_match:
+                                total_results = int(total_match.group(1))
+                                total_results_element = element
+                                seletor_total = selector
+                                self.logger.info(f"Total de resultados encontrado: {total_results} (seletor: {selector})")
+                                break
+                    if total_results:
+                        break
+                except Exception as e:
+                    self.logger.debug(f"Erro ao tentar seletor {selector}: {e}")
+            
+            if total_results:
+                break
+
+        if not total_results:
+            self.logger.warning("Não foi possível determinar o total de resultados. Continuando com scroll até não haver mais conteúdo.")
+
+        # Só o total da div do SEI encerra o scroll; o de um seletor genérico pode ser outro número
+        limite_resultados = total_results if seletor_total == SELETOR_TOTAL_CONFIAVEL else None
+        if total_results and limite_resultados is None:
+            self.logger.warning(
+                f"Total {total_results} lido do seletor genérico '{seletor_total}'; rolando até não haver mais conteúdo."
+            )
+
+        # Agora continua com scroll até carregar todos os resultados
+        max_scroll_attempts = 50
+        no_new_content_limit = 3
+        no_new_content_count = 0
+        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        last_links_count = 0
+
+
+        for attempt in range(max_scroll_attempts):
+            # Faz scroll usando a tecla PAGE_DOWN e espera novos links (no máximo scroll_pause_time)
+            body = self.driver.find_element(By.TAG_NAME, "body")
+            ActionChains(self.driver).move_to_element(body).send_keys(Keys.PAGE_DOWN).perform()
+            self.esperas.mais_links_que(last_links_count, timeout=scroll_pause_time, sleep_antigo=scroll_pause_time)
+
+            # Verifica se encontrou os links após o scroll
+            current_links = self.driver.find_elements(By.CSS_SELECTOR, "a.protocoloNormal")
+            current_links_count = len(current_links)
+            self.logger.info(f"Tentativa {attempt + 1}: {current_links_count} links carregados")
+
+            # Se temos o total esperado e já carregamos todos os links
+            if limite_resultados and current_links_count >= limite_resultados:
+                self.logger.info("Todos os resultados foram carregados.")
+                break
+
+            new_height = self.driver.execute_script("return document.body.scrollHeight")
+
+            if new_height == last_height:
+                no_new_content_count += 1
+                if no_new_content_count >= no_new_content_limit:
+                    self.logger.warning("Fim da página alcançado sem carregar mais conteúdo.")
+                    break
+            else:
+                no_new_content_count = 0
+
+            last_height = new_height
+            last_links_count = current_links_count
+
+        return limite_resultados
+
+    
+    def extrair_links(self) -> List[ResultadoPesquisa]:
+        """Extrai protocolo, documento e href de todos os links clicáveis dos resultados."""
+        self.logger.info("Extraindo links dos resultados.")
+        try:
+            self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.protocoloNormal")))
+            links_filtrados = extrair_resultados(self.driver, "a.protocoloNormal")
+            self.logger.info(f"{len(links_filtrados)} links extraídos.")
+            return links_filtrados
+        except Exception as e:
+            self.logger.error(f"Erro ao extrair links: {e}")
+            return []
+
+    def ler_pagina_aberta(self, link: str) -> Tuple[str, str]:
+        """Extrai nome e CNPJ da aba atual, já carregada com `link` (usado também pelo PipelineAbas)."""
+        if self.medidor:
+            self.medidor.medir(self.driver, link)
+        if self.arquivo:
+            self.arquivo.guardar(link, self.driver.page_source)
+
+        # Textos das <td> e das tr.infraTrClara chegam em um único execute_script
+        tds, trs_infra = extrair_tabelas(self.driver)
+        nome, cnpj = extrair_nome_cnpj(tds, trs_infra)
+        if not nome and len(trs_infra) < 4:
+            self.logger.warning("Menos de 4 elementos tr.infraTrClara encontrados.")
+            #no futuro pensar em trazer apenas o CNPJ do cliente, e não o nome do cliente
+
+        return nome, cnpj
+
+    def extrair_dados_cliente(self, link: str) -> Tuple[str, str]:
+        """Abre o link em nova aba, extrai nome e CNPJ de uma <td>, e fecha a aba.
+
+        Timeouts e erros do WebDriver sobem como ErroTransitorio para o ControleRequisicoes.
+        """
+        self.logger.info(f"Abrindo link: {link}")
+        marca = self.contador.marcar() if self.contador else 0
+        try:
+            if self.lean:
+                # Os bloqueios do CDP valem por aba: aplica na aba vazia antes de navegar
+                self.driver.execute_script("window.open('about:blank');")
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+                aplicar_bloqueios(self.driver)
+                self.driver.get(link)
+            else:
+                self.driver.execute_script("window.open(arguments[0]);", link)
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+
+            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            self.esperas.documento_pronto(sleep_antigo=2)  # Aguarda carregamento completo
+            return self.ler_pagina_aberta(link)
+        except WebDriverException as e:
+            raise ErroTransitorio(f"{type(e).__name__}: {e.msg}") from e
+        finally:
+            try:
+                self._fechar_aba()
+            finally:
+                if self.contador:
+                    comandos = self.contador.registrar_pagina(marca)
+                    self.logger.debug(f"{comandos} comandos WebDriver para {link}")
+
+    def _fechar_aba(self) -> None:
+        """Fecha a aba do detalhe e volta à primeira; com o navegador morto, a falha é transitória."""
+        try:
+            self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[0])
+        except WebDriverException as e:
+            raise ErroTransitorio(f"Falha ao fechar a aba: {type(e).__name__}: {e.msg}") from e
+
+
+def extrair_detalhes(
+    args: argparse.Namespace,
+    driver: webdriver.Edge,
+    extrator: ResultadoExtractor,
+    links: List[str],
+    ao_concluir: Optional[Callable[[str, str, str, str], None]] = None,
+) -> List[Tuple[str, str]]:
+    """Extrai (nome, cnpj) de cada link no modo escolhido na linha de comando."""
+    controle = ControleRequisicoes(
+        max_tentativas=args.tentativas,
+        disjuntor=Disjuntor(limite_falhas=args.disjuntor_falhas, espera=args.disjuntor_espera),
+    )
+    try:
+        if args.modo_detalhe == "navegador" and args.navegadores > 1:
+            from .pool_navegadores import PoolNavegadores
+            pool = PoolNavegadores(
+                criar_manager=lambda: EdgeDriverManager(headless=True, driver_path=DRIVER_PATH, lean=args.perfil_lean),
+                criar_extrator=lambda driver, wait: ResultadoExtractor(
+                    driver, wait, lean=args.perfil_lean, arquivo=extrator.arquivo
+                ),
+                num_navegadores=args.navegadores,
+                reciclar_apos=args.reciclar_apos,
+                cookies=driver.get_cookies(),
+                ao_concluir=ao_concluir,
+                controle=controle,
+            )
+            return [(nome, cnpj) for _, nome, cnpj in pool.extrair(links)]
+        elif args.modo_detalhe == "navegador" and args.abas > 1:
+            from .abas_navegador import PipelineAbas
+            pipeline = PipelineAbas(
+                extrator,
+                abas=args.abas,
+                controle=controle,
+                taxa=args.taxa or None,
+                ao_concluir=ao_concluir,
+            )
+            return pipeline.extrair(links)
+        else:
+            if args.modo_detalhe == "http":
+                from .detalhe_http import HttpDetailFetcher
+                fetcher = HttpDetailFetcher.from_driver(driver, pool_size=args.concorrencia, arquivo=extrator.arquivo)
+                concorrencia = args.concorrencia
+            else:
+                # Um único WebDriver não aceita comandos em paralelo
+                fetcher = extrator
+                concorrencia = 1
+
+            return extrair_concorrente(
+                links,
+                fetcher.extrair_dados_cliente,
+                concorrencia=concorrencia,
+                taxa=args.taxa or None,
+                ao_concluir=ao_concluir,
+                controle=controle,
+                adaptativo=not args.concorrencia_fixa,
+                latencia_alvo=args.latencia_alvo,
+            )
+    finally:
+        controle.relatorio()
+
+
+def pesquisar_consultas(
+    driver: webdriver.Edge,
+    form: FormHandler,
+    extrator: ResultadoExtractor,
+    consultas: List[Consulta],
+) -> Tuple[List[ResultadoPesquisa], List[str]]:
+    """Executa as consultas em sequência no mesmo driver; retorna (resultados, consulta de cada resultado)."""
+    links: List[ResultadoPesquisa] = []
+    nomes: List[str] = []
+    for indice, consulta in enumerate(consultas):
+        # Da segunda consulta em diante, reaproveita o formulário da página de resultados
+        if indice and not form.limpar_formulario():
+            driver.get(URL_SEI_SP)
+            extrator.esperas.documento_pronto(sleep_antigo=3)
+
+        sucesso = form.executar_fluxo_pesquisa(
+            tipo_processo=consulta.tipo_processo,
+            tipo_documento=consulta.tipo_documento,
+            checkboxes_ids=consulta.checkboxes,
+            captcha_element_id=SELECTORS["captcha_img"],
+            captcha_input_id=SELECTORS["captcha_input"],
+            botao_pesquisar_id=SELECTORS["botao_pesquisar"],
+            data_inicio=consulta.data_inicio,
+            data_fim=consulta.data_fim,
+        )
+        if not sucesso:
+            logging.error(f"Erro ao executar a consulta {consulta.nome}; seguindo para a próxima.")
+            continue
+
+        links_consulta, total = extrator.coletar_resultados()
+        logging.info(f"Consulta {consulta.nome}: {len(links_consulta)} links (total informado: {total}).")
+        links.extend(links_consulta)
+        nomes.extend([consulta.nome] * len(links_consulta))
+    return links, nomes
+
+
+def pesquisar_em_novo_driver(
+    inicio: datetime.date,
+    fim: datetime.date,
+    solucionador=None,
+    coleta: str = "direta",
+    headless: bool = False,
+    lean: bool = False,
+) -> Tuple[List[ResultadoPesquisa], Optional[int]]:
+    """Roda a pesquisa de uma fatia de datas em um Edge próprio e retorna (resultados, total reportado).
+
+    `headless` e `lean` repetem --headless e --perfil-lean da execução principal.
+    """
+    manager = EdgeDriverManager(headless=headless, driver_path=DRIVER_PATH, lean=lean)
+    driver = manager.setup_driver()
+    if not driver:
+        raise RuntimeError("Falha ao inicializar o WebDriver da fatia.")
+
+    try:
+        wait = WebDriverWait(driver, 15)
+        esperas = Esperas(driver, aceitar_interativo=lean)
+        driver.get(URL_SEI_SP)
+        esperas.documento_pronto()
+
+        sucesso = FormHandler(driver, wait, solucionador).executar_fluxo_pesquisa(
+            tipo_processo=TIPO_PROCESSO,
+            tipo_documento=TIPO_DOCUMENTO,
+            checkboxes_ids=CHECKBOXES_TO_MARK,
+            captcha_element_id=SELECTORS["captcha_img"],
+            captcha_input_id=SELECTORS["captcha_input"],
+            botao_pesquisar_id=SELECTORS["botao_pesquisar"],
+            data_inicio=inicio,
+            data_fim=fim,
+        )
+        if not sucesso:
+            raise RuntimeError("Erro ao executar o fluxo de pesquisa.")
+
+        extrator = ResultadoExtractor(driver, wait, esperas=esperas, lean=lean, coleta=coleta)
+        return extrator.coletar_resultados()
+    finally:
+        manager.close()
+
+
+def instrumentar_etapas() -> Callable[[], None]:
+    """Cronometra as etapas do fluxo na Metricas ativa; retorna a função que remove a instrumentação."""
+    return instrumentar([
+        (EdgeDriverManager, "setup_driver"),
+        (CaptchaResolver, "resolve"),
+        (CaptchaResolver, "resolve_manual"),
+        (FormHandler, "fill_dropdown"),
+        (FormHandler, "fill_input"),
+        (FormHandler, "marcar_checkboxes"),
+        (FormHandler, "limpar_formulario"),
+        (FormHandler, "click_element"),
+        (FormHandler, "executar_fluxo_pesquisa"),
+        (ResultadoExtractor, "coletar_resultados"),
+        (ResultadoExtractor, "carregar_todos_os_resultados"),
+        (ResultadoExtractor, "extrair_links"),
+        (ResultadoExtractor, "extrair_dados_cliente"),
+    ])
+
+
+def carregar_consultas(args: argparse.Namespace) -> Optional[List[Consulta]]:
+    """Lê e valida o arquivo de trabalho (--trabalho), antes de abrir o navegador; None sem arquivo."""
+    if not args.trabalho or args.retomar:
+        return None
+    return carregar_trabalho(args.trabalho, TIPO_PROCESSO, TIPO_DOCUMENTO, CHECKBOXES_TO_MARK, args.de, args.ate)
+
+
+def executar(
+    args: argparse.Namespace,
+    driver: webdriver.Edge,
+    metricas: Metricas,
+    consultas: Optional[List[Consulta]] = None,
+) -> bool:
+    """Executa pesquisa, extração e gravação da saída em um driver já inicializado.
+
+    `consultas` são as do arquivo de trabalho já carregadas por carregar_consultas.
+    """
+    wait = WebDriverWait(driver, 15)
+    solucionador = None
+    if args.modelo_captcha:
+        from .captcha_offline import SolucionadorCaptcha
+        solucionador = SolucionadorCaptcha.de_arquivo(args.modelo_captcha)
+    form = FormHandler(driver, wait, solucionador)
+    arquivo = None
+    if args.arquivo_html:
+        from .arquivo_html import ArquivoHtml
+        arquivo = ArquivoHtml(args.arquivo_html)
+    esperas = Esperas(driver, aceitar_interativo=args.perfil_lean)
+    contador = ContadorComandos(driver)
+    medidor = MedidorPaginas("lean" if args.perfil_lean else "completo")
+    diario = DiarioExecucao(args.diario)
+
+    try:
+        driver.get(URL_SEI_SP)
+        esperas.documento_pronto(sleep_antigo=3)
+
+        extrator = ResultadoExtractor(
+            driver,
+            wait,
+            esperas=esperas,
+            contador=contador,
+            lean=args.perfil_lean,
+            medidor=medidor,
+            coleta=args.coleta,
+            arquivo=arquivo,
+        )
+
+        if args.retomar:
+            diario.retomar()
+        elif args.trabalho:
+            consultas = consultas or carregar_consultas(args)
+            resultados, nomes = pesquisar_consultas(driver, form, extrator, consultas)
+            diario.iniciar([r.href for r in resultados], nomes, [r.processo for r in resultados])
+        elif args.de:
+            fatias = planejar_fatias(args.de, args.ate or datetime.date.today(), args.fatia)
+            resultados, _ = executar_fatias(
+                fatias,
+                lambda inicio, fim: pesquisar_em_novo_driver(
+                    inicio, fim, solucionador, args.coleta, headless=args.headless, lean=args.perfil_lean
+                ),
+                paralelas=args.pesquisas_paralelas,
+            )
+            diario.iniciar([r.href for r in resultados], processos=[r.processo for r in resultados])
+        else:
+            sucesso = form.executar_fluxo_pesquisa(
+                tipo_processo=TIPO_PROCESSO,
+                tipo_documento=TIPO_DOCUMENTO,
+                checkboxes_ids=CHECKBOXES_TO_MARK,
+                captcha_element_id=SELECTORS["captcha_img"],
+                captcha_input_id=SELECTORS["captcha_input"],
+                botao_pesquisar_id=SELECTORS["botao_pesquisar"],
+            )
+
+            if not sucesso:
+                logging.error("Erro ao executar o fluxo de pesquisa. Encerrando o programa.")
+                return False
+
+            resultados, _ = extrator.coletar_resultados()
+            diario.iniciar([r.href for r in resultados], processos=[r.processo for r in resultados])
+
+        if args.somente_pesquisa:
+            logging.info(f"{len(diario.links())} links gravados em {args.diario}.")
+            return True
+
+        escritor = EscritorOrdenado(criar_saida(args.formato, args.saida), diario.links(), diario.consultas())
+        processo_do_link = dict(zip(diario.links(), diario.processos()))
+        ja_extraidos = {}
+        # Na retomada, as linhas já gravadas no diário entram primeiro na saída; as com erro são refeitas
+        for link, nome, cnpj, extraido_em, situacao in diario.concluidos():
+            if situacao != SITUACAO_ERRO:
+                escritor.receber(link, nome, cnpj, extraido_em, situacao)
+                ja_extraidos[processo_do_link.get(link, link)] = (nome, cnpj, situacao)
+        documentos = diario.pendentes()
+        # Um link por processo é extraído; o resultado vale para todos os documentos do processo
+        grupos = agrupar_por_processo(documentos, [processo_do_link[link] for link in documentos])
+
+        def registrar(link: str, nome: str, cnpj: str, situacao: str) -> None:
+            extraido_em = datetime.datetime.now().isoformat(timespec="seconds")
+            registrados = 0
+            for documento in grupos.get(link, [link]):
+                if diario.registrar(documento, nome, cnpj, extraido_em, situacao):
+                    escritor.receber(documento, nome, cnpj, extraido_em, situacao)
+                    registrados += 1
+            if registrados:
+                logging.info(f"Nome: {nome} | CNPJ: {cnpj} | Situação: {situacao} | Documentos: {registrados}")
+
+        # Processos com outro documento já concluído no diário não são buscados de novo
+        for link in grupos:
+            if processo_do_link[link] in ja_extraidos:
+                registrar(link, *ja_extraidos[processo_do_link[link]])
+        links = [link for link in grupos if processo_do_link[link] not in ja_extraidos]
+        buscas_economizadas = len(documentos) - len(links)
+        logging.info(
+            f"{len(documentos)} links pendentes de {len(grupos)} processos ({len(links)} a buscar): "
+            f"{buscas_economizadas} buscas economizadas."
+        )
+
+        extraidos = 0
+
+        def extrair_pendentes(pendentes: List[str]) -> List[Tuple[str, str]]:
+            nonlocal extraidos
+            extraidos = len(pendentes)
+            with metricas.cronometrar("extracao_detalhes"):
+                return extrair_detalhes(args, driver, extrator, pendentes, ao_concluir=registrar)
+
+        cache = CacheProcessos(args.cache_arquivo, ttl_horas=args.cache_ttl_horas)
+        try:
+            resultados = extrair_com_cache(
+                links,
+                extrair_pendentes,
+                cache,
+                forcar_atualizacao=args.forcar_atualizacao,
+                ao_concluir=registrar,
+                processos=[processo_do_link[link] for link in links],
+            )
+        finally:
+            cache.close()
+
+        # Links que nunca notificaram conclusão saem como erro, para a retomada tentar de novo
+        for link, (nome, cnpj) in zip(links, resultados):
+            registrar(link, nome, cnpj, SITUACAO_OK if nome or cnpj else SITUACAO_ERRO)
+        escritor.finalizar()
+
+        estatisticas_esperas = esperas.relatorio()
+        contador.relatorio()
+        medidor.relatorio()
+        if solucionador:
+            solucionador.relatorio()
+        if arquivo:
+            logging.info(f"Arquivo HTML: {arquivo.gravados} páginas novas, {arquivo.repetidos} com conteúdo já arquivado.")
+
+        resumo = metricas.resumo(
+            links=extraidos,
+            comandos_webdriver=contador.total,
+            segundos_espera=sum(stats["esperado"] for stats in estatisticas_esperas.values()),
+            buscas_economizadas=buscas_economizadas,
+        )
+        metricas.exportar(resumo, args.metricas_json, args.metricas_prom)
+        return True
+    finally:
+        diario.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    rodar(parse_args(argv))
+
+
+def rodar(args: argparse.Namespace) -> None:
+    """Abre o Edge, executa e encerra o driver e a instrumentação."""
+    try:
+        consultas = carregar_consultas(args)
+    except Exception as e:
+        logging.error(f"Arquivo de trabalho inválido: {e}")
+        return
+
+    metricas = Metricas()
+    remover_instrumentacao = instrumentar_etapas()
+    try:
+        with metricas.ativa():
+            manager = EdgeDriverManager(headless=args.headless, driver_path=DRIVER_PATH, lean=args.perfil_lean)
+            driver = manager.setup_driver()
+
+            if not driver:
+                logging.error("Falha ao inicializar o WebDriver. Encerrando o programa.")
+                return
+
+            try:
+                executar(args, driver, metricas, consultas)
+
+            except Exception as e:
+                logging.error(f"Erro inesperado durante a execução: {e}")
+
+            finally:
+                manager.close()
+    finally:
+        remover_instrumentacao()
@@ -0,0 +1,81 @@
+import contextvars
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from .resultados_pesquisa import ResultadoPesquisa
+
+
+@dataclass
+class ResultadoFatia:
+    """Resultados carregados por uma fatia de datas e o total informado pela página."""
+
+    inicio: datetime.date
+    fim: datetime.date
+    links: List[ResultadoPesquisa] = field(default_factory=list)
+    total_reportado: Optional[int] = None
+
+    @property
+    def divergente(self) -> bool:
+        """True quando a quantidade carregada difere do total informado pelo SEI."""
+        return self.total_reportado is not None and len(self.links) != self.total_reportado
+
+
+def planejar_fatias(
+    inicio: datetime.date,
+    fim: datetime.date,
+    granularidade: str = "semana",
+) -> List[Tuple[datetime.date, datetime.date]]:
+    """Divide [inicio, fim] em janelas contíguas de um dia ou uma semana."""
+    if fim < inicio:
+        raise ValueError(f"Data final {fim} anterior à inicial {inicio}.")
+
+    passo = {"dia": 1, "semana": 7}[granularidade]
+    fatias = []
+    atual = inicio
+    while atual <= fim:
+        fim_fatia = min(atual + datetime.timedelta(days=passo - 1), fim)
+        fatias.append((atual, fim_fatia))
+        atual = fim_fatia + datetime.timedelta(days=1)
+    return fatias
+
+
+def executar_fatias(
+    fatias: List[Tuple[datetime.date, datetime.date]],
+    pesquisar: Callable[[datetime.date, datetime.date], Tuple[List[ResultadoPesquisa], Optional[int]]],
+    paralelas: int = 2,
+    logger: Optional[logging.Logger] = None,
+) -> Tuple[List[ResultadoPesquisa], List[ResultadoFatia]]:
+    """Executa `pesquisar(inicio, fim)` para cada fatia em paralelo e junta os resultados sem hrefs repetidos.
+
+    `pesquisar` deve rodar a pesquisa em um driver próprio e devolver (resultados, total reportado).
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def executar(fatia: Tuple[datetime.date, datetime.date]) -> ResultadoFatia:
+        inicio, fim = fatia
+        try:
+            links, total = pesquisar(inicio, fim)
+        except Exception as e:
+            logger.error(f"Erro na fatia {inicio} a {fim}: {e}")
+            links, total = [], None
+        return ResultadoFatia(inicio, fim, links, total)
+
+    with ThreadPoolExecutor(max_workers=max(1, paralelas)) as executor:
+        # Cada fatia roda em uma cópia do contexto, com a Metricas ativa da execução
+        futuros = [executor.submit(contextvars.copy_context().run, executar, fatia) for fatia in fatias]
+        resultados = [futuro.result() for futuro in futuros]
+
+    # Um mesmo documento pode aparecer em fatias vizinhas; o href identifica o documento
+    links = list({link.href: link for resultado in resultados for link in resultado.links}.values())
+
+    for resultado in resultados:
+        if resultado.divergente:
+            logger.warning(
+                f"Fatia {resultado.inicio} a {resultado.fim}: {len(resultado.links)} links carregados, "
+                f"mas a página informa {resultado.total_reportado} resultados."
+            )
+    logger.info(f"{len(fatias)} fatias pesquisadas, {len(links)} links únicos.")
+    return links, resultados
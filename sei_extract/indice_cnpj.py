@@ -0,0 +1,350 @@
+"""Índice local de razão social -> CNPJ, construído a partir dos dados abertos da Receita Federal.
+
+Preenche o CNPJ das linhas em que a página só trouxe o nome (fallback tr.infraTrClara).
+A entrada são os arquivos Empresas*.zip (ou o CSV extraído deles: ';', latin-1, sem
+cabeçalho, CNPJ básico na 1ª coluna e razão social na 2ª). O índice é um arquivo binário
+ordenado pelo nome normalizado e lido via mmap, então a consulta não carrega o cadastro
+para a memória:
+
+    cabeçalho   b"SEICNPJ1", quantidade de nomes n, tamanho do bloco de nomes (uint64)
+    inícios     n + 1 uint64 little-endian: posição de cada nome no bloco de nomes
+    básicos     n uint32 little-endian: CNPJ básico (8 dígitos) de cada nome
+    nomes       nomes normalizados concatenados, em ordem crescente de bytes
+
+    sei-extract indice-cnpj construir indice_cnpj.idx Empresas0.zip ... Empresas9.zip
+    sei-extract indice-cnpj buscar indice_cnpj.idx "EMPRESA EXEMPLO LTDA"
+"""
+import argparse
+import csv
+import difflib
+import heapq
+import io
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+import unicodedata
+import zipfile
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAGICO = b"SEICNPJ1"
+_CABECALHO = struct.Struct("<8sQQ")
+
+# Inícios e básicos são gravados e lidos na ordem nativa (array.tofile / memoryview.cast)
+if sys.byteorder != "little":
+    raise ImportError("O índice de CNPJ supõe uma plataforma little-endian.")
+
+# Pontuação que some sem virar espaço ("S.A." -> "SA", "S/A" -> "SA")
+_PONTUACAO = re.compile(r"[./']")
+_SEPARADORES = re.compile(r"[^A-Z0-9]+")
+_NUMEROS = re.compile(r"\b\w*\d\w*\b")
+
+# Sufixos de natureza jurídica/porte ignorados na busca aproximada
+SUFIXOS = {"LTDA", "SA", "ME", "EPP", "EIRELI", "MEI", "SS", "CIA", "SLU"}
+
+
+def normalizar_nome(nome: str) -> str:
+    """Maiúsculas, sem acentos nem pontuação e com espaços simples."""
+    sem_acento = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+    texto = _PONTUACAO.sub("", sem_acento.upper().replace("&", " E "))
+    return _SEPARADORES.sub(" ", texto).strip()
+
+
+def sem_sufixo(nome_normalizado: str) -> str:
+    """Remove os sufixos jurídicos do fim do nome normalizado (LTDA, SA, ME, EPP...)."""
+    palavras = nome_normalizado.split()
+    while len(palavras) > 1 and palavras[-1] in SUFIXOS:
+        palavras.pop()
+    return " ".join(palavras)
+
+
+def cnpj_matriz(basico: int) -> str:
+    """CNPJ formatado do estabelecimento matriz (ordem 0001) a partir do CNPJ básico."""
+    digitos = [int(d) for d in f"{basico:08d}0001"]
+    for pesos in ((5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2), (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)):
+        resto = sum(d * p for d, p in zip(digitos, pesos)) % 11
+        digitos.append(0 if resto < 2 else 11 - resto)
+    d = "".join(map(str, digitos))
+    return f"{d[:2]}.{d[2:5]}.{d[5:8]}/{d[8:12]}-{d[12:]}"
+
+
+def _linhas_empresas(caminho: str) -> Iterator[List[str]]:
+    """Linhas CSV de um arquivo Empresas da Receita, compactado em .zip ou não."""
+    if caminho.lower().endswith(".zip"):
+        with zipfile.ZipFile(caminho) as pacote:
+            for membro in pacote.namelist():
+                with pacote.open(membro) as arquivo:
+                    yield from csv.reader(io.TextIOWrapper(arquivo, encoding="latin-1", newline=""), delimiter=";")
+    else:
+        with open(caminho, encoding="latin-1", newline="") as arquivo:
+            yield from csv.reader(arquivo, delimiter=";")
+
+
+def _gravar_lote(lote: List[str], pasta: str) -> str:
+    lote.sort()
+    with tempfile.NamedTemporaryFile("w", dir=pasta, suffix=".run", delete=False, encoding="ascii") as run:
+        run.writelines(lote)
+    return run.name
+
+
+def construir_indice(entradas: List[str], caminho: str, tamanho_lote: int = 2_000_000) -> int:
+    """Gera o índice a partir dos arquivos Empresas; retorna quantos nomes foram indexados.
+
+    Ordenação externa: lotes de `tamanho_lote` linhas são ordenados em arquivos temporários
+    e intercalados com heapq.merge, então a memória não cresce com o tamanho do cadastro.
+    """
+    inicio = time.perf_counter()
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    runs: List[str] = []
+    lidas = 0
+    try:
+        lote: List[str] = []
+        for entrada in entradas:
+            for linha in _linhas_empresas(entrada):
+                if len(linha) < 2 or not linha[0].isdigit():
+                    continue
+                nome = normalizar_nome(linha[1])
+                if nome:
+                    # Tab ordena antes de qualquer caractere do nome: "ABC" < "ABC D" também nas linhas
+                    lote.append(f"{nome}\t{int(linha[0]):08d}\n")
+                    lidas += 1
+                if len(lote) >= tamanho_lote:
+                    runs.append(_gravar_lote(lote, pasta))
+                    lote = []
+        if lote:
+            runs.append(_gravar_lote(lote, pasta))
+
+        quantidade = _intercalar(runs, caminho)
+    finally:
+        for run in runs:
+            os.remove(run)
+
+    logger.info(
+        f"Índice {caminho}: {quantidade} nomes de {lidas} linhas, {os.path.getsize(caminho) / 2**20:.1f} MB "
+        f"em {time.perf_counter() - inicio:.1f}s."
+    )
+    return quantidade
+
+
+def _intercalar(runs: List[str], caminho: str) -> int:
+    """Intercala os lotes ordenados e grava cabeçalho, inícios, básicos e nomes."""
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    arquivos = [open(run, encoding="ascii") for run in runs]
+    temporarios = {
+        parte: tempfile.NamedTemporaryFile("w+b", dir=pasta, suffix=f".{parte}", delete=False)
+        for parte in ("inicios", "basicos", "nomes")
+    }
+    try:
+        quantidade, posicao, anterior = 0, 0, None
+        inicios, basicos, nomes = array("Q"), array("I"), []
+
+        def descarregar() -> None:
+            inicios.tofile(temporarios["inicios"])
+            basicos.tofile(temporarios["basicos"])
+            temporarios["nomes"].write("".join(nomes).encode("ascii"))
+            del inicios[:], basicos[:], nomes[:]
+
+        for linha in heapq.merge(*arquivos):
+            if linha == anterior:
+                continue
+            anterior = linha
+            nome, basico = linha.rstrip("\n").split("\t")
+            inicios.append(posicao)
+            basicos.append(int(basico))
+            nomes.append(nome)
+            posicao += len(nome)
+            quantidade += 1
+            if len(nomes) >= 1 << 16:
+                descarregar()
+        inicios.append(posicao)
+        descarregar()
+
+        with open(f"{caminho}.tmp", "wb") as saida:
+            saida.write(_CABECALHO.pack(_MAGICO, quantidade, posicao))
+            for parte in ("inicios", "basicos", "nomes"):
+                temporarios[parte].seek(0)
+                while True:
+                    bloco = temporarios[parte].read(1 << 20)
+                    if not bloco:
+                        break
+                    saida.write(bloco)
+        os.replace(f"{caminho}.tmp", caminho)
+        return quantidade
+    finally:
+        for arquivo in arquivos:
+            arquivo.close()
+        for temporario in temporarios.values():
+            temporario.close()
+            os.remove(temporario.name)
+
+
+class IndiceCnpj:
+    """Consulta o índice via mmap: busca exata, por prefixo e aproximada."""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        self._mmap = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, self.quantidade, tamanho_nomes = _CABECALHO.unpack_from(self._mmap, 0)
+        if magico != _MAGICO:
+            self.close()
+            raise ValueError(f"{caminho} não é um índice de CNPJ (sei-extract indice-cnpj construir).")
+
+        visao = memoryview(self._mmap)
+        fim_inicios = _CABECALHO.size + 8 * (self.quantidade + 1)
+        fim_basicos = fim_inicios + 4 * self.quantidade
+        self._inicios = visao[_CABECALHO.size:fim_inicios].cast("Q")
+        self._basicos = visao[fim_inicios:fim_basicos].cast("I")
+        self._nomes = visao[fim_basicos:fim_basicos + tamanho_nomes]
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    def _nome(self, i: int) -> bytes:
+        return bytes(self._nomes[self._inicios[i]:self._inicios[i + 1]])
+
+    def _limite_inferior(self, chave: bytes) -> int:
+        """Primeira posição cujo nome é >= chave (busca binária sobre o mmap)."""
+        baixo, alto = 0, self.quantidade
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            if self._nome(meio) < chave:
+                baixo = meio + 1
+            else:
+                alto = meio
+        return baixo
+
+    def buscar(self, nome: str) -> List[str]:
+        """CNPJs (matriz) das empresas com exatamente este nome normalizado."""
+        chave = normalizar_nome(nome).encode("ascii")
+        i = self._limite_inferior(chave)
+        cnpjs = []
+        while i < self.quantidade and self._nome(i) == chave:
+            cnpjs.append(cnpj_matriz(self._basicos[i]))
+            i += 1
+        return cnpjs
+
+    def buscar_prefixo(self, prefixo: str, limite: int = 50) -> List[Tuple[str, str]]:
+        """(nome normalizado, CNPJ) dos até `limite` primeiros nomes que começam com o prefixo."""
+        chave = normalizar_nome(prefixo).encode("ascii")
+        i = self._limite_inferior(chave)
+        encontrados = []
+        while i < self.quantidade and len(encontrados) < limite:
+            nome = self._nome(i)
+            if not nome.startswith(chave):
+                break
+            encontrados.append((nome.decode("ascii"), cnpj_matriz(self._basicos[i])))
+            i += 1
+        return encontrados
+
+    def buscar_aproximado(
+        self,
+        nome: str,
+        limiar: float = 0.9,
+        raio: int = 100,
+    ) -> List[Tuple[str, str, float]]:
+        """(nome, CNPJ, semelhança) dos candidatos acima do `limiar`, do mais parecido ao menos.
+
+        Os candidatos são os `raio` vizinhos de cada lado da posição do nome sem sufixo
+        jurídico na ordem do índice, com a mesma primeira palavra e as mesmas palavras com dígitos (o
+        erro de digitação precisa estar depois da primeira palavra). A semelhança é a razão
+        do difflib entre os nomes sem sufixo.
+        """
+        nucleo = sem_sufixo(normalizar_nome(nome))
+        if not nucleo:
+            return []
+        primeira = nucleo.split()[0].encode("ascii")
+        numeros = _NUMEROS.findall(nucleo)
+        comparador = difflib.SequenceMatcher(b=nucleo, autojunk=False)
+
+        posicao = self._limite_inferior(nucleo.encode("ascii"))
+        pontuados = []
+        for i in range(max(0, posicao - raio), min(self.quantidade, posicao + raio)):
+            candidato = self._nome(i)
+            if candidato.split(b" ", 1)[0] != primeira:
+                continue
+            candidato_nucleo = sem_sufixo(candidato.decode("ascii"))
+            if _NUMEROS.findall(candidato_nucleo) != numeros:
+                continue
+            comparador.set_seq1(candidato_nucleo)
+            # quick_ratio é um limite superior barato de ratio
+            if comparador.quick_ratio() < limiar:
+                continue
+            semelhanca = comparador.ratio()
+            if semelhanca >= limiar:
+                pontuados.append((candidato.decode("ascii"), cnpj_matriz(self._basicos[i]), semelhanca))
+        return sorted(pontuados, key=lambda item: item[2], reverse=True)
+
+    def resolver(self, nome: str, limiar: float = 0.9, margem: float = 0.03) -> Tuple[str, str]:
+        """(CNPJ, origem) para preencher uma linha; origem "indice_exato", "indice_aproximado" ou "".
+
+        Nomes que levam a mais de um CNPJ ficam em branco: homônimos exatos ou, na busca
+        aproximada, outro CNPJ a menos de `margem` de semelhança do melhor candidato.
+        """
+        exatos = set(self.buscar(nome))
+        if len(exatos) == 1:
+            return exatos.pop(), "indice_exato"
+        if exatos:
+            return "", ""
+
+        aproximados = self.buscar_aproximado(nome, limiar)
+        if not aproximados:
+            return "", ""
+        _, cnpj, melhor = aproximados[0]
+        if any(outro != cnpj and semelhanca > melhor - margem for _, outro, semelhanca in aproximados[1:]):
+            return "", ""
+        return cnpj, "indice_aproximado"
+
+    def close(self) -> None:
+        # As memoryviews precisam ser liberadas antes de fechar o mmap
+        for atributo in ("_inicios", "_basicos", "_nomes"):
+            visao = self.__dict__.pop(atributo, None)
+            if visao is not None:
+                visao.release()
+        self._mmap.close()
+        self._arquivo.close()
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog=prog, description="Índice local de razão social -> CNPJ (dados abertos da Receita).")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    construir = subparsers.add_parser("construir", help="Gera o índice a partir dos arquivos Empresas da Receita")
+    construir.add_argument("indice", help="Arquivo de índice a gerar")
+    construir.add_argument("entradas", nargs="+", help="Empresas*.zip ou os CSVs extraídos deles")
+    construir.add_argument("--lote", type=int, default=2_000_000, help="Linhas ordenadas em memória por vez")
+
+    buscar = subparsers.add_parser("buscar", help="Consulta nomes no índice")
+    buscar.add_argument("indice", help="Arquivo de índice")
+    buscar.add_argument("nomes", nargs="+", help="Razões sociais a consultar")
+    buscar.add_argument("--prefixo", action="store_true", help="Lista os nomes que começam com o texto informado")
+    buscar.add_argument("--limiar", type=float, default=0.9, help="Semelhança mínima da busca aproximada (0 a 1)")
+    args = parser.parse_args(argv)
+
+    if args.comando == "construir":
+        construir_indice(args.entradas, args.indice, tamanho_lote=args.lote)
+        return
+
+    indice = IndiceCnpj(args.indice)
+    try:
+        for nome in args.nomes:
+            if args.prefixo:
+                for encontrado, cnpj in indice.buscar_prefixo(nome):
+                    print(f"{cnpj}\t{encontrado}")
+            else:
+                cnpj, origem = indice.resolver(nome, args.limiar)
+                print(f"{cnpj or '-'}\t{origem or 'nao_encontrado'}\t{nome}")
+    finally:
+        indice.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
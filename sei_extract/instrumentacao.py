@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+PREFIXO = "sei_extracao"
+
+# Metricas da execução em andamento no contexto atual; execuções simultâneas no mesmo
+# processo (sessões do daemon) medem cada uma na sua, com os métodos instrumentados uma vez só
+_METRICAS_ATIVAS: ContextVar[Optional["Metricas"]] = ContextVar("metricas_ativas", default=None)
+
+
+class Metricas:
+    """Cronômetros por etapa e exportação do resumo da execução (JSON e textfile do Prometheus)."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.inicio = time.perf_counter()
+        self.etapas: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa: str, segundos: float) -> None:
+        """Soma uma medição à etapa."""
+        with self._lock:
+            stats = self.etapas.setdefault(etapa, {"chamadas": 0, "segundos": 0.0, "max_segundos": 0.0})
+            stats["chamadas"] += 1
+            stats["segundos"] += segundos
+            stats["max_segundos"] = max(stats["max_segundos"], segundos)
+
+    @contextmanager
+    def cronometrar(self, etapa: str) -> Iterator[None]:
+        """Mede o bloco `with` como uma chamada da etapa."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio)
+
+    @contextmanager
+    def ativa(self) -> Iterator["Metricas"]:
+        """Torna esta a Metricas que recebe as medições dos métodos instrumentados no contexto atual."""
+        token = _METRICAS_ATIVAS.set(self)
+        try:
+            yield self
+        finally:
+            _METRICAS_ATIVAS.reset(token)
+
+    def resumo(
+        self,
+        links: int = 0,
+        comandos_webdriver: int = 0,
+        segundos_espera: float = 0.0,
+        buscas_economizadas: int = 0,
+    ) -> Dict[str, Any]:
+        """Resumo da execução: etapas, latência por link e fração do tempo gasta em esperas.
+
+        `buscas_economizadas` conta os links de documentos atendidos pela busca de outro documento do mesmo processo.
+        """
+        duracao = time.perf_counter() - self.inicio
+        with self._lock:
+            etapas = {nome: dict(stats) for nome, stats in self.etapas.items()}
+        extracao = etapas.get("extracao_detalhes", {}).get("segundos", 0.0)
+        return {
+            "timestamp": time.time(),
+            "duracao_segundos": duracao,
+            "links": links,
+            "buscas_economizadas": buscas_economizadas,
+            "latencia_por_link_segundos": extracao / links if links else 0.0,
+            "comandos_webdriver": comandos_webdriver,
+            "segundos_espera": segundos_espera,
+            "fracao_espera": segundos_espera / duracao if duracao else 0.0,
+            "etapas": etapas,
+        }
+
+    def exportar(self, resumo: Dict[str, Any], caminho_json: Optional[str], caminho_prom: Optional[str]) -> None:
+        """Grava o resumo em JSON e no formato textfile do node_exporter."""
+        if caminho_json:
+            _gravar_atomico(caminho_json, json.dumps(resumo, indent=2, ensure_ascii=False))
+        if caminho_prom:
+            _gravar_atomico(caminho_prom, formatar_prometheus(resumo))
+        self.logger.info(
+            f"Métricas: {resumo['links']} links, {resumo['latencia_por_link_segundos']:.2f}s por link, "
+            f"{resumo['fracao_espera']:.0%} do tempo em esperas, {resumo['comandos_webdriver']} comandos WebDriver"
+        )
+
+
+def instrumentar(alvos: List[Tuple[type, str]]) -> Callable[[], None]:
+    """Envolve cada método (classe, nome) com um cronômetro; retorna a função que desfaz a troca.
+
+    As medições vão para a Metricas ativa no contexto da chamada (Metricas.ativa); fora
+    de uma execução, o método roda sem medir. Threads criadas pela execução precisam
+    herdar o contexto (contextvars.copy_context) para que suas chamadas entrem na conta.
+    """
+    originais = []
+    for classe, nome in alvos:
+        original = getattr(classe, nome)
+
+        def cronometrado(*args, _original=original, _etapa=f"{classe.__name__}.{nome}", **kwargs):
+            metricas = _METRICAS_ATIVAS.get()
+            if metricas is None:
+                return _original(*args, **kwargs)
+            with metricas.cronometrar(_etapa):
+                return _original(*args, **kwargs)
+
+        setattr(classe, nome, cronometrado)
+        originais.append((classe, nome, original))
+
+    def restaurar() -> None:
+        for classe, nome, original in originais:
+            setattr(classe, nome, original)
+
+    return restaurar
+
+
+def formatar_prometheus(resumo: Dict[str, Any]) -> str:
+    """Converte o resumo para o formato de exposição de texto do Prometheus."""
+    linhas = []
+
+    def metrica(nome: str, tipo: str, ajuda: str, valores: List[Tuple[str, float]]) -> None:
+        linhas.append(f"# HELP {PREFIXO}_{nome} {ajuda}")
+        linhas.append(f"# TYPE {PREFIXO}_{nome} {tipo}")
+        for rotulos, valor in valores:
+            linhas.append(f"{PREFIXO}_{nome}{rotulos} {valor}")
+
+    metrica("ultima_execucao_timestamp_seconds", "gauge", "Fim da última execução.", [("", resumo["timestamp"])])
+    metrica("duracao_seconds", "gauge", "Duração total da execução.", [("", resumo["duracao_segundos"])])
+    metrica("links", "gauge", "Links processados na execução.", [("", resumo["links"])])
+    metrica(
+        "buscas_economizadas", "gauge", "Links de documentos atendidos pela busca de outro documento do mesmo processo.",
+        [("", resumo.get("buscas_economizadas", 0))],
+    )
+    metrica(
+        "latencia_por_link_seconds", "gauge", "Tempo médio de extração por link.",
+        [("", resumo["latencia_por_link_segundos"])],
+    )
+    metrica("comandos_webdriver", "gauge", "Comandos enviados ao WebDriver.", [("", resumo["comandos_webdriver"])])
+    metrica("espera_seconds", "gauge", "Tempo gasto em esperas.", [("", resumo["segundos_espera"])])
+    metrica("fracao_espera_ratio", "gauge", "Fração da execução gasta em esperas.", [("", resumo["fracao_espera"])])
+
+    etapas = sorted(resumo["etapas"].items())
+    metrica(
+        "etapa_seconds", "gauge", "Tempo total por etapa.",
+        [(f'{{etapa="{nome}"}}', stats["segundos"]) for nome, stats in etapas],
+    )
+    metrica(
+        "etapa_chamadas", "gauge", "Chamadas por etapa.",
+        [(f'{{etapa="{nome}"}}', stats["chamadas"]) for nome, stats in etapas],
+    )
+    metrica(
+        "etapa_max_seconds", "gauge", "Chamada mais lenta por etapa.",
+        [(f'{{etapa="{nome}"}}', stats["max_segundos"]) for nome, stats in etapas],
+    )
+    return "\n".join(linhas) + "\n"
+
+
+def _gravar_atomico(caminho: str, conteudo: str) -> None:
+    # O coletor textfile pode ler a qualquer momento; rename evita arquivo pela metade
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
@@ -0,0 +1,80 @@
+import json
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+from .resultados_pesquisa import ResultadoPesquisa
+
+# Um único execute_script devolve [href, texto] de cada link (href como o get_attribute("href") do Selenium)
+_JS_RESULTADOS = """
+return Array.from(document.querySelectorAll(arguments[0]))
+    .filter(function (a) { return a.getAttribute('href'); })
+    .map(function (a) { return [a.href, a.textContent]; });
+"""
+
+# Texto de todas as <td> e as células de cada tr.infraTrClara, serializados em um JSON só
+_JS_TABELAS = """
+function texto(el) { return (el.innerText || '').trim(); }
+return JSON.stringify({
+    tds: Array.from(document.getElementsByTagName('td')).map(texto),
+    trs_infra: Array.from(document.querySelectorAll('tr.infraTrClara')).map(function (tr) {
+        return Array.from(tr.getElementsByTagName('td')).map(texto);
+    })
+});
+"""
+
+
+def extrair_resultados(driver, seletor: str = "a.protocoloNormal") -> List[ResultadoPesquisa]:
+    """Retorna protocolo, documento e href de todos os links do seletor em uma única ida ao WebDriver."""
+    return [ResultadoPesquisa.de_ancora(href, texto) for href, texto in driver.execute_script(_JS_RESULTADOS, seletor) or []]
+
+
+def extrair_tabelas(driver) -> Tuple[List[str], List[List[str]]]:
+    """Retorna (textos das <td>, células de cada tr.infraTrClara) em uma única ida ao WebDriver."""
+    dados = json.loads(driver.execute_script(_JS_TABELAS))
+    return dados["tds"], dados["trs_infra"]
+
+
+class ContadorComandos:
+    """Conta os comandos enviados ao msedgedriver interceptando `driver.execute`.
+
+    WebElements chamam o `execute` do driver pai, então `.text`, `get_attribute` e
+    `find_elements` também entram na contagem.
+    """
+
+    def __init__(self, driver, logger: Optional[logging.Logger] = None):
+        self.driver = driver
+        self.total = 0
+        self.paginas = 0
+        self.comandos_paginas = 0
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # Em drivers reaproveitados (daemon), substitui o contador anterior em vez de empilhar
+        self._execute_original = getattr(driver, "_execute_sem_contador", driver.execute)
+        driver._execute_sem_contador = self._execute_original
+
+        def execute(*args, **kwargs):
+            with self._lock:
+                self.total += 1
+            return self._execute_original(*args, **kwargs)
+
+        driver.execute = execute
+
+    def marcar(self) -> int:
+        """Retorna o total atual, para medir os comandos de um trecho."""
+        return self.total
+
+    def registrar_pagina(self, marca: int) -> int:
+        """Contabiliza uma página iniciada em `marca` e retorna quantos comandos ela usou."""
+        comandos = self.total - marca
+        with self._lock:
+            self.paginas += 1
+            self.comandos_paginas += comandos
+        return comandos
+
+    def relatorio(self) -> None:
+        """Loga o total de comandos e a média por página de detalhe."""
+        media = self.comandos_paginas / self.paginas if self.paginas else 0
+        self.logger.info(
+            f"Comandos WebDriver: {self.total} no total, {media:.1f} por página de detalhe ({self.paginas} páginas)"
+        )
@@ -0,0 +1,227 @@
+"""Opções de linha de comando do extrator.
+
+Fica separado de extracao_email para que `--help` e os subcomandos sem navegador
+não importem o selenium.
+"""
+import argparse
+import datetime
+import os
+from typing import List, Optional
+
+from .saidas import SAIDAS
+
+
+def opcoes_navegador(parser: argparse.ArgumentParser) -> None:
+    """Opções comuns aos subcomandos que abrem o Edge."""
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Executa o navegador principal sem janela",
+    )
+    parser.add_argument(
+        "--perfil-lean",
+        action="store_true",
+        help="Bloqueia imagens, CSS, fontes e analytics via CDP e usa pageLoadStrategy=eager",
+    )
+    parser.add_argument(
+        "--metricas-json",
+        default="metricas_execucao.json",
+        help="Arquivo JSON com o resumo de tempos e contadores da execução",
+    )
+    parser.add_argument(
+        "--metricas-prom",
+        default=None,
+        help="Arquivo .prom para o coletor textfile do Prometheus (node_exporter)",
+    )
+
+
+def opcoes_pesquisa(parser: argparse.ArgumentParser) -> None:
+    """Formulário de pesquisa, CAPTCHA e coleta dos links de resultado."""
+    parser.add_argument(
+        "--trabalho",
+        default=None,
+        help="Arquivo TOML/YAML com várias consultas, executadas em sequência na mesma sessão (sem fatiar por data)",
+    )
+    parser.add_argument(
+        "--modelo-captcha",
+        default=os.getenv("CAPTCHA_MODELO"),
+        help="Modelo .npz do solucionador offline de CAPTCHA (sei-extract captcha treinar); sem ele, input manual",
+    )
+    parser.add_argument(
+        "--coleta",
+        choices=["direta", "scroll"],
+        default="direta",
+        help="direta: repete a requisição de paginação da página até o total informado; scroll: rola a lista com PAGE_DOWN",
+    )
+    parser.add_argument(
+        "--de",
+        "--from",
+        type=datetime.date.fromisoformat,
+        default=None,
+        help="Data inicial (AAAA-MM-DD); com --ate, divide o período em fatias pesquisadas em paralelo",
+    )
+    parser.add_argument(
+        "--ate",
+        "--to",
+        type=datetime.date.fromisoformat,
+        default=None,
+        help="Data final (AAAA-MM-DD), padrão: hoje",
+    )
+    parser.add_argument(
+        "--fatia",
+        choices=["dia", "semana"],
+        default="semana",
+        help="Tamanho de cada fatia do período pesquisado",
+    )
+    parser.add_argument(
+        "--pesquisas-paralelas",
+        type=int,
+        default=2,
+        help="Quantidade de fatias pesquisadas ao mesmo tempo, cada uma em seu navegador",
+    )
+
+
+def opcoes_detalhe(parser: argparse.ArgumentParser) -> None:
+    """Extração das páginas de detalhe e cache."""
+    parser.add_argument(
+        "--modo-detalhe",
+        choices=["navegador", "http"],
+        default="navegador",
+        help="navegador: abre cada processo em uma aba; http: baixa as páginas reaproveitando os cookies da sessão",
+    )
+    parser.add_argument(
+        "--concorrencia",
+        type=int,
+        default=8,
+        help="Máximo de páginas de detalhe em andamento ao mesmo tempo (modo http); teto do ajuste adaptativo",
+    )
+    parser.add_argument(
+        "--concorrencia-fixa",
+        action="store_true",
+        help="Mantém sempre --concorrencia páginas em andamento, sem o ajuste AIMD por latência e erros",
+    )
+    parser.add_argument(
+        "--latencia-alvo",
+        type=float,
+        default=None,
+        help="Latência (s) acima da qual a concorrência é reduzida (padrão: 3x a menor latência observada)",
+    )
+    parser.add_argument(
+        "--tentativas",
+        type=int,
+        default=4,
+        help="Tentativas por página em erros transitórios (timeout, 429, 5xx), com backoff exponencial e jitter",
+    )
+    parser.add_argument(
+        "--disjuntor-falhas",
+        type=int,
+        default=5,
+        help="Erros transitórios seguidos que abrem o disjuntor e pausam as requisições ao SEI",
+    )
+    parser.add_argument(
+        "--disjuntor-espera",
+        type=float,
+        default=30.0,
+        help="Pausa inicial (s) com o disjuntor aberto; dobra a cada teste malsucedido",
+    )
+    parser.add_argument(
+        "--taxa",
+        type=float,
+        default=4.0,
+        help="Máximo de requisições por segundo ao SEI (0 desativa o limite)",
+    )
+    parser.add_argument(
+        "--navegadores",
+        type=int,
+        default=1,
+        help="Quantidade de navegadores headless extraindo em paralelo (modo navegador)",
+    )
+    parser.add_argument(
+        "--abas",
+        type=int,
+        default=1,
+        help="Abas carregando páginas de detalhe ao mesmo tempo em um único navegador (modo navegador, sem --navegadores)",
+    )
+    parser.add_argument(
+        "--reciclar-apos",
+        type=int,
+        default=100,
+        help="Páginas processadas por navegador do pool antes de recriá-lo",
+    )
+    parser.add_argument(
+        "--cache-arquivo",
+        default="cache_processos.sqlite3",
+        help="Arquivo SQLite com os processos já extraídos",
+    )
+    parser.add_argument(
+        "--cache-ttl-horas",
+        type=float,
+        default=72,
+        help="Validade das entradas do cache, em horas",
+    )
+    parser.add_argument(
+        "--forcar-atualizacao",
+        action="store_true",
+        help="Ignora o cache e extrai novamente todos os links",
+    )
+
+
+def opcoes_arquivo_html(parser: argparse.ArgumentParser) -> None:
+    """Arquivo do HTML bruto das páginas de detalhe."""
+    parser.add_argument(
+        "--arquivo-html",
+        default=None,
+        help="Pasta onde o HTML de cada página de detalhe é arquivado (zstd, por conteúdo) para `sei-extract reparse`",
+    )
+
+
+def opcoes_diario(parser: argparse.ArgumentParser) -> None:
+    """Diário JSONL da execução."""
+    parser.add_argument(
+        "--diario",
+        default="execucao.jsonl",
+        help="Diário JSONL onde cada linha extraída é gravada assim que fica pronta",
+    )
+
+
+def opcoes_saida(parser: argparse.ArgumentParser) -> None:
+    """Formato e caminho do arquivo de saída."""
+    parser.add_argument(
+        "--formato",
+        choices=sorted(SAIDAS),
+        default="xlsx",
+        help="Formato do arquivo de saída, gravado à medida que as linhas ficam prontas",
+    )
+    parser.add_argument(
+        "--saida",
+        default=None,
+        help="Caminho do arquivo de saída (padrão: dados_extraidos.<formato>)",
+    )
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Parser com todas as opções, usado pelo daemon e pelo benchmark."""
+    parser = argparse.ArgumentParser(description="Extração de nome e CNPJ dos processos do SEI-SP.")
+    for adicionar in (opcoes_navegador, opcoes_pesquisa, opcoes_detalhe, opcoes_arquivo_html, opcoes_diario, opcoes_saida):
+        adicionar(parser)
+    parser.add_argument(
+        "--retomar",
+        "--resume",
+        action="store_true",
+        help="Retoma a execução do diário, sem refazer a pesquisa nem o CAPTCHA",
+    )
+    parser.set_defaults(somente_pesquisa=False)
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Lê as opções de linha de comando da execução."""
+    return criar_parser().parse_args(argv)
+
+
+def completar(args: argparse.Namespace) -> argparse.Namespace:
+    """Preenche com os valores padrão as opções que o subcomando não expõe."""
+    for nome, valor in vars(parse_args([])).items():
+        if not hasattr(args, nome):
+            setattr(args, nome, valor)
+    return args
@@ -0,0 +1,138 @@
+import re
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Tuple
+
+# Incrementar sempre que a regra de extração de nome/CNPJ mudar; invalida o cache de processos
+PARSER_VERSAO = 1
+
+# Mesmo padrão usado em ResultadoExtractor.extrair_dados_cliente: "NOME (00.000.000/0000-00)"
+CNPJ_NOME_PATTERN = re.compile(r"(.+?)\s*\((\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2})\)")
+# Pré-filtro linear: o `(.+?)` acima fica quadrático em textos longos sem CNPJ
+_CNPJ_ENTRE_PARENTESES = re.compile(r"\(\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}\)")
+
+# Tags que o navegador renderiza como quebra de linha no .text do Selenium
+_BLOCK_TAGS = {"br", "p", "div", "tr", "li", "table", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+
+def _normalizar_texto(texto: str) -> str:
+    """Aproxima o .text do Selenium: espaços colapsados dentro de cada linha."""
+    if "\n" not in texto:
+        return " ".join(texto.split())
+    linhas = (" ".join(linha.split()) for linha in texto.split("\n"))
+    return "\n".join(linha for linha in linhas if linha)
+
+
+class _TabelaParser(HTMLParser):
+    """Coleta o texto de todas as <td> e as células de cada tr.infraTrClara."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tds: List[str] = []
+        self.trs_infra: List[List[str]] = []
+        self._tds_abertas: List[Tuple[int, List[str]]] = []
+        self._trs_abertas: List[Optional[List[str]]] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            classes = (dict(attrs).get("class") or "").split()
+            self._trs_abertas.append([] if "infraTrClara" in classes else None)
+        elif tag == "td":
+            # Reserva a posição para manter a ordem do documento, como o find_elements
+            self.tds.append("")
+            self._tds_abertas.append((len(self.tds) - 1, []))
+        if tag in _BLOCK_TAGS:
+            self._anexar("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self._anexar("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "td" and self._tds_abertas:
+            indice, partes = self._tds_abertas.pop()
+            texto = _normalizar_texto("".join(partes))
+            self.tds[indice] = texto
+            if self._trs_abertas and self._trs_abertas[-1] is not None:
+                self._trs_abertas[-1].append(texto)
+        elif tag == "tr" and self._trs_abertas:
+            celulas = self._trs_abertas.pop()
+            if celulas is not None:
+                self.trs_infra.append(celulas)
+        if tag in _BLOCK_TAGS:
+            self._anexar("\n")
+
+    def handle_data(self, data):
+        self._anexar(data)
+
+    def _anexar(self, texto: str) -> None:
+        for _, partes in self._tds_abertas:
+            partes.append(texto)
+
+
+def parse_dados_cliente(html: str) -> Tuple[str, str]:
+    """Extrai nome e CNPJ do HTML bruto de uma página md_pesq_processo_exibir."""
+    parser = _TabelaParser()
+    parser.feed(html)
+    parser.close()
+    return extrair_nome_cnpj(parser.tds, parser.trs_infra)
+
+
+def _texto_lxml(elemento) -> str:
+    """Texto do elemento com as mesmas quebras de linha do _TabelaParser."""
+    if not len(elemento):
+        return _normalizar_texto(elemento.text or "")
+    partes: List[str] = []
+
+    def visitar(el) -> None:
+        # Comentários e instruções de processamento têm tag não-string; só o tail conta
+        if isinstance(el.tag, str):
+            bloco = el.tag in _BLOCK_TAGS
+            if bloco:
+                partes.append("\n")
+            if el.text:
+                partes.append(el.text)
+            for filho in el:
+                visitar(filho)
+                if filho.tail:
+                    partes.append(filho.tail)
+            if bloco:
+                partes.append("\n")
+
+    visitar(elemento)
+    return _normalizar_texto("".join(partes))
+
+
+def parse_dados_cliente_lxml(html: str) -> Tuple[str, str]:
+    """Mesmo resultado de parse_dados_cliente, com o parser em C do lxml (bem mais rápido)."""
+    from lxml import etree, html as lxml_html
+
+    # Documento vazio (ou só com comentários) sai sem nome nem CNPJ, como no html.parser
+    if not html.strip():
+        return "", ""
+    try:
+        documento = lxml_html.document_fromstring(html)
+    except etree.ParserError:
+        return "", ""
+    # As <td> são lidas só até a primeira que casar com a regex; as tr.infraTrClara, só no fallback
+    nome, cnpj = extrair_nome_cnpj((_texto_lxml(td) for td in documento.iter("td")), [])
+    if nome:
+        return nome, cnpj
+    trs_infra = [
+        [_texto_lxml(td) for td in tr.iter("td") if next(td.iterancestors("tr"), None) is tr]
+        for tr in documento.xpath('//tr[contains(concat(" ", normalize-space(@class), " "), " infraTrClara ")]')
+    ]
+    return extrair_nome_cnpj([], trs_infra)
+
+
+def extrair_nome_cnpj(tds: Iterable[str], trs_infra: List[List[str]]) -> Tuple[str, str]:
+    """Aplica a regex de nome/CNPJ nas <td> e, se falhar, o fallback da 4ª tr.infraTrClara."""
+    for texto in tds:
+        if not _CNPJ_ENTRE_PARENTESES.search(texto):
+            continue
+        match = CNPJ_NOME_PATTERN.search(texto)
+        if match:
+            return match.group(1).strip(), match.group(2).strip()
+
+    if len(trs_infra) >= 4 and len(trs_infra[3]) > 1:
+        return trs_infra[3][1].strip(), ""
+    return "", ""
@@ -0,0 +1,79 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+
+# Recursos que não interessam à extração. A imagem do CAPTCHA do SEI é gerada por
+# um .php (infra_gerar_captcha), então nenhum destes padrões a bloqueia.
+PADROES_BLOQUEADOS = [
+    "*.css",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*hotjar*",
+]
+
+# Bytes transferidos e tempo de carga da página atual, pela Performance API do navegador
+_JS_MEDIR_PAGINA = """
+var nav = performance.getEntriesByType('navigation')[0];
+var recursos = performance.getEntriesByType('resource');
+var bytes = (nav ? nav.transferSize : 0);
+for (var i = 0; i < recursos.length; i++) { bytes += recursos[i].transferSize || 0; }
+return {
+    bytes: bytes,
+    recursos: recursos.length,
+    carga_ms: nav ? (nav.domContentLoadedEventEnd - nav.startTime) : 0
+};
+"""
+
+
+def aplicar_bloqueios(driver, padroes: Optional[List[str]] = None) -> None:
+    """Bloqueia, via CDP, os recursos não essenciais na aba atual."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes or PADROES_BLOQUEADOS})
+
+
+class MedidorPaginas:
+    """Acumula bytes baixados e tempo de carga por página de detalhe."""
+
+    def __init__(self, perfil: str, logger: Optional[logging.Logger] = None):
+        self.perfil = perfil
+        self.logger = logger or logging.getLogger(__name__)
+        self.paginas: List[Dict[str, float]] = []
+        self._lock = threading.Lock()
+
+    def medir(self, driver, link: str) -> None:
+        """Lê as medidas da página atual do driver."""
+        try:
+            medidas = driver.execute_script(_JS_MEDIR_PAGINA)
+        except Exception as e:
+            self.logger.debug(f"Não foi possível medir {link}: {e}")
+            return
+        self.logger.debug(f"{link}: {medidas['bytes']} bytes, {medidas['carga_ms']:.0f} ms")
+        with self._lock:
+            self.paginas.append(medidas)
+
+    def relatorio(self) -> Dict[str, float]:
+        """Loga e retorna as médias por página do perfil usado."""
+        with self._lock:
+            paginas = list(self.paginas)
+        if not paginas:
+            return {}
+        resumo = {
+            "perfil": self.perfil,
+            "paginas": len(paginas),
+            "bytes_medio": sum(p["bytes"] for p in paginas) / len(paginas),
+            "carga_ms_media": sum(p["carga_ms"] for p in paginas) / len(paginas),
+        }
+        self.logger.info(
+            f"Perfil {self.perfil}: {resumo['paginas']} páginas, {resumo['bytes_medio'] / 1024:.1f} KB "
+            f"e {resumo['carga_ms_media']:.0f} ms por página em média"
+        )
+        return resumo
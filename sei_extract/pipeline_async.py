@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from .controle_requisicoes import (
+    SITUACAO_ERRO,
+    CircuitoAberto,
+    ControleRequisicoes,
+    falha_transitoria,
+    situacao_do_erro,
+    situacao_dos_dados,
+)
+
+
+class TokenBucket:
+    """Limitador de taxa (token bucket) para não sobrecarregar o sei.sp.gov.br."""
+
+    def __init__(self, taxa: float, capacidade: Optional[int] = None):
+        self.taxa = taxa
+        self.capacidade = capacidade or max(1, int(taxa))
+        self.tokens = float(self.capacidade)
+        self.ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def adquirir(self) -> None:
+        """Aguarda até haver um token disponível e o consome."""
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self.tokens = min(self.capacidade, self.tokens + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.taxa)
+
+
+
+
+class LimiteAdaptativo:
+    """Limite de requisições em andamento ajustado por AIMD.
+
+    Cada sucesso dentro da latência alvo soma 1/limite (cerca de +1 por rodada completa);
+    um erro transitório ou uma resposta acima de `latencia_alvo` multiplica o limite por
+    `fator_reducao`, no máximo uma vez por latência média, para que uma rajada de falhas
+    simultâneas conte como um só sinal. Sem `latencia_alvo`, usa 3x a menor latência vista.
+    """
+
+    def __init__(
+        self,
+        maximo: int,
+        inicial: Optional[int] = None,
+        minimo: int = 1,
+        latencia_alvo: Optional[float] = None,
+        fator_reducao: float = 0.5,
+        adaptativo: bool = True,
+    ):
+        self.maximo = max(1, maximo)
+        self.minimo = max(1, min(minimo, self.maximo))
+        self.limite = float(inicial or (self.maximo if not adaptativo else max(self.minimo, (self.maximo + 1) // 2)))
+        self.latencia_alvo = latencia_alvo
+        self.fator_reducao = fator_reducao
+        self.adaptativo = adaptativo
+        self.latencia_minima: Optional[float] = None
+        self.latencia_media: Optional[float] = None
+        self.em_andamento = 0
+        self.reducoes = 0
+        self._ultima_reducao = 0.0
+        self._condicao = asyncio.Condition()
+
+    async def adquirir(self) -> None:
+        """Aguarda até haver vaga dentro do limite atual."""
+        async with self._condicao:
+            await self._condicao.wait_for(lambda: self.em_andamento < int(self.limite))
+            self.em_andamento += 1
+
+    async def liberar(self, latencia: Optional[float], sobrecarga: bool) -> None:
+        """Devolve a vaga e ajusta o limite pela latência (sucesso) ou pela sobrecarga (erro transitório)."""
+        async with self._condicao:
+            self.em_andamento -= 1
+            self._ajustar(latencia, sobrecarga)
+            # Acorda só quem cabe no limite; notify_all custaria O(links) a cada liberação
+            self._condicao.notify(max(0, int(self.limite) - self.em_andamento))
+
+    def _ajustar(self, latencia: Optional[float], sobrecarga: bool) -> None:
+        if latencia is not None and not sobrecarga:
+            self.latencia_minima = latencia if self.latencia_minima is None else min(self.latencia_minima, latencia)
+            self.latencia_media = latencia if self.latencia_media is None else 0.8 * self.latencia_media + 0.2 * latencia
+            sobrecarga = latencia > (self.latencia_alvo or 3 * self.latencia_minima)
+        if not self.adaptativo:
+            return
+
+        if sobrecarga:
+            agora = time.monotonic()
+            if agora - self._ultima_reducao >= (self.latencia_media or 1.0):
+                self.limite = max(self.minimo, self.limite * self.fator_reducao)
+                self._ultima_reducao = agora
+                self.reducoes += 1
+        elif latencia is not None:
+            self.limite = min(self.maximo, self.limite + 1 / self.limite)
+
+
+async def _aguardar_liberacao(controle: ControleRequisicoes) -> None:
+    while True:
+        espera = controle.espera_liberacao()
+        if not espera:
+            return
+        await asyncio.sleep(espera)
+
+
+async def _extrair_todos(
+    links: List[str],
+    extrair: Callable[[str], Tuple[str, str]],
+    limite: LimiteAdaptativo,
+    bucket: Optional[TokenBucket],
+    controle: ControleRequisicoes,
+    ao_concluir: Optional[Callable[[str, str, str, str], None]],
+) -> List[Tuple[str, str, str]]:
+
+    async def tentar(link: str, tentativa: int) -> Tuple[Optional[Tuple[str, str, str]], float]:
+        """Uma tentativa; retorna ((nome, cnpj, situação), 0) ou (None, espera) para repetir."""
+        await limite.adquirir()
+        latencia, sobrecarga = None, False
+        try:
+            await _aguardar_liberacao(controle)
+            if bucket:
+                await bucket.adquirir()
+            inicio = time.perf_counter()
+            nome, cnpj = await asyncio.to_thread(extrair, link)
+            latencia = time.perf_counter() - inicio
+            controle.registrar_sucesso()
+            return (nome, cnpj, situacao_dos_dados(nome, cnpj)), 0.0
+        except CircuitoAberto:
+            return ("", "", SITUACAO_ERRO), 0.0
+        except Exception as erro:
+            sobrecarga = falha_transitoria(erro)
+            espera = controle.registrar_falha(link, erro, tentativa)
+            if espera is None:
+                return ("", "", situacao_do_erro(erro)), 0.0
+            return None, espera
+        finally:
+            await limite.liberar(latencia, sobrecarga)
+
+    async def extrair_um(link: str) -> Tuple[str, str, str]:
+        tentativa = 1
+        while True:
+            resultado, espera = await tentar(link, tentativa)
+            if resultado:
+                break
+            # Espera fora da vaga, para não segurar o limite durante o backoff
+            await asyncio.sleep(espera)
+            tentativa += 1
+
+        controle.contar(resultado[2])
+        if ao_concluir:
+            await asyncio.to_thread(ao_concluir, link, *resultado)
+        return resultado
+
+    # gather devolve os resultados na mesma ordem dos links
+    return await asyncio.gather(*(extrair_um(link) for link in links))
+
+
+def extrair_concorrente(
+    links: List[str],
+    extrair: Callable[[str], Tuple[str, str]],
+    concorrencia: int = 8,
+    taxa: Optional[float] = None,
+    logger: Optional[logging.Logger] = None,
+    ao_concluir: Optional[Callable[[str, str, str, str], None]] = None,
+    controle: Optional[ControleRequisicoes] = None,
+    adaptativo: bool = True,
+    latencia_alvo: Optional[float] = None,
+) -> List[Tuple[str, str]]:
+    """Executa `extrair` sobre os links com no máximo `concorrencia` requisições em andamento.
+
+    Com `adaptativo`, o limite começa na metade de `concorrencia` e varia por AIMD entre 1 e
+    `concorrencia`. `taxa` limita as requisições por segundo; None desativa o limite. Erros
+    transitórios são repetidos conforme o `controle`. Os resultados mantêm a ordem original
+    da lista de links. `ao_concluir(link, nome, cnpj, situacao)` é chamado assim que cada
+    link termina.
+    """
+    logger = logger or logging.getLogger(__name__)
+    controle = controle or ControleRequisicoes(logger=logger)
+    if not links:
+        return []
+
+    async def executar() -> Tuple[List[Tuple[str, str, str]], LimiteAdaptativo]:
+        # to_thread usa o executor padrão (cpu + 4 threads), que limitaria a concorrência
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max(1, concorrencia)))
+        # Primitivas do asyncio são criadas dentro do loop de asyncio.run
+        bucket = TokenBucket(taxa) if taxa else None
+        limite = LimiteAdaptativo(concorrencia, latencia_alvo=latencia_alvo, adaptativo=adaptativo)
+        return await _extrair_todos(links, extrair, limite, bucket, controle, ao_concluir), limite
+
+    inicio = time.perf_counter()
+    resultados, limite = asyncio.run(executar())
+    duracao = time.perf_counter() - inicio
+
+    logger.info(
+        f"{len(links)} links processados em {duracao:.1f}s "
+        f"({len(links) / duracao if duracao else 0:.2f} links/s, concorrência final {limite.limite:.1f} "
+        f"de {limite.maximo}, {limite.reducoes} reduções)"
+    )
+    return [(nome, cnpj) for nome, cnpj, _ in resultados]
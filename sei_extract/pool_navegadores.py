@@ -0,0 +1,173 @@
+import contextvars
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .controle_requisicoes import (
+    SITUACAO_ERRO,
+    CircuitoAberto,
+    ControleRequisicoes,
+    ErroTransitorio,
+    NaoEncontrado,
+    situacao_do_erro,
+    situacao_dos_dados,
+)
+
+
+class PoolNavegadores:
+    """Pool de N navegadores headless que consomem links de uma fila compartilhada.
+
+    Cada worker cria seu driver pelo `criar_manager` (um EdgeDriverManager), recicla o
+    driver após `reciclar_apos` páginas e recria o driver que falhar, devolvendo o link
+    à fila após o backoff do `controle` enquanto houver tentativas. `ao_concluir(link,
+    nome, cnpj, situacao)` é chamado pelo worker assim que cada link termina.
+    """
+
+    def __init__(
+        self,
+        criar_manager: Callable[[], Any],
+        criar_extrator: Callable[[Any, Any], Any],
+        num_navegadores: int = 4,
+        reciclar_apos: int = 100,
+        cookies: Optional[List[Dict[str, Any]]] = None,
+        logger: Optional[logging.Logger] = None,
+        ao_concluir: Optional[Callable[[str, str, str, str], None]] = None,
+        controle: Optional[ControleRequisicoes] = None,
+    ):
+        self.criar_manager = criar_manager
+        self.criar_extrator = criar_extrator
+        self.num_navegadores = max(1, num_navegadores)
+        self.reciclar_apos = reciclar_apos
+        self.cookies = cookies or []
+        self.logger = logger or logging.getLogger(__name__)
+        self.ao_concluir = ao_concluir
+        self.controle = controle or ControleRequisicoes(max_tentativas=3, logger=self.logger)
+
+    def _novo_driver(self) -> Tuple[Any, Any]:
+        manager = self.criar_manager()
+        driver = manager.setup_driver()
+        if not driver:
+            raise ErroTransitorio("Falha ao inicializar o WebDriver do worker.")
+        return manager, self.criar_extrator(driver, manager.wait)
+
+    def _copiar_cookies(self, driver, link: str) -> None:
+        """Copia os cookies da sessão principal; o domínio precisa estar aberto antes."""
+        if not self.cookies:
+            return
+        driver.get(link)
+        for cookie in self.cookies:
+            driver.add_cookie({k: v for k, v in cookie.items() if k in ("name", "value", "path", "domain", "secure")})
+
+    @staticmethod
+    def _driver_vivo(manager) -> bool:
+        try:
+            return bool(manager.driver.window_handles)
+        except Exception:
+            return False
+
+    def _aguardar_liberacao(self) -> None:
+        while True:
+            espera = self.controle.espera_liberacao()
+            if not espera:
+                return
+            time.sleep(espera)
+
+    def _concluir(self, resultados: List, posicao: int, link: str, nome: str, cnpj: str, situacao: str) -> None:
+        resultados[posicao] = (link, nome, cnpj)
+        self.controle.contar(situacao)
+        if self.ao_concluir:
+            self.ao_concluir(link, nome, cnpj, situacao)
+
+    @staticmethod
+    def _encerrar(manager) -> None:
+        if manager is None:
+            return
+        try:
+            manager.close()
+        except Exception:
+            pass
+
+    def _worker(self, fila: queue.Queue, resultados: List, tentativas: List[int], id_worker: int) -> None:
+        manager, extrator = None, None
+        paginas = 0
+
+        while True:
+            item = fila.get()
+            if item is None:
+                fila.task_done()
+                break
+
+            posicao, link = item
+            try:
+                self._aguardar_liberacao()
+                if extrator is None or paginas >= self.reciclar_apos:
+                    if extrator is not None:
+                        self.logger.info(f"Worker {id_worker}: reciclando driver após {paginas} páginas.")
+                    self._encerrar(manager)
+                    manager, extrator = None, None
+                    manager, extrator = self._novo_driver()
+                    self._copiar_cookies(manager.driver, link)
+                    paginas = 0
+
+                nome, cnpj = extrator.extrair_dados_cliente(link)
+                # Página vazia com o driver morto é falha do navegador, não do processo
+                if not (nome or cnpj) and not self._driver_vivo(manager):
+                    raise ErroTransitorio("WebDriver deixou de responder")
+
+                self.controle.registrar_sucesso()
+                paginas += 1
+                self._concluir(resultados, posicao, link, nome, cnpj, situacao_dos_dados(nome, cnpj))
+            except CircuitoAberto:
+                self._concluir(resultados, posicao, link, "", "", SITUACAO_ERRO)
+            except Exception as e:
+                tentativas[posicao] += 1
+                espera = self.controle.registrar_falha(link, e, tentativas[posicao])
+                if not isinstance(e, NaoEncontrado):
+                    self.logger.warning(f"Worker {id_worker}: recriando o driver após falha em {link}.")
+                    self._encerrar(manager)
+                    manager, extrator = None, None
+                if espera is None:
+                    self._concluir(resultados, posicao, link, "", "", situacao_do_erro(e))
+                else:
+                    time.sleep(espera)
+                    fila.put(item)
+            finally:
+                fila.task_done()
+
+        self._encerrar(manager)
+
+    def extrair(self, links: List[str]) -> List[Tuple[str, str, str]]:
+        """Processa os links e retorna tuplas (link, nome, cnpj) na ordem original."""
+        if not links:
+            return []
+
+        fila: queue.Queue = queue.Queue()
+        resultados: List[Optional[Tuple[str, str, str]]] = [None] * len(links)
+        tentativas = [0] * len(links)
+        for item in enumerate(links):
+            fila.put(item)
+
+        num_workers = min(self.num_navegadores, len(links))
+        workers = [
+            # Cada worker herda uma cópia do contexto, com a Metricas ativa da execução
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._worker, fila, resultados, tentativas, i),
+                daemon=True,
+            )
+            for i in range(num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        # join só retorna depois que os links devolvidos à fila também forem processados
+        fila.join()
+        for _ in workers:
+            fila.put(None)
+        for worker in workers:
+            worker.join()
+
+        self.logger.info(f"{len(links)} links processados por {num_workers} navegadores.")
+        return [r if r is not None else (link, "", "") for r, link in zip(resultados, links)]
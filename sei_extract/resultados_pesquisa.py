@@ -0,0 +1,57 @@
+"""Registros da lista de resultados e agrupamento dos documentos por processo.
+
+Com chkSinDocumentosGerados/chkSinDocumentosRecebidos marcados, cada documento que casa com
+o filtro vira um a.protocoloNormal, e vários despachos do mesmo processo levam à mesma
+página de detalhe. Agrupando por processo, a extração busca cada processo uma vez e
+repassa nome/CNPJ a todas as linhas dos seus documentos.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+_NAO_DIGITOS = re.compile(r"\D")
+
+
+def identificar_processo(href: str, protocolo: str = "") -> str:
+    """Chave do processo de um resultado: id_procedimento do href, senão o número de protocolo, senão o href."""
+    parametros = parse_qs(urlsplit(href).query)
+    if parametros.get("id_procedimento"):
+        return f"id_procedimento={parametros['id_procedimento'][0]}"
+    numero = _NAO_DIGITOS.sub("", protocolo)
+    if numero:
+        return f"protocolo={numero}"
+    return href
+
+
+@dataclass(frozen=True)
+class ResultadoPesquisa:
+    """Um a.protocoloNormal da lista: número de protocolo (texto do link), id do documento e href."""
+
+    protocolo: str
+    documento: str
+    href: str
+
+    @classmethod
+    def de_ancora(cls, href: str, texto: str = "") -> "ResultadoPesquisa":
+        """Monta o registro a partir do href absoluto e do texto do link."""
+        documento = (parse_qs(urlsplit(href).query).get("id_documento") or [""])[0]
+        return cls(protocolo=" ".join(texto.split()), documento=documento, href=href)
+
+    @property
+    def processo(self) -> str:
+        return identificar_processo(self.href, self.protocolo)
+
+
+def agrupar_por_processo(links: Sequence[str], processos: Sequence[str]) -> Dict[str, List[str]]:
+    """{link representante: links do mesmo processo}, na ordem da primeira ocorrência de cada processo.
+
+    `processos[i]` é a chave do processo de `links[i]`; o representante é o primeiro link do processo.
+    """
+    representantes: Dict[str, str] = {}
+    grupos: Dict[str, List[str]] = {}
+    for link, processo in zip(links, processos):
+        membros = grupos.setdefault(representantes.setdefault(processo, link), [])
+        if link not in membros:
+            membros.append(link)
+    return grupos
@@ -0,0 +1,203 @@
+import csv
+import datetime
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from .controle_requisicoes import SITUACAO_ERRO, situacao_dos_dados
+
+# Consulta: nome da consulta do arquivo de trabalho que trouxe o link (vazio em pesquisas avulsas)
+# Situacao: ok, vazio (página sem nome/CNPJ), nao_encontrado ou erro (falha na extração)
+COLUNAS = ["Nome", "CNPJ", "Link", "ExtraidoEm", "Consulta", "Situacao"]
+
+
+class Saida(ABC):
+    """Interface dos destinos de gravação: recebem linhas uma a uma, sem DataFrame em memória."""
+
+    @abstractmethod
+    def escrever(self, linha: Dict[str, str]) -> None:
+        ...
+
+    @abstractmethod
+    def fechar(self) -> None:
+        ...
+
+
+class SaidaCSV(Saida):
+    """CSV gravado em blocos de `tamanho_lote` linhas."""
+
+    def __init__(self, caminho: str, tamanho_lote: int = 1000):
+        self.arquivo = open(caminho, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.DictWriter(self.arquivo, fieldnames=COLUNAS)
+        self.writer.writeheader()
+        self.tamanho_lote = tamanho_lote
+        self.buffer: List[Dict[str, str]] = []
+
+    def escrever(self, linha: Dict[str, str]) -> None:
+        self.buffer.append(linha)
+        if len(self.buffer) >= self.tamanho_lote:
+            self._descarregar()
+
+    def _descarregar(self) -> None:
+        self.writer.writerows(self.buffer)
+        self.arquivo.flush()
+        self.buffer = []
+
+    def fechar(self) -> None:
+        self._descarregar()
+        self.arquivo.close()
+
+
+class SaidaParquet(Saida):
+    """Parquet via pyarrow, um row group a cada `linhas_por_grupo` linhas."""
+
+    def __init__(self, caminho: str, linhas_por_grupo: int = 10_000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([(coluna, pa.string()) for coluna in COLUNAS])
+        self.writer = pq.ParquetWriter(caminho, self.schema)
+        self.linhas_por_grupo = linhas_por_grupo
+        self.buffer: List[Dict[str, str]] = []
+
+    def escrever(self, linha: Dict[str, str]) -> None:
+        self.buffer.append(linha)
+        if len(self.buffer) >= self.linhas_por_grupo:
+            self._descarregar()
+
+    def _descarregar(self) -> None:
+        if not self.buffer:
+            return
+        tabela = self.pa.Table.from_pylist(self.buffer, schema=self.schema)
+        self.writer.write_table(tabela)
+        self.buffer = []
+
+    def fechar(self) -> None:
+        self._descarregar()
+        self.writer.close()
+
+
+class SaidaXlsx(Saida):
+    """Planilha .xlsx mantida por compatibilidade, usando o modo write-only do openpyxl."""
+
+    def __init__(self, caminho: str):
+        from openpyxl import Workbook
+
+        self.caminho = caminho
+        self.workbook = Workbook(write_only=True)
+        self.planilha = self.workbook.create_sheet()
+        self.planilha.append(COLUNAS)
+
+    def escrever(self, linha: Dict[str, str]) -> None:
+        self.planilha.append([linha.get(coluna, "") for coluna in COLUNAS])
+
+    def fechar(self) -> None:
+        self.workbook.save(self.caminho)
+
+
+SAIDAS = {
+    "xlsx": SaidaXlsx,
+    "csv": SaidaCSV,
+    "parquet": SaidaParquet,
+}
+
+
+def criar_saida(formato: str, caminho: Optional[str] = None) -> Saida:
+    """Cria o destino do formato pedido; sem caminho, usa dados_extraidos.<formato>."""
+    return SAIDAS[formato](caminho or f"dados_extraidos.{formato}")
+
+
+def exportar_diario(diario, formato: str, caminho: Optional[str] = None) -> int:
+    """Grava as linhas concluídas de um DiarioExecucao já carregado, na ordem da pesquisa.
+
+    Retorna quantas linhas foram gravadas; links ainda pendentes ficam de fora e os que
+    terminaram em erro saem com Situacao "erro".
+    """
+    concluidos = {link: linha for link, *linha in diario.concluidos()}
+    links = diario.links()
+    consultas = diario.consultas() or [""] * len(links)
+    saida = criar_saida(formato, caminho)
+    gravadas = 0
+    try:
+        for link, consulta in zip(links, consultas):
+            if link in concluidos:
+                nome, cnpj, extraido_em, situacao = concluidos[link]
+                saida.escrever(
+                    {
+                        "Nome": nome,
+                        "CNPJ": cnpj,
+                        "Link": link,
+                        "ExtraidoEm": extraido_em,
+                        "Consulta": consulta,
+                        "Situacao": situacao,
+                    }
+                )
+                gravadas += 1
+    finally:
+        saida.fechar()
+    return gravadas
+
+
+class EscritorOrdenado:
+    """Repassa as linhas à saída na ordem original dos links, conforme vão ficando prontas.
+
+    Só ficam em memória as linhas que chegaram antes de alguma anterior a elas.
+    """
+
+    def __init__(
+        self,
+        saida: Saida,
+        links: List[str],
+        consultas: Optional[List[str]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.saida = saida
+        self.consultas = consultas
+        self.logger = logger or logging.getLogger(__name__)
+        self.posicoes: Dict[str, List[int]] = {}
+        for posicao, link in enumerate(links):
+            self.posicoes.setdefault(link, []).append(posicao)
+        self.links = links
+        self.proxima = 0
+        self.pendentes: Dict[int, Dict[str, str]] = {}
+        self.escritas = 0
+        self._lock = threading.Lock()
+
+    def receber(
+        self,
+        link: str,
+        nome: str,
+        cnpj: str,
+        extraido_em: Optional[str] = None,
+        situacao: Optional[str] = None,
+    ) -> None:
+        """Recebe uma linha extraída (em qualquer ordem)."""
+        extraido_em = extraido_em or datetime.datetime.now().isoformat(timespec="seconds")
+        situacao = situacao or situacao_dos_dados(nome, cnpj)
+        with self._lock:
+            for posicao in self.posicoes.get(link, []):
+                if posicao >= self.proxima:
+                    self.pendentes[posicao] = {
+                        "Nome": nome,
+                        "CNPJ": cnpj,
+                        "Link": link,
+                        "ExtraidoEm": extraido_em,
+                        "Consulta": self.consultas[posicao] if self.consultas else "",
+                        "Situacao": situacao,
+                    }
+            self._escrever_prontas()
+
+    def _escrever_prontas(self) -> None:
+        while self.proxima in self.pendentes:
+            self.saida.escrever(self.pendentes.pop(self.proxima))
+            self.proxima += 1
+            self.escritas += 1
+
+    def finalizar(self) -> None:
+        """Grava as posições que nunca chegaram (como linhas de erro) e fecha a saída."""
+        while self.proxima < len(self.links):
+            self.receber(self.links[self.proxima], "", "", situacao=SITUACAO_ERRO)
+        self.saida.fechar()
+        self.logger.info(f"{self.escritas} registros gravados.")
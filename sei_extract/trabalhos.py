@@ -0,0 +1,106 @@
+"""Arquivo de trabalho com várias consultas, executadas em sequência na mesma sessão do navegador.
+
+Exemplo (TOML; o mesmo formato vale em YAML):
+
+    [padrao]
+    tipo_documento = "Despacho"
+    checkboxes = ["chkSinProcessos", "chkSinDocumentosGerados", "chkSinDocumentosRecebidos"]
+
+    [[consulta]]
+    nome = "credito-acumulado"
+    tipo_processo = "Processo de apropriação e utilização de crédito acumulado ou de produtor rural"
+    de = 2026-01-01
+    ate = 2026-01-31
+
+    [[consulta]]
+    nome = "ressarcimento"
+    tipo_processo = "Ressarcimento de ICMS"
+
+Campos ausentes na consulta vêm de [padrao] e, depois, das opções da linha de comando.
+"""
+import datetime
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Consulta:
+    """Uma combinação de filtros do formulário de pesquisa."""
+
+    nome: str
+    tipo_processo: str
+    tipo_documento: str
+    checkboxes: List[str]
+    data_inicio: Optional[datetime.date] = None
+    data_fim: Optional[datetime.date] = None
+
+
+def _data(valor: Any) -> Optional[datetime.date]:
+    # TOML e YAML já entregam datas como date; strings aceitam AAAA-MM-DD
+    if valor is None or isinstance(valor, datetime.date):
+        return valor
+    return datetime.date.fromisoformat(str(valor))
+
+
+def _ler_arquivo(caminho: str) -> Dict[str, Any]:
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise RuntimeError("Arquivos de trabalho YAML precisam do pacote PyYAML (pip install pyyaml ou pip install sei-extract[yaml]).") from e
+        with open(caminho, encoding="utf-8") as arquivo:
+            return yaml.safe_load(arquivo) or {}
+
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError as e:
+            raise RuntimeError("Arquivos de trabalho TOML no Python < 3.11 precisam do pacote tomli (pip install tomli).") from e
+    with open(caminho, "rb") as arquivo:
+        return tomllib.load(arquivo)
+
+
+def carregar_trabalho(
+    caminho: str,
+    tipo_processo: str,
+    tipo_documento: str,
+    checkboxes: List[str],
+    data_inicio: Optional[datetime.date] = None,
+    data_fim: Optional[datetime.date] = None,
+) -> List[Consulta]:
+    """Lê as consultas do arquivo; os demais parâmetros são os padrões da execução."""
+    dados = _ler_arquivo(caminho)
+    padrao = {
+        "tipo_processo": tipo_processo,
+        "tipo_documento": tipo_documento,
+        "checkboxes": checkboxes,
+        "de": data_inicio,
+        "ate": data_fim,
+        **(dados.get("padrao") or {}),
+    }
+
+    consultas = []
+    for indice, item in enumerate(dados.get("consulta") or [], 1):
+        campos = {**padrao, **item}
+        consultas.append(
+            Consulta(
+                nome=str(campos.get("nome") or f"consulta-{indice}"),
+                tipo_processo=campos["tipo_processo"],
+                tipo_documento=campos["tipo_documento"],
+                checkboxes=list(campos["checkboxes"]),
+                data_inicio=_data(campos.get("de")),
+                data_fim=_data(campos.get("ate")),
+            )
+        )
+
+    if not consultas:
+        raise ValueError(f"Nenhuma [[consulta]] encontrada em {caminho}.")
+    nomes = [consulta.nome for consulta in consultas]
+    repetidos = sorted({nome for nome in nomes if nomes.count(nome) > 1})
+    if repetidos:
+        raise ValueError(f"Nomes de consulta repetidos em {caminho}: {', '.join(repetidos)}")
+    return consultas
@@ -0,0 +1,11 @@
+import pytest
+
+from benchmark.servidor_sei import ServidorSEI
+
+
+@pytest.fixture
+def servidor():
+    """Servidor local que imita as páginas do SEI, sem latência artificial."""
+    servidor = ServidorSEI(total_resultados=10, latencia=0).iniciar()
+    yield servidor
+    servidor.parar()
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from sei_extract.cnpj import deduplicar_por_cnpj, normalizar_cnpj, processar_cnpjs, validar_cnpj
+
+
+def _validar(*cnpjs):
+    return validar_cnpj(normalizar_cnpj(pd.Series(list(cnpjs)))).tolist()
+
+
+def test_normalizar_cnpj():
+    assert normalizar_cnpj(pd.Series(["11.222.333/0001-81", None, " 123 "])).tolist() == ["11222333000181", "", "123"]
+
+
+def test_validar_cnpj():
+    assert _validar("11.222.333/0001-81", "11222333000181", "11.444.777/0001-61") == [True, True, True]
+
+
+def test_validar_cnpj_rejeita_invalidos():
+    # Dígito verificador errado, dígitos repetidos, tamanho errado e vazio
+    assert _validar("11.222.333/0001-82", "00000000000000", "11111111111111", "1122233300018", "") == [False] * 5
+
+
+def test_validar_cnpj_sem_linhas_de_14_digitos():
+    assert _validar("123", "") == [False, False]
+
+
+def _resultados(**colunas):
+    return processar_cnpjs(pd.DataFrame(colunas))
+
+
+def test_deduplicar_agrupa_por_cnpj_na_ordem_da_primeira_ocorrencia():
+    df = _resultados(
+        Nome=["B", "A", "B2", "A2", "B3"],
+        CNPJ=["11.444.777/0001-61", "11.222.333/0001-81", "11444777000161", "11.222.333/0001-81", "11.444.777/0001-61"],
+        Link=["l1", "l2", "l3", "l4", "l5"],
+    )
+    resultado = deduplicar_por_cnpj(df)
+    assert resultado["Nome"].tolist() == ["B", "A"]
+    assert [list(links) for links in resultado["Links"]] == [["l1", "l3", "l5"], ["l2", "l4"]]
+    assert resultado["Ocorrencias"].tolist() == [3, 2]
+    assert resultado["CNPJ_Valido"].all()
+
+
+def test_deduplicar_mantem_invalidos_depois_dos_grupos():
+    df = _resultados(
+        Nome=["sem", "A", "errado", "A2", "sem2"],
+        CNPJ=["", "11.222.333/0001-81", "11.222.333/0001-82", "11222333000181", ""],
+        Link=["l1", "l2", "l3", "l4", "l5"],
+    )
+    resultado = deduplicar_por_cnpj(df)
+    assert resultado["Nome"].tolist() == ["A", "sem", "errado", "sem2"]
+    assert [list(links) for links in resultado["Links"]] == [["l2", "l4"], ["l1"], ["l3"], ["l5"]]
+    assert resultado["Ocorrencias"].tolist() == [2, 1, 1, 1]
+    assert resultado["CNPJ_Valido"].tolist() == [True, False, False, False]
+
+
+def test_deduplicar_mantem_origem_do_cnpj():
+    df = _resultados(Nome=["A", "A2"], CNPJ=["11222333000181"] * 2, Link=["l1", "l2"], CNPJ_Origem=["indice_exato", "pagina"])
+    resultado = deduplicar_por_cnpj(df)
+    assert resultado.columns.tolist()[-1] == "CNPJ_Origem"
+    assert resultado["CNPJ_Origem"].tolist() == ["indice_exato"]
+
+
+def test_deduplicar_vazio():
+    resultado = deduplicar_por_cnpj(_resultados(Nome=[], CNPJ=[], Link=[]))
+    assert resultado.empty
+    assert resultado.columns.tolist() == ["Nome", "CNPJ", "CNPJ_Normalizado", "CNPJ_Valido", "Links", "Ocorrencias"]
@@ -0,0 +1,55 @@
+import pytest
+
+from sei_extract.coleta_direta import _localizar_deslocamento
+
+
+def _pedido(consulta: str = "", corpo=None) -> dict:
+    return {"url": f"http://sei/resultados.php?{consulta}", "metodo": "POST" if corpo else "GET", "corpo": corpo}
+
+
+@pytest.mark.parametrize(
+    "primeira, segunda, esperado",
+    [
+        ("quantidade=20&inicio=20", "quantidade=20&inicio=40", ("url", "inicio", 40, 20)),
+        ("inicio=20&quantidade=20", "inicio=40&quantidade=20", ("url", "inicio", 40, 20)),
+        ("rows=20&start=20", "rows=20&start=40", ("url", "start", 40, 20)),
+        ("pagina=2&itens=20", "pagina=3&itens=20", ("url", "pagina", 3, 1)),
+        ("itens=20&pagina=1", "itens=20&pagina=2", ("url", "pagina", 2, 1)),
+    ],
+)
+def test_parametro_que_muda_entre_as_requisicoes(primeira, segunda, esperado):
+    assert _localizar_deslocamento(_pedido(primeira), _pedido(segunda), 20) == esperado
+
+
+def test_parametro_no_corpo():
+    primeira = _pedido(corpo="acao=pesquisar&offset=20&limit=20")
+    segunda = _pedido(corpo="acao=pesquisar&offset=40&limit=20")
+    assert _localizar_deslocamento(primeira, segunda, 20) == ("corpo", "offset", 40, 20)
+
+
+def test_prefere_nomes_conhecidos_de_deslocamento():
+    # "seq" também avança 1, mas "pag" é um nome conhecido de página
+    primeira, segunda = _pedido("seq=7&pag=2"), _pedido("seq=8&pag=3")
+    assert _localizar_deslocamento(primeira, segunda, 20) == ("url", "pag", 3, 1)
+
+
+def test_nome_desconhecido_serve_se_for_o_unico_que_avanca():
+    primeira, segunda = _pedido("tamanho=20&x=20"), _pedido("tamanho=20&x=40")
+    assert _localizar_deslocamento(primeira, segunda, 20) == ("url", "x", 40, 20)
+
+
+@pytest.mark.parametrize(
+    "primeira, segunda",
+    [
+        # Nenhum parâmetro muda
+        ("quantidade=20&inicio=20", "quantidade=20&inicio=20"),
+        # Só o tamanho da página muda
+        ("quantidade=20", "quantidade=40"),
+        # Muda, mas em um passo que não é página nem offset (ex.: carimbo de tempo)
+        ("_=1700000000", "_=1700000137"),
+        # Parâmetro que só aparece na segunda
+        ("a=1", "a=1&inicio=20"),
+    ],
+)
+def test_sem_parametro_de_paginacao(primeira, segunda):
+    assert _localizar_deslocamento(_pedido(primeira), _pedido(segunda), 20) is None
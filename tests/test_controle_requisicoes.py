@@ -0,0 +1,106 @@
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException
+
+from sei_extract import controle_requisicoes
+from sei_extract.controle_requisicoes import (
+    CircuitoAberto,
+    ControleRequisicoes,
+    Disjuntor,
+    ErroTransitorio,
+    NaoEncontrado,
+    falha_transitoria,
+)
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Relógio controlado pelo teste no lugar de time.monotonic."""
+    class Relogio:
+        agora = 1000.0
+
+    monkeypatch.setattr(controle_requisicoes.time, "monotonic", lambda: Relogio.agora)
+    return Relogio
+
+
+def test_abre_apos_limite_de_falhas(relogio):
+    disjuntor = Disjuntor(limite_falhas=3, espera=10)
+    for _ in range(2):
+        disjuntor.registrar_falha()
+    assert disjuntor.estado == Disjuntor.FECHADO
+    assert disjuntor.espera_liberacao() == 0
+
+    disjuntor.registrar_falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert disjuntor.espera_liberacao() == pytest.approx(10)
+
+
+def test_sucesso_zera_as_falhas_seguidas(relogio):
+    disjuntor = Disjuntor(limite_falhas=2)
+    disjuntor.registrar_falha()
+    disjuntor.registrar_sucesso()
+    disjuntor.registrar_falha()
+    assert disjuntor.estado == Disjuntor.FECHADO
+
+
+def test_meio_aberto_libera_uma_requisicao_de_teste(relogio):
+    disjuntor = Disjuntor(limite_falhas=1, espera=10)
+    disjuntor.registrar_falha()
+    relogio.agora += 10
+    assert disjuntor.espera_liberacao() == 0
+    assert disjuntor.estado == Disjuntor.MEIO_ABERTO
+    # As demais aguardam o resultado do teste
+    assert disjuntor.espera_liberacao() > 0
+
+    disjuntor.registrar_sucesso()
+    assert disjuntor.estado == Disjuntor.FECHADO
+    assert disjuntor.espera_liberacao() == 0
+
+
+def test_teste_malsucedido_reabre_com_espera_dobrada(relogio):
+    disjuntor = Disjuntor(limite_falhas=1, espera=10, espera_maxima=15)
+    disjuntor.registrar_falha()
+    relogio.agora += 10
+    disjuntor.espera_liberacao()
+    disjuntor.registrar_falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert disjuntor.espera_liberacao() == pytest.approx(15)
+
+
+def test_desiste_apos_max_aberturas(relogio):
+    disjuntor = Disjuntor(limite_falhas=1, espera=1, max_aberturas=2)
+    disjuntor.registrar_falha()
+    for _ in range(2):
+        relogio.agora += 100
+        assert disjuntor.espera_liberacao() == 0
+        disjuntor.registrar_falha()
+    assert disjuntor.desistiu
+    with pytest.raises(CircuitoAberto):
+        disjuntor.espera_liberacao()
+
+
+def test_falha_transitoria():
+    assert falha_transitoria(ErroTransitorio("timeout"))
+    assert falha_transitoria(InvalidSessionIdException("sessão encerrada"))
+    assert not falha_transitoria(NaoEncontrado("HTTP 404"))
+    assert not falha_transitoria(ValueError("parser"))
+
+
+def test_navegador_morto_e_repetido_e_conta_no_disjuntor():
+    controle = ControleRequisicoes(max_tentativas=2, backoff_base=0, disjuntor=Disjuntor(limite_falhas=5))
+    assert controle.registrar_falha("l", InvalidSessionIdException("sessão encerrada"), 1) is not None
+    assert controle.disjuntor.falhas_seguidas == 1
+    assert controle.registrar_falha("l", InvalidSessionIdException("sessão encerrada"), 2) is None
+    assert controle.disjuntor.falhas_seguidas == 2
+
+
+def test_nao_encontrado_nao_repete_e_fecha_o_circuito():
+    controle = ControleRequisicoes(disjuntor=Disjuntor(limite_falhas=5))
+    controle.registrar_falha("l", ErroTransitorio("503"), 1)
+    assert controle.registrar_falha("l", NaoEncontrado("HTTP 404"), 1) is None
+    assert controle.disjuntor.falhas_seguidas == 0
+
+
+def test_retentativa_respeita_retry_after():
+    controle = ControleRequisicoes(backoff_base=0.001, backoff_maximo=60)
+    assert controle.espera_retentativa(1, ErroTransitorio("429", espera=30)) == 30
+    assert controle.espera_retentativa(1, ErroTransitorio("429", espera=600)) == 60
@@ -0,0 +1,63 @@
+import socket
+
+import pytest
+import requests
+
+from benchmark.servidor_sei import CAMINHO_DETALHE, ServidorSEI, gerar_cnpj
+from sei_extract.controle_requisicoes import ErroTransitorio, NaoEncontrado
+from sei_extract.detalhe_http import HttpDetailFetcher
+
+
+def _link(servidor, id_processo: int) -> str:
+    return f"{servidor.url_base}{CAMINHO_DETALHE}?id_procedimento={id_processo}"
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = HttpDetailFetcher(requests.Session(), timeout=5)
+    yield fetcher
+    fetcher.close()
+
+
+def test_nome_e_cnpj_na_td(servidor, fetcher):
+    assert fetcher.extrair_dados_cliente(_link(servidor, 4)) == ("EMPRESA 4 LTDA", gerar_cnpj(4))
+
+
+def test_nome_na_quarta_tr_infra(servidor, fetcher):
+    assert fetcher.extrair_dados_cliente(_link(servidor, 7)) == ("EMPRESA 7 S.A.", "")
+
+
+def test_processo_inexistente(servidor, fetcher):
+    with pytest.raises(NaoEncontrado):
+        fetcher.extrair_dados_cliente(_link(servidor, servidor.total_resultados))
+
+
+def test_5xx_e_transitorio(fetcher):
+    servidor = ServidorSEI(total_resultados=10, latencia=0, falhas=1.0).iniciar()
+    try:
+        with pytest.raises(ErroTransitorio):
+            fetcher.extrair_dados_cliente(_link(servidor, 2))
+    finally:
+        servidor.parar()
+
+
+def test_conexao_recusada_e_transitoria(fetcher):
+    # Porta livre e fechada: ninguém escutando
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        porta = sock.getsockname()[1]
+    with pytest.raises(ErroTransitorio):
+        fetcher.extrair_dados_cliente(f"http://127.0.0.1:{porta}{CAMINHO_DETALHE}?id_procedimento=0")
+
+
+def test_guarda_html_no_arquivo(servidor):
+    guardados = {}
+
+    class Arquivo:
+        def guardar(self, link, html):
+            guardados[link] = html
+
+    fetcher = HttpDetailFetcher(requests.Session(), timeout=5, arquivo=Arquivo())
+    link = _link(servidor, 2)
+    fetcher.extrair_dados_cliente(link)
+    assert "EMPRESA 2 LTDA" in guardados[link]
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from sei_extract.controle_requisicoes import SITUACAO_ERRO, SITUACAO_OK, SITUACAO_VAZIO
+from sei_extract.diario_execucao import DiarioExecucao
+
+LINKS = ["http://sei/a?id_procedimento=1", "http://sei/b?id_procedimento=2", "http://sei/c?id_procedimento=3"]
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "execucao.jsonl")
+
+
+def _novo_diario(caminho, **kwargs):
+    diario = DiarioExecucao(caminho)
+    diario.iniciar(LINKS, **kwargs)
+    return diario
+
+
+def test_retomar_devolve_pendentes_e_erros(caminho):
+    diario = _novo_diario(caminho)
+    diario.registrar(LINKS[0], "A", "11.222.333/0001-81")
+    diario.registrar(LINKS[1], "", "", situacao=SITUACAO_ERRO)
+    diario.close()
+
+    retomado = DiarioExecucao(caminho)
+    assert retomado.retomar() == LINKS[1:]
+    assert retomado.links() == LINKS
+    assert retomado.linhas()[0] == ("A", "11.222.333/0001-81")
+    retomado.close()
+
+
+def test_erro_so_e_substituido_por_linha_sem_erro(caminho):
+    diario = _novo_diario(caminho)
+    assert diario.registrar(LINKS[0], "", "", situacao=SITUACAO_ERRO)
+    assert not diario.registrar(LINKS[0], "", "", situacao=SITUACAO_ERRO)
+    assert diario.registrar(LINKS[0], "A", "")
+    assert not diario.registrar(LINKS[0], "B", "")
+    diario.close()
+
+    retomado = DiarioExecucao(caminho)
+    retomado.carregar()
+    assert [(link, nome, situacao) for link, nome, _, _, situacao in retomado.concluidos()] == [(LINKS[0], "A", SITUACAO_OK)]
+
+
+def test_linha_truncada_e_ignorada_e_retomada_continua_em_linha_nova(caminho):
+    diario = _novo_diario(caminho)
+    diario.registrar(LINKS[0], "A", "")
+    diario.close()
+    with open(caminho, "a", encoding="utf-8") as arquivo:
+        arquivo.write('{"tipo": "linha", "link": "http://sei/b?id_procedimento=2", "No')
+
+    retomado = DiarioExecucao(caminho)
+    assert retomado.retomar() == LINKS[1:]
+    retomado.registrar(LINKS[1], "", "")
+    retomado.close()
+
+    with open(caminho, encoding="utf-8") as arquivo:
+        linhas = arquivo.read().splitlines()
+    assert json.loads(linhas[-1])["situacao"] == SITUACAO_VAZIO
+    final = DiarioExecucao(caminho)
+    assert final.retomar() == LINKS[2:]
+    final.close()
+
+
+def test_consultas_e_processos(caminho):
+    diario = _novo_diario(caminho, consultas=["q1", "q1", "q2"], processos=["p1", "p1", "p2"])
+    diario.close()
+    retomado = DiarioExecucao(caminho)
+    retomado.carregar()
+    assert retomado.consultas() == ["q1", "q1", "q2"]
+    assert retomado.processos() == ["p1", "p1", "p2"]
+
+
+def test_diario_sem_processos_usa_id_procedimento(caminho):
+    _novo_diario(caminho).close()
+    retomado = DiarioExecucao(caminho)
+    retomado.carregar()
+    assert retomado.consultas() is None
+    assert retomado.processos() == [f"id_procedimento={i}" for i in (1, 2, 3)]
+
+
+def test_diario_inexistente(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DiarioExecucao(str(tmp_path / "nao_existe.jsonl")).retomar()
@@ -0,0 +1,89 @@
+import pytest
+
+from sei_extract.indice_cnpj import IndiceCnpj, cnpj_matriz, construir_indice, normalizar_nome, sem_sufixo
+
+EMPRESAS = [
+    ("11222333", "Empresa Exemplo Ltda"),
+    ("11444777", "Acme Comércio & Indústria S.A."),
+    ("22333444", "Padaria Pão Quente ME"),
+    ("33444555", "Homônima Serviços Ltda"),
+    ("44555666", "Homônima Serviços Ltda"),
+    ("55666777", "Transportes Rota 101 Ltda"),
+    ("66777888", "Transportes Rota 116 Ltda"),
+    ("77888999", "Construtora Horizonte Ltda"),
+    ("88999000", "Construtora Horizontal Ltda"),
+]
+
+
+@pytest.fixture
+def indice(tmp_path):
+    entrada = tmp_path / "Empresas0.csv"
+    with open(entrada, "w", encoding="latin-1", newline="") as arquivo:
+        for basico, nome in EMPRESAS:
+            arquivo.write(f'"{basico}";"{nome}";"2062";"49";"0,00";"05";""\n')
+        arquivo.write('"cabecalho";"linha sem cnpj"\n')
+    caminho = str(tmp_path / "indice.idx")
+    # Lote pequeno para exercitar a intercalação de vários arquivos ordenados
+    assert construir_indice([str(entrada)], caminho, tamanho_lote=3) == len(EMPRESAS)
+    indice = IndiceCnpj(caminho)
+    yield indice
+    indice.close()
+
+
+def test_normalizar_nome():
+    assert normalizar_nome("  Acme Comércio & Indústria S.A. ") == "ACME COMERCIO E INDUSTRIA SA"
+    assert normalizar_nome("Padaria Pão-Quente S/A") == "PADARIA PAO QUENTE SA"
+    assert sem_sufixo("PADARIA PAO QUENTE ME") == "PADARIA PAO QUENTE"
+    assert sem_sufixo("LTDA") == "LTDA"
+
+
+def test_cnpj_matriz():
+    assert cnpj_matriz(11222333) == "11.222.333/0001-81"
+
+
+def test_busca_exata(indice):
+    assert len(indice) == len(EMPRESAS)
+    assert indice.buscar("EMPRESA EXEMPLO LTDA") == ["11.222.333/0001-81"]
+    assert indice.buscar("acme comercio e industria sa") == [cnpj_matriz(11444777)]
+    assert indice.buscar("Empresa Exemplo") == []
+
+
+def test_busca_por_prefixo(indice):
+    assert [nome for nome, _ in indice.buscar_prefixo("Transportes Rota")] == [
+        "TRANSPORTES ROTA 101 LTDA",
+        "TRANSPORTES ROTA 116 LTDA",
+    ]
+    assert indice.buscar_prefixo("Transportes", limite=1) == [("TRANSPORTES ROTA 101 LTDA", cnpj_matriz(55666777))]
+
+
+def test_resolver_exato(indice):
+    assert indice.resolver("Empresa Exemplo Ltda") == ("11.222.333/0001-81", "indice_exato")
+
+
+def test_resolver_homonimos_fica_em_branco(indice):
+    assert indice.resolver("Homônima Serviços Ltda") == ("", "")
+
+
+def test_resolver_aproximado(indice):
+    # Erro de digitação e sufixo diferente
+    assert indice.resolver("Padaria Pao Qeunte EPP") == (cnpj_matriz(22333444), "indice_aproximado")
+
+
+def test_aproximado_exige_os_mesmos_numeros(indice):
+    assert indice.resolver("Transportes Rota 110 Ltda") == ("", "")
+
+
+def test_aproximado_ambiguo_fica_em_branco(indice):
+    # Equidistante de "Horizonte" e "Horizontal"
+    assert indice.resolver("Construtora Horizont Ltda", limiar=0.8) == ("", "")
+
+
+def test_aproximado_exige_a_mesma_primeira_palavra(indice):
+    assert indice.resolver("Impresa Exemplo Ltda") == ("", "")
+
+
+def test_arquivo_que_nao_e_indice(tmp_path):
+    caminho = tmp_path / "outro.idx"
+    caminho.write_bytes(b"X" * 64)
+    with pytest.raises(ValueError):
+        IndiceCnpj(str(caminho))
@@ -0,0 +1,45 @@
+import pytest
+import requests
+
+from benchmark.servidor_sei import CAMINHO_DETALHE, gerar_cnpj
+from sei_extract.parser_detalhe import extrair_nome_cnpj, parse_dados_cliente, parse_dados_cliente_lxml
+
+PARSERS = [parse_dados_cliente, parse_dados_cliente_lxml]
+
+
+def _html(servidor, id_processo: int) -> str:
+    resposta = requests.get(f"{servidor.url_base}{CAMINHO_DETALHE}?id_procedimento={id_processo}", timeout=5)
+    resposta.raise_for_status()
+    return resposta.text
+
+
+@pytest.mark.parametrize("parse", PARSERS)
+def test_layout_td(servidor, parse):
+    assert parse(_html(servidor, 2)) == ("EMPRESA 2 LTDA", gerar_cnpj(2))
+
+
+@pytest.mark.parametrize("parse", PARSERS)
+def test_layout_tr_infra(servidor, parse):
+    assert parse(_html(servidor, 3)) == ("EMPRESA 3 S.A.", "")
+
+
+def test_lxml_igual_ao_html_parser(servidor):
+    for id_processo in range(servidor.total_resultados):
+        html = _html(servidor, id_processo)
+        assert parse_dados_cliente_lxml(html) == parse_dados_cliente(html)
+
+
+@pytest.mark.parametrize("parse", PARSERS)
+@pytest.mark.parametrize("html", ["", "  \n", "<!-- vazio -->", "<html><body><p>sem tabela</p></body></html>"])
+def test_documento_sem_dados(parse, html):
+    assert parse(html) == ("", "")
+
+
+@pytest.mark.parametrize("parse", PARSERS)
+def test_quebras_de_linha_e_entidades(parse):
+    html = "<table><tr><td>Interessados:<br>ACME &amp; FILHOS   LTDA (11.222.333/0001-81)</td></tr></table>"
+    assert parse(html) == ("ACME & FILHOS LTDA", "11.222.333/0001-81")
+
+
+def test_fallback_exige_segunda_celula():
+    assert extrair_nome_cnpj([], [["a"], ["b"], ["c"], ["Interessados:"]]) == ("", "")
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from sei_extract import pipeline_async
+from sei_extract.controle_requisicoes import ControleRequisicoes, ErroTransitorio, NaoEncontrado
+from sei_extract.pipeline_async import LimiteAdaptativo, extrair_concorrente
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    class Relogio:
+        agora = 1000.0
+
+    monkeypatch.setattr(pipeline_async.time, "monotonic", lambda: Relogio.agora)
+    return Relogio
+
+
+def _liberar(limite: LimiteAdaptativo, latencia, sobrecarga: bool = False) -> None:
+    async def ciclo():
+        await limite.adquirir()
+        await limite.liberar(latencia, sobrecarga)
+
+    asyncio.run(ciclo())
+
+
+def test_comeca_na_metade_do_maximo():
+    assert LimiteAdaptativo(8).limite == 4
+    assert LimiteAdaptativo(8, adaptativo=False).limite == 8
+    assert LimiteAdaptativo(1).limite == 1
+
+
+def test_sucesso_soma_um_por_rodada(relogio):
+    limite = LimiteAdaptativo(8, latencia_alvo=1.0)
+    for _ in range(4):
+        _liberar(limite, 0.1)
+    assert limite.limite == pytest.approx(5, abs=0.1)
+
+
+def test_nao_passa_do_maximo(relogio):
+    limite = LimiteAdaptativo(2, latencia_alvo=1.0)
+    for _ in range(20):
+        _liberar(limite, 0.1)
+    assert limite.limite == 2
+
+
+def test_sobrecarga_reduz_uma_vez_por_latencia_media(relogio):
+    limite = LimiteAdaptativo(16, inicial=8, latencia_alvo=1.0)
+    _liberar(limite, 0.5)
+    _liberar(limite, None, sobrecarga=True)
+    _liberar(limite, None, sobrecarga=True)
+    assert limite.limite == pytest.approx(4, abs=0.2)
+    assert limite.reducoes == 1
+
+    relogio.agora += 1
+    _liberar(limite, None, sobrecarga=True)
+    assert limite.reducoes == 2
+
+
+def test_latencia_acima_do_alvo_conta_como_sobrecarga(relogio):
+    limite = LimiteAdaptativo(16, inicial=8, latencia_alvo=1.0)
+    _liberar(limite, 2.0)
+    assert limite.limite == 4
+
+
+def test_alvo_padrao_e_tres_vezes_a_menor_latencia(relogio):
+    limite = LimiteAdaptativo(16, inicial=8)
+    _liberar(limite, 0.1)
+    _liberar(limite, 0.25)
+    assert limite.reducoes == 0
+    _liberar(limite, 0.5)
+    assert limite.reducoes == 1
+
+
+def test_nao_desce_do_minimo(relogio):
+    limite = LimiteAdaptativo(4, inicial=1, latencia_alvo=1.0)
+    _liberar(limite, None, sobrecarga=True)
+    assert limite.limite == 1
+
+
+def test_fixo_nao_ajusta(relogio):
+    limite = LimiteAdaptativo(4, adaptativo=False, latencia_alvo=1.0)
+    _liberar(limite, None, sobrecarga=True)
+    assert limite.limite == 4
+
+
+def test_extrair_concorrente_repete_transitorios_e_mantem_a_ordem():
+    tentativas = {}
+
+    def extrair(link):
+        tentativas[link] = tentativas.get(link, 0) + 1
+        if link == "instavel" and tentativas[link] < 3:
+            raise ErroTransitorio("503")
+        if link == "inexistente":
+            raise NaoEncontrado("HTTP 404")
+        return link.upper(), ""
+
+    controle = ControleRequisicoes(max_tentativas=4, backoff_base=0)
+    links = ["a", "instavel", "inexistente", "b"]
+    assert extrair_concorrente(links, extrair, concorrencia=4, controle=controle) == [
+        ("A", ""), ("INSTAVEL", ""), ("", ""), ("B", "")
+    ]
+    assert tentativas["instavel"] == 3
+    assert controle.contagem["nao_encontrado"] == 1
+    assert controle.contagem["ok"] == 3